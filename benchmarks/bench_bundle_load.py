@@ -0,0 +1,69 @@
+"""
+Startup cost of loading model artifacts: three loose pickles vs one bundle.
+
+Measured for the production LogisticRegression and for an array-heavy
+RandomForest fitted on the same features, in a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_bundle_load
+"""
+#importing library
+import os
+import json
+import time
+import pickle
+import tempfile
+from sklearn.ensemble import RandomForestClassifier
+
+#importing requirements
+from src.utils.common import load_object, save_object, load_frame
+from src.utils.model_bundle import save_bundle, load_bundle
+from src.preprocessing import DataPreprocessing
+from src.predict import load_production_objects
+from src.config.paths import TRAIN_DATA_PATH
+
+
+def _best_of(fn, repeats: int = 5) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def compare(objects: dict, workdir: str) -> dict:
+    pickle_paths = {}
+    for name, obj in objects.items():
+        pickle_paths[name] = os.path.join(workdir, f"{name}.pkl")
+        save_object(pickle_paths[name], obj)
+
+    bundle_dir = save_bundle(os.path.join(workdir, "bundle"), objects, {"model_version": "bench"})
+    bundle_bytes = sum(os.path.getsize(os.path.join(bundle_dir, f)) for f in os.listdir(bundle_dir))
+
+    return {
+        "pickle_bytes": sum(os.path.getsize(p) for p in pickle_paths.values()),
+        "bundle_bytes": bundle_bytes,
+        "three_pickles_ms": _best_of(lambda: [load_object(p) for p in pickle_paths.values()]),
+        "bundle_verified_ms": _best_of(lambda: load_bundle(bundle_dir, verify=True)),
+        "bundle_unverified_ms": _best_of(lambda: load_bundle(bundle_dir, verify=False)),
+    }
+
+
+def run() -> dict:
+    objects, _, _ = load_production_objects()
+
+    train_df = DataPreprocessing().clean_data(load_frame(TRAIN_DATA_PATH))
+    X_train = objects["preprocessor"].transform(train_df.drop(columns=["Churn"]))
+    forest = RandomForestClassifier(n_estimators=300, random_state=42, n_jobs=-1)
+    forest.fit(X_train, objects["le_churn"].transform(train_df["Churn"]))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        results["logistic_regression"] = compare(objects, os.path.join(workdir, "lr"))
+        results["random_forest_300"] = compare(dict(objects, model=forest), os.path.join(workdir, "rf"))
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=4))
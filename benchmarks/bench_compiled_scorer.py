@@ -0,0 +1,76 @@
+"""
+Parity check and latency benchmark: compiled linear scorer vs the sklearn path.
+
+Run from the repository root:
+    python -m benchmarks.bench_compiled_scorer
+"""
+#importing library
+import time
+import json
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.predict import ChurnPredictor
+from src.preprocessing import DataPreprocessing
+from src.utils.common import load_frame
+from src.config.paths import TEST_DATA_PATH
+
+
+def _time_per_call(fn, n_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        fn()
+    return (time.perf_counter() - start) / n_calls * 1e6
+
+
+def run(n_calls: int = 2000) -> dict:
+    test_df = load_frame(TEST_DATA_PATH)
+    test_df = DataPreprocessing().clean_data(test_df).drop(columns=["Churn"])
+
+    predictor = ChurnPredictor()
+    scorer = predictor.compiled_scorer
+    if scorer is None:
+        raise RuntimeError("Loaded model could not be compiled; nothing to compare.")
+
+    #Parity over the full test split, vectorized and record by record
+    expected = predictor.model.predict_proba(predictor.preprocessor.transform(test_df))[:, 1]
+    vectorized_diff = float(np.max(np.abs(scorer.predict_proba(test_df) - expected)))
+    records = test_df.to_dict("records")
+    record_diff = max(abs(scorer.predict_proba_record(r) - p) for r, p in zip(records, expected))
+    labels_match = bool(np.array_equal(
+        predictor.predict(test_df)["churn_prediction"].to_numpy(),
+        predictor.labels[(expected >= predictor.threshold).astype(int)]
+    ))
+
+    record = records[0]
+    one_row_df = pd.DataFrame([record])
+
+    def sklearn_single():
+        X = predictor.preprocessor.transform(pd.DataFrame([record]))
+        predictor.model.predict_proba(X)
+
+    results = {
+        "rows_checked": len(records),
+        "max_abs_diff_vectorized": vectorized_diff,
+        "max_abs_diff_record": record_diff,
+        "labels_match": labels_match,
+        "single_row_us": {
+            "sklearn_dataframe": _time_per_call(sklearn_single, n_calls // 10),
+            "compiled_dataframe": _time_per_call(lambda: scorer.predict_proba(one_row_df), n_calls),
+            "compiled_record": _time_per_call(lambda: scorer.predict_proba_record(record), n_calls * 10),
+        },
+        "full_test_split_ms": {
+            "sklearn": _time_per_call(
+                lambda: predictor.model.predict_proba(predictor.preprocessor.transform(test_df)), 20
+            ) / 1000,
+            "compiled": _time_per_call(lambda: scorer.predict_proba(test_df), 20) / 1000,
+        },
+    }
+
+    assert vectorized_diff < 1e-9 and record_diff < 1e-9 and labels_match, "Compiled scorer parity failed"
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=4))
@@ -0,0 +1,78 @@
+"""
+Cost of logging on the inference hot path.
+
+Times InferencePipeline.predict on one row, and a bare logger.info call, with
+the handler writing the file synchronously, through the background queue, and
+through the queue with the configured sampling of the `*.requests` loggers.
+Each mode is configured with configure_logging and writes to a temporary file.
+
+Run from the repository root:
+    python -m benchmarks.bench_logging --calls 2000
+"""
+#importing library
+import os
+import time
+import json
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import configure_logging, get_logger, logging_stats
+from src.config.configuration import get_section
+from src.pipeline.inference_pipeline import InferencePipeline
+from src.preprocessing import DataPreprocessing
+from src.config.paths import RAW_DATA_PATH
+
+
+def _per_call_us(fn, calls: int, repeats: int = 5) -> float:
+    #Median over repeats of the mean per call, after one warm-up pass
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls)
+    return float(np.median(timings)) * 1e6
+
+
+def run(calls: int = 2000) -> dict:
+    record = DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH, nrows=1)).drop(columns=["Churn"])
+    pipeline = InferencePipeline()
+    logger = get_logger("benchmarks.bench_logging.requests")
+    sampling = get_section("logging").get("sampling") or {}
+    modes = {
+        "sync": {"use_queue": False, "sampling": {}},
+        "queue": {"use_queue": True, "sampling": {}},
+        "queue_sampled": {"use_queue": True, "sampling": {**sampling, "benchmarks.bench_logging.requests": 0.01}},
+    }
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="logging-")
+    try:
+        for mode, options in modes.items():
+            log_file = os.path.join(workdir, f"{mode}.log")
+            configure_logging(fmt="text", log_file=log_file, **options)
+            results[mode] = {
+                "logger_info_us": _per_call_us(lambda: logger.info("Scored %s rows", 1), calls * 10),
+                "predict_us": _per_call_us(lambda: pipeline.predict(record), calls),
+                **logging_stats(),
+            }
+            #Drains the queue, so the file size covers every record kept
+            configure_logging(use_queue=False, log_file=os.path.join(workdir, "drain.log"))
+            results[mode]["file_kb"] = os.path.getsize(log_file) / 1e3
+    finally:
+        configure_logging()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.calls), indent=4))
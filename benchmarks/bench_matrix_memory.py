@@ -0,0 +1,172 @@
+"""
+Peak memory of the preprocess, train and score stages per matrix mode.
+
+The train/test splits are tiled `--scale` times into a temporary directory.
+Every (mode, stage) pair then runs in a fresh process, so its peak RSS covers
+that stage only (`stage_rss_mb` is the peak above what the imports took):
+
+    preprocess  clean the splits, fit the ColumnTransformer, transform train and test
+    train       load the transformed train matrix and fit the default LogisticRegression
+    score       transform the raw test split with the fitted preprocessor and score it
+
+    dense       sklearn defaults: float64, dense (the one-hot block is not sparse enough for the heuristic)
+    compact     float32 CSR, one-hot block sparse end to end
+
+Run from the repository root:
+    python -m benchmarks.bench_matrix_memory --scale 50
+"""
+#importing library
+import os
+import sys
+import time
+import json
+import shutil
+import resource
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import LabelEncoder
+
+#importing requirements
+from src.preprocessing import DataPreprocessing, MATRIX_MODES, describe_matrix
+from src.train import ModelTrainer
+from src.utils.common import save_frame, load_frame, save_object, load_object
+from src.config.paths import TRAIN_DATA_PATH, TEST_DATA_PATH
+
+
+def build_scaled_splits(scale: int, workdir: str):
+    for name, source in (("train", TRAIN_DATA_PATH), ("test", TEST_DATA_PATH)):
+        df = load_frame(source)
+        save_frame(os.path.join(workdir, f"{name}.parquet"), pd.concat([df] * scale, ignore_index=True))
+
+
+def _save_matrix(file_path: str, X):
+    if sparse.issparse(X):
+        sparse.save_npz(file_path, X, compressed=False)
+    else:
+        np.save(file_path, X)
+
+
+def _load_matrix(file_path: str):
+    return sparse.load_npz(file_path) if file_path.endswith(".npz") else np.load(file_path)
+
+
+def _matrix_path(stage_dir: str, name: str) -> str:
+    for suffix in (".npz", ".npy"):
+        if os.path.exists(os.path.join(stage_dir, name + suffix)):
+            return os.path.join(stage_dir, name + suffix)
+    return os.path.join(stage_dir, name)
+
+
+def run_preprocess(mode: str, data_dir: str, stage_dir: str) -> dict:
+    #Same steps and release order as DataPreprocessing.initiate_preprocessing, without writing artifacts
+    preprocessing = DataPreprocessing(matrix_mode=mode)
+    train_df = preprocessing.clean_data(load_frame(os.path.join(data_dir, "train.parquet")))
+    X_train = train_df.drop(columns="Churn")
+    y_train = train_df["Churn"].to_numpy()
+    del train_df
+
+    preprocessor = preprocessing.get_preprocessor(X_train)
+    X_train_transformed = preprocessor.fit_transform(X_train)
+    del X_train
+
+    test_df = preprocessing.clean_data(load_frame(os.path.join(data_dir, "test.parquet")))
+    X_test_transformed = preprocessor.transform(test_df.drop(columns="Churn"))
+    del test_df
+
+    _save_matrix(os.path.join(stage_dir, "X_train"), X_train_transformed)
+    np.save(os.path.join(stage_dir, "y_train.npy"), y_train.astype(str))
+    save_object(os.path.join(stage_dir, "preprocessor.pkl"), preprocessor)
+    return {"train_matrix": describe_matrix(X_train_transformed), "test_matrix": describe_matrix(X_test_transformed)}
+
+
+def run_train(mode: str, data_dir: str, stage_dir: str) -> dict:
+    X_train = _load_matrix(_matrix_path(stage_dir, "X_train"))
+    y_train = LabelEncoder().fit_transform(np.load(os.path.join(stage_dir, "y_train.npy")))
+
+    model = ModelTrainer().model
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    save_object(os.path.join(stage_dir, "model.pkl"), model)
+    return {"fit_seconds": time.perf_counter() - start, "n_iter": int(np.max(model.n_iter_))}
+
+
+def run_score(mode: str, data_dir: str, stage_dir: str) -> dict:
+    preprocessor = load_object(os.path.join(stage_dir, "preprocessor.pkl"))
+    model = load_object(os.path.join(stage_dir, "model.pkl"))
+    test_df = DataPreprocessing().clean_data(load_frame(os.path.join(data_dir, "test.parquet")))
+
+    start = time.perf_counter()
+    X_test = preprocessor.transform(test_df.drop(columns="Churn"))
+    prob = model.predict_proba(X_test)[:, 1]
+    return {"score_seconds": time.perf_counter() - start, "rows": len(prob), "mean_probability": float(prob.mean())}
+
+
+STAGES = {"preprocess": run_preprocess, "train": run_train, "score": run_score}
+
+
+def _peak_rss_mb() -> float:
+    #VmHWM starts fresh at exec; ru_maxrss is inherited from the parent (which held the tiled splits) on Linux
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(mode: str, stage: str, data_dir: str, stage_dir: str) -> dict:
+    """Runs one stage of one mode in a child process and returns its wall time and peak RSS."""
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_matrix_memory", "--mode", mode, "--stage", stage,
+         "--data-dir", data_dir, "--stage-dir", stage_dir],
+        check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["wall_seconds"] = time.perf_counter() - start
+    return result
+
+
+def run(scale: int = 50) -> dict:
+    workdir = tempfile.mkdtemp(prefix="matrix-memory-")
+    try:
+        build_scaled_splits(scale, workdir)
+        results = {"scale": scale}
+        for mode in MATRIX_MODES:
+            stage_dir = os.path.join(workdir, mode)
+            os.makedirs(stage_dir)
+            results[mode] = {stage: _measure(mode, stage, workdir, stage_dir) for stage in STAGES}
+
+        results["stage_rss_ratio"] = {
+            stage: results["dense"][stage]["stage_rss_mb"] / max(results["compact"][stage]["stage_rss_mb"], 1e-9)
+            for stage in STAGES
+        }
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--mode", choices=MATRIX_MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--stage", choices=sorted(STAGES), help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--stage-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        #Child process: one stage, peak RSS of this process only; the baseline is what the imports took
+        baseline_mb = _peak_rss_mb()
+        result = STAGES[args.stage](args.mode, args.data_dir, args.stage_dir)
+        result["peak_rss_mb"] = _peak_rss_mb()
+        result["stage_rss_mb"] = result["peak_rss_mb"] - baseline_mb
+        print(json.dumps(result))
+    else:
+        print(json.dumps(run(args.scale), indent=4))
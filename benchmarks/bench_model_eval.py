@@ -0,0 +1,104 @@
+"""
+Evaluation benchmark: threshold sweep and bootstrap intervals.
+
+Synthetic test scores (`--rows`, the Telco test split size by default) are
+evaluated two ways:
+
+    sweep      one sorted cumulative-sum pass vs sklearn metrics recomputed per distinct threshold
+    bootstrap  vectorized resampling (all metrics of all resamples at once) vs a loop over
+               resamples calling sklearn, timed on `--loop-resamples` and reported per resample
+
+Run from the repository root:
+    python -m benchmarks.bench_model_eval --rows 1409 --resamples 2000
+"""
+#importing library
+import time
+import json
+import argparse
+import numpy as np
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+
+#importing requirements
+from src.utils.metrics import threshold_sweep, select_threshold, bootstrap_metrics
+
+
+def synthetic_scores(rows: int, positive_rate: float = 0.27, random_state: int = 42):
+    rng = np.random.default_rng(random_state)
+    y_true = (rng.random(rows) < positive_rate).astype(int)
+    #Rounded like predict_proba output of a small model, so some scores tie
+    y_prob = np.round(1 / (1 + np.exp(-(rng.normal(size=rows) + 1.6 * y_true - 1.0))), 4)
+    return y_true, y_prob
+
+
+def bench_sweep(y_true, y_prob, recall_target: float) -> dict:
+    start = time.perf_counter()
+    sweep = threshold_sweep(y_true, y_prob)
+    selected = select_threshold(sweep, recall_target)
+    sweep_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_recall = []
+    for threshold in sweep["threshold"]:
+        y_pred = (y_prob >= threshold).astype(int)
+        naive_recall.append(recall_score(y_true, y_pred))
+        precision_score(y_true, y_pred, zero_division=0)
+        f1_score(y_true, y_pred, zero_division=0)
+    naive_seconds = time.perf_counter() - start
+
+    return {
+        "thresholds": len(sweep["threshold"]),
+        "selected_threshold": selected,
+        "sweep_seconds": sweep_seconds,
+        "per_threshold_sklearn_seconds": naive_seconds,
+        "speedup": naive_seconds / sweep_seconds,
+        "max_recall_difference": float(np.max(np.abs(np.array(naive_recall) - sweep["recall"]))),
+    }
+
+
+def bench_bootstrap(y_true, y_prob, threshold: float, n_resamples: int, loop_resamples: int) -> dict:
+    start = time.perf_counter()
+    intervals = bootstrap_metrics(y_true, y_prob, threshold, n_resamples=n_resamples)
+    vectorized_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    y_pred = (y_prob >= threshold).astype(int)
+    start = time.perf_counter()
+    for _ in range(loop_resamples):
+        idx = rng.integers(0, len(y_true), len(y_true))
+        accuracy_score(y_true[idx], y_pred[idx])
+        precision_score(y_true[idx], y_pred[idx], zero_division=0)
+        recall_score(y_true[idx], y_pred[idx])
+        f1_score(y_true[idx], y_pred[idx], zero_division=0)
+        roc_auc_score(y_true[idx], y_prob[idx])
+    loop_per_resample = (time.perf_counter() - start) / loop_resamples
+
+    return {
+        "resamples": n_resamples,
+        "vectorized_seconds": vectorized_seconds,
+        "loop_seconds_per_resample": loop_per_resample,
+        "loop_seconds_extrapolated": loop_per_resample * n_resamples,
+        "speedup": loop_per_resample * n_resamples / vectorized_seconds,
+        "intervals": intervals,
+    }
+
+
+def run(rows: int = 1409, n_resamples: int = 2000, loop_resamples: int = 200, recall_target: float = 0.85) -> dict:
+    y_true, y_prob = synthetic_scores(rows)
+    sweep = bench_sweep(y_true, y_prob, recall_target)
+    return {
+        "rows": rows,
+        "recall_target": recall_target,
+        "sweep": sweep,
+        "bootstrap": bench_bootstrap(y_true, y_prob, sweep["selected_threshold"], n_resamples, loop_resamples),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1409)
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--loop-resamples", type=int, default=200)
+    parser.add_argument("--recall-target", type=float, default=0.85)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.rows, args.resamples, args.loop_resamples, args.recall_target), indent=4))
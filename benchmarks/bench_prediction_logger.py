@@ -0,0 +1,77 @@
+"""
+Prediction logger benchmark: request-path cost of logging and background write throughput.
+
+Run from the repository root:
+    python -m benchmarks.bench_prediction_logger --rows 1000000
+"""
+#importing library
+import os
+import time
+import json
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.preprocessing import DataPreprocessing
+from src.monitoring.prediction_logger import PredictionLogger, iter_prediction_log
+from src.utils.common import load_frame
+from src.config.paths import TEST_DATA_PATH
+
+
+def run(n_rows: int = 1_000_000, frame_rows: int = 1000) -> dict:
+    test_df = load_frame(TEST_DATA_PATH)
+    test_df = DataPreprocessing().clean_data(test_df).drop(columns=["Churn"])
+    records = test_df.to_dict("records")
+    frame = test_df.sample(frame_rows, replace=True, random_state=0).reset_index(drop=True)
+    probabilities = np.random.default_rng(0).random(frame_rows)
+    labels = np.where(probabilities >= 0.35, "Yes", "No")
+
+    log_dir = tempfile.mkdtemp(prefix="prediction-log-")
+    try:
+        #Flushes are driven by hand so the timings below do not overlap
+        prediction_logger = PredictionLogger(output_dir=log_dir, max_buffered_rows=n_rows + len(records))
+
+        start = time.perf_counter()
+        for record in records:
+            prediction_logger.log_record(record, 0.5, "No", "bench")
+        log_record_us = (time.perf_counter() - start) / len(records) * 1e6
+
+        n_frames = n_rows // frame_rows
+        start = time.perf_counter()
+        for _ in range(n_frames):
+            prediction_logger.log(frame, probabilities, labels, "bench")
+        log_frame_us = (time.perf_counter() - start) / n_frames * 1e6
+
+        start = time.perf_counter()
+        prediction_logger.flush(close_files=True)
+        flush_seconds = time.perf_counter() - start
+
+        on_disk = sum(
+            os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(log_dir) for name in names
+        )
+
+        start = time.perf_counter()
+        scanned = sum(len(batch) for batch in iter_prediction_log(columns=["tenure", "churn_probability"], log_dir=log_dir))
+        scan_seconds = time.perf_counter() - start
+
+        stats = prediction_logger.stats()
+        return {
+            "rows_written": stats["written_rows"],
+            "log_record_us": log_record_us,
+            "log_frame_us": {"frame_rows": frame_rows, "per_call": log_frame_us},
+            "flush_rows_per_second": stats["written_rows"] / flush_seconds,
+            "bytes_per_row": on_disk / stats["written_rows"],
+            "projected_scan": {"rows": scanned, "rows_per_second": scanned / scan_seconds},
+        }
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), indent=4))
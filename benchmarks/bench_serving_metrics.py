@@ -0,0 +1,143 @@
+"""
+Overhead of the /metrics instrumentation on the serving hot path.
+
+Times ChurnPredictor.predict_record and ChurnPredictor.predict (1000 rows) with
+and without a ServingMetrics attached, on the compiled and sklearn paths, plus
+the cost of one stage observation, of MetricsMiddleware around a no-op ASGI
+app, and of rendering /metrics. For scale, a whole POST /predict through the
+ASGI app (instrumented, without the HTTP server) is timed as well.
+
+Run from the repository root:
+    python -m benchmarks.bench_serving_metrics --calls 20000
+"""
+#importing library
+import time
+import json
+import asyncio
+import argparse
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.predict import ChurnPredictor
+from src.preprocessing import DataPreprocessing
+from src.monitoring.serving_metrics import ServingMetrics, MetricsMiddleware
+from src.config.paths import RAW_DATA_PATH
+
+
+def _per_call_us(fn, calls: int, repeats: int = 5) -> float:
+    #Median over repeats of the mean per call, after one warm-up pass
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls)
+    return float(np.median(timings)) * 1e6
+
+
+def predictor_overhead(calls: int) -> dict:
+    df = DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH)).drop(columns=["Churn"])
+    record, batch = df.iloc[0].to_dict(), df.iloc[:1000]
+
+    results = {}
+    for path, use_compiled in (("compiled", True), ("sklearn", False)):
+        record_calls = calls if use_compiled else max(calls // 50, 20)
+        timings = {}
+        for label, metrics in (("off", None), ("on", ServingMetrics())):
+            predictor = ChurnPredictor(use_compiled=use_compiled, metrics=metrics)
+            predictor.warm_up()
+            timings[label] = {
+                "record_us": _per_call_us(lambda: predictor.predict_record(record), record_calls),
+                "batch_1000_us": _per_call_us(lambda: predictor.predict(batch), 20),
+            }
+        results[path] = {
+            **{f"{key}_{label}": value for label, values in timings.items() for key, value in values.items()},
+            "record_overhead_us": timings["on"]["record_us"] - timings["off"]["record_us"],
+            "batch_1000_overhead_us": timings["on"]["batch_1000_us"] - timings["off"]["batch_1000_us"],
+        }
+    return results
+
+
+def middleware_overhead(calls: int) -> dict:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/predict"}
+    wrapped = MetricsMiddleware(app, ServingMetrics())
+
+    async def run(target):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await target(dict(scope), receive, send)
+        return (time.perf_counter() - start) / calls * 1e6
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run(wrapped))
+        bare_us = min(loop.run_until_complete(run(app)) for _ in range(3))
+        wrapped_us = min(loop.run_until_complete(run(wrapped)) for _ in range(3))
+    finally:
+        loop.close()
+    return {"bare_us": bare_us, "wrapped_us": wrapped_us, "overhead_us": wrapped_us - bare_us}
+
+
+def app_request_us(calls: int) -> float:
+    from src.api.app import app
+
+    record = DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH, nrows=1)).drop(columns=["Churn"])
+    body = json.dumps(record.iloc[0].to_dict()).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/predict", "raw_path": b"/predict", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json")], "client": ("bench", 0), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"/predict returned {message['status']}")
+
+    async def run_requests():
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app(dict(scope), receive, send)
+        return (time.perf_counter() - start) / calls * 1e6
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_requests())
+        return min(loop.run_until_complete(run_requests()) for _ in range(3))
+    finally:
+        loop.close()
+
+
+def run(calls: int = 20000) -> dict:
+    metrics = ServingMetrics()
+    observe_us = _per_call_us(lambda: metrics.observe_stage("transform", 1e-4), calls)
+    render_us = _per_call_us(lambda: metrics.render(model_version="bench"), 200)
+    return {
+        "observe_stage_us": observe_us,
+        "render_us": render_us,
+        "middleware": middleware_overhead(calls),
+        "app_predict_request_us": app_request_us(max(calls // 10, 100)),
+        "predictor": predictor_overhead(calls),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.calls), indent=4))
@@ -0,0 +1,124 @@
+"""
+Serving latency with and without shadow scoring.
+
+Test-split records are sent one at a time through InferencePipeline.predict_record
+(the /predict path) at `--rate` requests per second, and each call is timed.
+With shadow scoring on, a challenger bundle (the production preprocessor with a
+refitted model, written to a temporary directory) scores the same traffic in
+the background thread. The challenger is a LogisticRegression (compiled scorer)
+or a RandomForest (sklearn path), to show what a heavier challenger costs.
+
+Run from the repository root:
+    python -m benchmarks.bench_shadow_scoring --requests 5000 --rate 500
+"""
+#importing library
+import time
+import json
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+#importing requirements
+from src.predict import ChurnPredictor, load_production_objects
+from src.preprocessing import DataPreprocessing
+from src.evaluate import build_bundle_manifest
+from src.utils.common import load_frame
+from src.utils.model_bundle import save_bundle
+from src.config.paths import TRAIN_DATA_PATH, TEST_DATA_PATH
+from src.pipeline.inference_pipeline import InferencePipeline
+from src.monitoring.shadow_scorer import ShadowScorer
+
+CHALLENGERS = {
+    "logistic": lambda: LogisticRegression(C=0.1, max_iter=1000),
+    "forest": lambda: RandomForestClassifier(n_estimators=200, max_depth=10, n_jobs=1, random_state=42),
+}
+
+
+def build_challenger(kind: str, bundle_dir: str) -> ChurnPredictor:
+    objects, _, threshold = load_production_objects()
+    preprocessing = DataPreprocessing()
+    train_df = preprocessing.clean_data(load_frame(TRAIN_DATA_PATH))
+    X_train = objects["preprocessor"].transform(train_df.drop(columns="Churn"))
+    model = CHALLENGERS[kind]().fit(X_train, objects["le_churn"].transform(train_df["Churn"]))
+
+    challenger = {**objects, "model": model}
+    manifest = build_bundle_manifest(objects["preprocessor"], model, objects["le_churn"], threshold)
+    manifest["model_version"] = f"bench-{kind}"
+    save_bundle(bundle_dir, challenger, manifest)
+    return ChurnPredictor(bundle_path=bundle_dir)
+
+
+def _latencies(pipeline: InferencePipeline, records: list, rate: float) -> np.ndarray:
+    interval = 1.0 / rate
+    latencies = np.empty(len(records))
+    next_send = time.perf_counter()
+    for i, record in enumerate(records):
+        #Open-loop arrivals: wait for the send time, then time the call
+        while time.perf_counter() < next_send:
+            time.sleep(max(0.0, next_send - time.perf_counter()) / 2)
+        start = time.perf_counter()
+        pipeline.predict_record(record)
+        latencies[i] = time.perf_counter() - start
+        next_send += interval
+    return latencies * 1e6
+
+
+def _summary(latencies: np.ndarray) -> dict:
+    return {
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p99_us": float(np.percentile(latencies, 99)),
+        "p999_us": float(np.percentile(latencies, 99.9)),
+        "max_us": float(latencies.max()),
+    }
+
+
+def run(n_requests: int = 5000, rate: float = 500.0) -> dict:
+    test_df = DataPreprocessing().clean_data(load_frame(TEST_DATA_PATH)).drop(columns=["Churn"])
+    records = test_df.to_dict("records")
+    records = [records[i % len(records)] for i in range(n_requests)]
+
+    baseline = InferencePipeline()
+    baseline.predictor.warm_up()
+    results = {"requests": n_requests, "rate": rate, "off": _summary(_latencies(baseline, records, rate))}
+
+    for kind in CHALLENGERS:
+        bundle_dir = tempfile.mkdtemp(prefix=f"shadow-{kind}-")
+        shutil.rmtree(bundle_dir)
+        try:
+            scorer = ShadowScorer()
+            scorer.challenger = build_challenger(kind, bundle_dir)
+            #Loaded by hand above, so the poll must not replace it
+            scorer.poll_interval_seconds = float("inf")
+            scorer._last_poll = time.monotonic()
+            pipeline = InferencePipeline(shadow_scorer=scorer)
+            pipeline.predictor.warm_up()
+
+            scorer.start()
+            latencies = _latencies(pipeline, records, rate)
+            scorer.stop()
+
+            stats = scorer.stats()
+            results[f"shadow_{kind}"] = {
+                **_summary(latencies),
+                "scored_rows": stats["scored_rows"],
+                "dropped_rows": stats["dropped_rows"],
+                "batches": stats["batches"],
+                "mean_lag_ms": stats["mean_lag_ms"],
+                "agreement_rate": stats["comparison"].get("agreement_rate"),
+            }
+        finally:
+            shutil.rmtree(bundle_dir, ignore_errors=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=500.0)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.requests, args.rate), indent=4))
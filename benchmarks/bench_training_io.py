@@ -0,0 +1,138 @@
+"""
+Training pipeline I/O benchmark: CSV round trips vs parquet splits passed in memory.
+
+The raw Telco CSV is tiled `--scale` times (1000x by default, ~7M rows) into a
+temporary directory. Each variant then runs ingestion and preprocessing
+(split, write, read back, clean, fit the ColumnTransformer) in a fresh process,
+so wall time and peak RSS are measured per variant. Training and evaluation are
+the same for both variants and are left out.
+
+    csv       train/test written with to_csv and parsed again, TotalCharges re-parsed from strings
+    columnar  DataIngestion writes typed parquet and hands the frames to preprocessing in memory
+
+Run from the repository root:
+    python -m benchmarks.bench_training_io --scale 1000
+"""
+#importing library
+import os
+import sys
+import time
+import json
+import shutil
+import resource
+import argparse
+import tempfile
+import subprocess
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+#importing requirements
+from src.data_ingestion import DataIngestion
+from src.preprocessing import DataPreprocessing
+from src.utils.common import load_frame
+from src.config.paths import RAW_DATA_PATH
+
+
+def build_scaled_raw(scale: int, workdir: str) -> str:
+    raw_df = pd.read_csv(RAW_DATA_PATH)
+    scaled_path = os.path.join(workdir, "raw.csv")
+    for i in range(scale):
+        #Unique ids per copy; appended one copy at a time so memory stays flat
+        raw_df.assign(customerID=raw_df["customerID"] + f"-{i}").to_csv(
+            scaled_path, mode="a", header=(i == 0), index=False
+        )
+    return scaled_path
+
+
+def _fit(train_df: pd.DataFrame, test_df: pd.DataFrame):
+    preprocessing = DataPreprocessing()
+    train_df = preprocessing.clean_data(train_df)
+    test_df = preprocessing.clean_data(test_df)
+    X_train = train_df.drop(columns="Churn")
+    preprocessor = preprocessing.get_preprocessor(X_train)
+    preprocessor.fit_transform(X_train)
+    preprocessor.transform(test_df.drop(columns="Churn"))
+
+
+def run_csv(raw_path: str, workdir: str) -> dict:
+    df = pd.read_csv(raw_path)
+    train_df, test_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df["Churn"])
+    train_path, test_path = os.path.join(workdir, "train.csv"), os.path.join(workdir, "test.csv")
+    train_df.to_csv(train_path, index=False)
+    test_df.to_csv(test_path, index=False)
+    del df, train_df, test_df
+
+    _fit(pd.read_csv(train_path), pd.read_csv(test_path))
+    return {"split_bytes": os.path.getsize(train_path) + os.path.getsize(test_path)}
+
+
+def run_columnar(raw_path: str, workdir: str) -> dict:
+    ingestion = DataIngestion(
+        raw_file_path=raw_path,
+        train_path=os.path.join(workdir, "train.parquet"),
+        test_path=os.path.join(workdir, "test.parquet"),
+    )
+    ingestion.initiate_data_ingestion()
+    _fit(ingestion.train_df, ingestion.test_df)
+
+    #Readers that need a few columns (drift fallback, benchmarks) only decode those
+    start = time.perf_counter()
+    projected = load_frame(ingestion.train_path, columns=["tenure", "MonthlyCharges", "Contract"])
+    projected_seconds = time.perf_counter() - start
+
+    return {
+        "split_bytes": os.path.getsize(ingestion.train_path) + os.path.getsize(ingestion.test_path),
+        "projected_read": {"rows": len(projected), "columns": 3, "seconds": projected_seconds},
+    }
+
+
+VARIANTS = {"csv": run_csv, "columnar": run_columnar}
+
+
+def _measure(variant: str, raw_path: str) -> dict:
+    """Runs one variant in a child process and returns its wall time and peak RSS."""
+    variant_dir = tempfile.mkdtemp(prefix=f"training-io-{variant}-")
+    try:
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_training_io", "--variant", variant,
+             "--raw", raw_path, "--workdir", variant_dir],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["wall_seconds"] = time.perf_counter() - start
+        return result
+    finally:
+        shutil.rmtree(variant_dir, ignore_errors=True)
+
+
+def run(scale: int = 1000) -> dict:
+    workdir = tempfile.mkdtemp(prefix="training-io-")
+    try:
+        raw_path = build_scaled_raw(scale, workdir)
+        results = {variant: _measure(variant, raw_path) for variant in VARIANTS}
+        return {
+            "scale": scale,
+            "raw_bytes": os.path.getsize(raw_path),
+            **results,
+            "speedup": results["csv"]["wall_seconds"] / results["columnar"]["wall_seconds"],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--variant", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    parser.add_argument("--raw", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        #Child process: one variant, peak RSS of this process only
+        result = VARIANTS[args.variant](args.raw, args.workdir)
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps(result))
+    else:
+        print(json.dumps(run(args.scale), indent=4))
@@ -0,0 +1,89 @@
+"""
+Per-worker memory of the multi-worker API, with and without preloading the
+artifacts in the gunicorn master (Linux only, reads /proc).
+
+Run from the repository root:
+    python -m benchmarks.bench_worker_memory --workers 4
+"""
+#importing library
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+import urllib.request
+
+#importing requirements
+from src.api.serve import read_memory_kb, worker_pids
+
+SAMPLE_REQUEST = {
+    "SeniorCitizen": 0, "Partner": "Yes", "Dependents": "No", "tenure": 12,
+    "PhoneService": "Yes", "MultipleLines": "No", "InternetService": "Fiber optic",
+    "OnlineSecurity": "No", "OnlineBackup": "Yes", "DeviceProtection": "No",
+    "TechSupport": "No", "StreamingTV": "Yes", "StreamingMovies": "No",
+    "Contract": "Month-to-month", "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check", "MonthlyCharges": 75.35, "TotalCharges": 904.2
+}
+
+
+def _wait_until_ready(url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.5)
+    raise TimeoutError(f"API at {url} did not come up within {timeout}s")
+
+
+def measure(workers: int, preload: bool, port: int, n_requests: int = 200) -> dict:
+    cmd = [sys.executable, "-m", "src.api.serve", "--workers", str(workers),
+           "--host", "127.0.0.1", "--port", str(port)]
+    if not preload:
+        cmd.append("--no-preload")
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        _wait_until_ready(base_url + "/")
+
+        #Wait for every worker to be forked and warm, then exercise the predict path
+        while len(worker_pids(proc.pid)) < workers:
+            time.sleep(0.2)
+        body = json.dumps(SAMPLE_REQUEST).encode()
+        for _ in range(n_requests):
+            request = urllib.request.Request(base_url + "/predict", data=body,
+                                             headers={"Content-Type": "application/json"})
+            urllib.request.urlopen(request).read()
+        time.sleep(1)
+
+        per_worker = [read_memory_kb(pid) for pid in worker_pids(proc.pid)]
+        return {
+            "preload": preload,
+            "workers": len(per_worker),
+            "master": read_memory_kb(proc.pid),
+            "per_worker": per_worker,
+            "mean_worker_rss_kb": sum(w["rss_kb"] for w in per_worker) / len(per_worker),
+            "mean_worker_pss_kb": sum(w["pss_kb"] for w in per_worker) / len(per_worker),
+            "mean_worker_private_kb": sum(w["private_kb"] for w in per_worker) / len(per_worker),
+            "total_pss_kb": read_memory_kb(proc.pid)["pss_kb"] + sum(w["pss_kb"] for w in per_worker),
+        }
+    finally:
+        os.kill(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = [
+        measure(args.workers, preload=False, port=args.port),
+        measure(args.workers, preload=True, port=args.port + 1),
+    ]
+    print(json.dumps(results, indent=4))
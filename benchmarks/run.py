@@ -0,0 +1,310 @@
+"""
+Benchmark suite for the serving, preprocessing, drift, training and artifact-loading hot paths.
+
+Every case runs offline on the CPU, from the raw dataset and the production
+artifacts in data/artifacts, with fixed seeds:
+
+    predict        ChurnPredictor.predict latency for single rows and batches, compiled and sklearn paths
+    preprocessing  DataPreprocessing.clean_data, fit_transform and transform throughput
+    drift          DataDriftDetector.detect_drift (ks and psi) at increasing row counts
+    artifacts      production artifact, ChurnPredictor and bundle load times
+    training       TrainingPipeline.run wall time, in a scratch copy of the repository
+
+Results are written as JSON (benchmarks/results/<timestamp>.json by default).
+With `--baseline`, every timing is compared with the same metric of an earlier
+results file, and the run exits with status 1 when one is slower (or a
+throughput lower) by more than `--tolerance`. Metric names ending in
+_seconds/_ms/_us are lower-is-better, _per_second higher-is-better; others are
+informational.
+
+Run from the repository root:
+    python -m benchmarks.run
+    python -m benchmarks.run --cases predict drift --quick
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --tolerance 0.2
+"""
+#importing library
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.config.paths import ROOT_DIR, RAW_DATA_PATH
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+LOWER_IS_BETTER = ("_seconds", "_ms", "_us")
+HIGHER_IS_BETTER = ("_per_second",)
+
+
+def _median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def _latencies_us(fn, calls: int) -> np.ndarray:
+    latencies = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1e6
+
+
+def _raw_features(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw request-shaped rows (no Churn), resampled from the raw dataset up to `n_rows`."""
+    from src.preprocessing import DataPreprocessing
+
+    df = DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH)).drop(columns=["Churn"])
+    rng = np.random.default_rng(seed)
+    return df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+
+
+# ---------------------------------------------------------------- cases
+
+def bench_predict(quick: bool) -> dict:
+    from src.predict import ChurnPredictor
+
+    calls, batch_sizes = (200, (100, 1000)) if quick else (1000, (100, 1000, 10000))
+    frame = _raw_features(max(batch_sizes))
+    single = frame.iloc[:1]
+    record = single.to_dict("records")[0]
+
+    results = {}
+    for path, use_compiled in (("compiled", True), ("sklearn", False)):
+        predictor = ChurnPredictor(use_compiled=use_compiled)
+        if use_compiled and predictor.compiled_scorer is None:
+            results[f"{path}_skipped"] = "model is not compilable"
+            continue
+        predictor.warm_up()
+
+        latencies = _latencies_us(lambda: predictor.predict(single), calls)
+        results[f"{path}_single_p50_us"] = float(np.percentile(latencies, 50))
+        results[f"{path}_single_p99_us"] = float(np.percentile(latencies, 99))
+
+        latencies = _latencies_us(lambda: predictor.predict_record(record), calls)
+        results[f"{path}_record_p50_us"] = float(np.percentile(latencies, 50))
+        results[f"{path}_record_p99_us"] = float(np.percentile(latencies, 99))
+
+        for size in batch_sizes:
+            batch = frame.iloc[:size]
+            seconds = _median_seconds(lambda: predictor.predict(batch), repeats=5)
+            results[f"{path}_batch_{size}_ms"] = seconds * 1000
+            results[f"{path}_batch_{size}_rows_per_second"] = size / seconds
+    return results
+
+
+def bench_preprocessing(quick: bool) -> dict:
+    from src.preprocessing import DataPreprocessing
+
+    n_rows = 20_000 if quick else 200_000
+    raw = pd.read_csv(RAW_DATA_PATH)
+    rng = np.random.default_rng(0)
+    raw = raw.iloc[rng.integers(0, len(raw), n_rows)].reset_index(drop=True)
+
+    preprocessing = DataPreprocessing.from_config()
+    clean_seconds = _median_seconds(lambda: preprocessing.clean_data(raw), repeats=3)
+    X = preprocessing.clean_data(raw).drop(columns=["Churn"])
+
+    preprocessor = preprocessing.get_preprocessor(X)
+    fit_seconds = _median_seconds(lambda: preprocessor.fit_transform(X), repeats=3)
+    transform_seconds = _median_seconds(lambda: preprocessor.transform(X), repeats=3)
+
+    return {
+        "rows": n_rows,
+        "matrix_mode": preprocessing.matrix_mode,
+        "clean_data_seconds": clean_seconds,
+        "clean_data_rows_per_second": n_rows / clean_seconds,
+        "fit_transform_seconds": fit_seconds,
+        "fit_transform_rows_per_second": len(X) / fit_seconds,
+        "transform_seconds": transform_seconds,
+        "transform_rows_per_second": len(X) / transform_seconds,
+    }
+
+
+def bench_drift(quick: bool) -> dict:
+    from src.preprocessing import DataPreprocessing
+    from src.monitoring.drift_detection import DataDriftDetector
+
+    sizes = (1_000, 10_000) if quick else (1_000, 10_000, 100_000, 1_000_000)
+    reference = DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH)).drop(columns=["Churn"])
+
+    results = {}
+    for size in sizes:
+        current = _raw_features(size, seed=1)
+        #Shifted so the drifted path (warnings, per-feature results) is exercised too
+        current["MonthlyCharges"] = current["MonthlyCharges"] * 1.2
+        for method in ("ks", "psi"):
+            detector = DataDriftDetector(method=method)
+            repeats = 3 if size <= 100_000 else 1
+            results[f"{method}_{size}_rows_seconds"] = _median_seconds(
+                lambda: detector.detect_drift(reference, current), repeats=repeats
+            )
+    return results
+
+
+def bench_artifacts(quick: bool) -> dict:
+    from src.predict import ChurnPredictor, load_production_objects
+    from src.utils.model_bundle import save_bundle, load_bundle
+
+    repeats = 3 if quick else 10
+    results = {
+        "load_production_objects_seconds": _median_seconds(load_production_objects, repeats),
+        "churn_predictor_init_seconds": _median_seconds(ChurnPredictor, repeats),
+    }
+
+    #Bundle round trip of the production objects, in a scratch directory
+    objects, model_version, threshold = load_production_objects()
+    workdir = tempfile.mkdtemp(prefix="bench-bundle-")
+    try:
+        bundle_dir = os.path.join(workdir, "bundle")
+        start = time.perf_counter()
+        save_bundle(bundle_dir, objects, {"model_version": model_version, "threshold": threshold})
+        results["bundle_save_seconds"] = time.perf_counter() - start
+        results["bundle_load_seconds"] = _median_seconds(lambda: load_bundle(bundle_dir), repeats)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_training(quick: bool) -> dict:
+    """TrainingPipeline.run without the stage cache, in a scratch copy so the real artifacts and MLflow store are untouched."""
+    workdir = tempfile.mkdtemp(prefix="bench-training-")
+    try:
+        shutil.copytree(os.path.join(ROOT_DIR, "src"), os.path.join(workdir, "src"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        os.makedirs(os.path.join(workdir, "data", "raw"))
+        shutil.copy(RAW_DATA_PATH, os.path.join(workdir, "data", "raw"))
+
+        env = {**os.environ, "PYTHONPATH": workdir, "MLFLOW_TRACKING_URI": f"sqlite:///{workdir}/mlflow.db"}
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "src.pipeline.training_pipeline", "--no-cache"],
+            cwd=workdir, env=env, check=True, capture_output=True, text=True
+        )
+        results = {"pipeline_wall_seconds": time.perf_counter() - start}
+
+        #Per-stage times as recorded by the pipeline itself
+        cache_dir = os.path.join(workdir, "data", "artifacts", "stage_cache")
+        for name in sorted(os.listdir(cache_dir)):
+            with open(os.path.join(cache_dir, name), "r") as f:
+                manifest = json.load(f)
+            results[f"{manifest['stage']}_stage_seconds"] = manifest["seconds"]
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+CASES = {
+    "predict": bench_predict,
+    "preprocessing": bench_preprocessing,
+    "drift": bench_drift,
+    "artifacts": bench_artifacts,
+    "training": bench_training,
+}
+
+
+# ---------------------------------------------------------------- results
+
+def environment() -> dict:
+    import sklearn
+    import scipy
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "scikit-learn": sklearn.__version__,
+        "git_commit": commit,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> dict:
+    """Every timing shared with the baseline, and the ones that moved the wrong way by more than `tolerance`."""
+    changes, regressions = [], []
+    for case, metrics in current["cases"].items():
+        baseline_metrics = (baseline.get("cases") or {}).get(case) or {}
+        for metric, value in metrics.items():
+            previous = baseline_metrics.get(metric)
+            lower_is_better = metric.endswith(LOWER_IS_BETTER)
+            if not (lower_is_better or metric.endswith(HIGHER_IS_BETTER)):
+                continue
+            if not isinstance(value, (int, float)) or not isinstance(previous, (int, float)) or previous <= 0:
+                continue
+
+            change = value / previous - 1
+            entry = {"case": case, "metric": metric, "baseline": previous, "current": value, "change": change}
+            changes.append(entry)
+            if (change > tolerance) if lower_is_better else (change < -tolerance):
+                regressions.append(entry)
+    return {"tolerance": tolerance, "compared": len(changes), "regressions": regressions}
+
+
+def run(cases: list, quick: bool = False) -> dict:
+    results = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "quick": quick,
+        "environment": environment(),
+        "cases": {},
+        "case_seconds": {},
+    }
+    for case in cases:
+        start = time.perf_counter()
+        results["cases"][case] = CASES[case](quick)
+        results["case_seconds"][case] = time.perf_counter() - start
+        print(f"{case}: done in {results['case_seconds'][case]:.1f}s", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--quick", action="store_true", help="smaller row counts and fewer repeats")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = run(args.cases, quick=args.quick)
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            results["comparison"] = compare(results, json.load(f), args.tolerance)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(json.dumps(results, indent=4))
+    print(f"Results written to {output}", file=sys.stderr)
+
+    regressions = (results.get("comparison") or {}).get("regressions") or []
+    for entry in regressions:
+        print(
+            f"REGRESSION {entry['case']}.{entry['metric']}: {entry['baseline']:.6g} -> {entry['current']:.6g} "
+            f"({entry['change']:+.1%})", file=sys.stderr
+        )
+    sys.exit(1 if regressions else 0)
@@ -1,38 +1,397 @@
-from fastapi import FastAPI, HTTPException
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+import anyio
 import pandas as pd
 
 from src.api.schema import ChurnRequest, ChurnResponse
-from src.pipeline.inference_pipeline import InferencePipeline
+from src.api.batching import MicroBatcher
+from src.api.monitor_queue import MonitorQueue
+from src.config.configuration import get_section
+from src.prediction_cache import PredictionCache
+from src.api.model_reloader import ModelReloader
+from src.monitoring.drift_sketch import DriftSketchRecorder
+from src.monitoring.prediction_logger import PredictionLogger
+from src.monitoring.shadow_scorer import ShadowScorer
+from src.monitoring.serving_metrics import ServingMetrics, MetricsMiddleware, CONTENT_TYPE
+from src.utils.logger import logging_stats
+
+serving_config = get_section("serving")
+
+#Request counts, latency histograms per inference stage, in-flight gauge (None when disabled)
+serving_metrics = ServingMetrics() if (serving_config.get("metrics") or {}).get("enabled", True) else None
+
+#Optional prediction cache in front of the predictor
+cache_config = serving_config.get("prediction_cache") or {}
+prediction_cache = None
+if cache_config.get("enabled", False):
+    prediction_cache = PredictionCache(
+        max_size = cache_config.get("max_size", 100000),
+        ttl_seconds = cache_config.get("ttl_seconds", 600)
+    )
+
+#Per-window drift sketches of the served inputs (None when disabled)
+drift_recorder = DriftSketchRecorder.from_config()
+
+#Asynchronous parquet log of served inputs and outputs (None when disabled)
+prediction_logger = PredictionLogger.from_config()
+
+#Challenger scored in shadow off the response path, logged next to production (None when disabled)
+shadow_scorer = ShadowScorer.from_config(prediction_logger)
+
+#Drift/shadow/log bookkeeping of requests scored on the event loop, done by a background thread
+monitor_queue = MonitorQueue.from_config()
+
+#Load inference pipeline; the reloader swaps it when a new model is promoted
+reload_config = serving_config.get("hot_reload") or {}
+model_reloader = ModelReloader(
+    cache = prediction_cache,
+    poll_interval_seconds = reload_config.get("poll_interval_seconds", 10),
+    drift_recorder = drift_recorder,
+    prediction_logger = prediction_logger,
+    shadow_scorer = shadow_scorer,
+    metrics = serving_metrics
+)
+
+#Limits for the batch and streaming endpoints
+MAX_BATCH_RECORDS = int((serving_config.get("batch") or {}).get("max_records", 10000))
+STREAM_CHUNK_SIZE = int((serving_config.get("stream") or {}).get("chunk_size", 1000))
+MAX_STREAM_LINE_BYTES = int((serving_config.get("stream") or {}).get("max_line_bytes", 65536))
+
+#Optional micro-batching of concurrent /predict calls
+batching_config = serving_config.get("micro_batching") or {}
+micro_batcher = None
+
+def _predict_frame(input_df: pd.DataFrame) -> pd.DataFrame:
+    pipeline = model_reloader.pipeline
+    result = pipeline.predict(input_df)
+    result["model_version"] = pipeline.predictor.model_version
+    return result
+
+if batching_config.get("enabled", False):
+    micro_batcher = MicroBatcher(
+        predict_fn = _predict_frame,
+        output_columns = ("churn_probability", "churn_prediction", "model_version"),
+        max_batch_size = batching_config.get("max_batch_size", 64),
+        max_wait_ms = batching_config.get("max_wait_ms", 2),
+        max_queue_size = batching_config.get("max_queue_size", 4096),
+        serving_metrics = serving_metrics
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if reload_config.get("enabled", False):
+        model_reloader.start()
+    if drift_recorder is not None:
+        drift_recorder.start()
+    if prediction_logger is not None:
+        prediction_logger.start()
+    if shadow_scorer is not None:
+        shadow_scorer.start()
+    monitor_queue.start()
+    yield
+    model_reloader.stop()
+    if micro_batcher is not None:
+        await micro_batcher.close()
+    #Hands its last rows to the recorder, shadow scorer and logger before they stop
+    monitor_queue.stop()
+    if drift_recorder is not None:
+        drift_recorder.stop()
+    #Before the prediction logger, which writes the shadow-scored rows
+    if shadow_scorer is not None:
+        shadow_scorer.stop()
+    if prediction_logger is not None:
+        prediction_logger.stop()
 
 app = FastAPI(
     title = "Customer Churn Prediction API",
     description = "Production-grade ML API with threshold based API inference.",
-    version = "1.0.0"
+    version = "1.0.0",
+    lifespan = lifespan
 )
+if serving_metrics is not None:
+    app.add_middleware(MetricsMiddleware, metrics=serving_metrics)
+
+def _observe_stage(stage: str, start: float):
+    if serving_metrics is not None:
+        serving_metrics.observe_stage(stage, time.perf_counter() - start)
 
-#Load inference pipeline
-inference_pipeline = InferencePipeline()
+#Request bodies are parsed here rather than by FastAPI, so validation shows up as its own stage
+REQUEST_ADAPTER = TypeAdapter(ChurnRequest)
+BATCH_REQUEST_ADAPTER = TypeAdapter(List[ChurnRequest])
+
+def _json_safe(value):
+    #A rejected NaN/Infinity is echoed back as text, since the 422 body itself must be valid JSON
+    try:
+        json.dumps(value, allow_nan=False)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+def _parse_body(adapter: TypeAdapter, body: bytes):
+    start = time.perf_counter()
+    try:
+        parsed = adapter.validate_json(body)
+    except ValidationError as e:
+        #Same 422 body FastAPI returns for its own validation
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"]), "input": _json_safe(error.get("input"))}
+             for error in e.errors(include_url=False)]
+        )
+    _observe_stage("validation", start)
+    return parsed
+
+def _json_response(content) -> Response:
+    start = time.perf_counter()
+    #allow_nan=False: a non-finite score fails the request instead of emitting the invalid JSON token NaN
+    body = content.model_dump_json() if isinstance(content, ChurnResponse) else json.dumps(content, allow_nan=False)
+    _observe_stage("serialization", start)
+    return Response(content=body, media_type="application/json")
+
+def _request_body_schema(schema: dict) -> dict:
+    #Documents the body that _parse_body validates
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
 
 @app.get("/")
 def health_check():
     return {
         "status" : "ok",
-        "message": "Churn Prediction API is running."
+        "message": "Churn Prediction API is running.",
+        **model_reloader.status()
     }
 
-@app.post("/predict", response_model =ChurnResponse)
-def predict_churn(request : ChurnRequest):
+def _score_records(records: List[dict]) -> List[dict]:
+    #One vectorized pipeline call for the whole list of records
+    pipeline = model_reloader.pipeline
+    model_version = pipeline.predictor.model_version
+    start = time.perf_counter()
+    input_df = pd.DataFrame(records)
+    _observe_stage("dataframe", start)
+    result = pipeline.predict(input_df)
+    return [
+        {"churn_probability": float(prob), "churn_prediction": str(label), "model_version": model_version}
+        for prob, label in zip(
+            result["churn_probability"].to_numpy(),
+            result["churn_prediction"].to_numpy()
+        )
+    ]
+
+@app.post("/predict", response_model =ChurnResponse,
+          openapi_extra=_request_body_schema(ChurnRequest.model_json_schema()))
+async def predict_churn(http_request : Request):
+    request = _parse_body(REQUEST_ADAPTER, await http_request.body())
     try:
-        #Convert request to Dataframe
-        input_df= pd.DataFrame([request.dict()])
+        if micro_batcher is not None:
+            row = await micro_batcher.submit(request.model_dump())
+        else:
+            pipeline = model_reloader.pipeline
+            if pipeline.predictor.compiled_scorer is not None:
+                #Compiled scoring takes microseconds, cheaper than a threadpool hop. Only the
+                #arithmetic runs on the loop: anything that takes a lock is queued
+                row = pipeline.predict_record(request.model_dump(), monitor_queue=monitor_queue)
+            else:
+                row = await run_in_threadpool(pipeline.predict_record, request.model_dump())
+            row["model_version"] = pipeline.predictor.model_version
+
+        return _json_response(ChurnResponse(
+            churn_probability=float(row["churn_probability"]),
+            churn_prediction=str(row["churn_prediction"]),
+            model_version=row["model_version"]
+        ))
+
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@app.get("/batching/stats")
+def batching_stats():
+    if micro_batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **micro_batcher.stats()}
+
+@app.get("/cache/stats")
+def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@app.get("/prediction-log/stats")
+def prediction_log_stats():
+    if prediction_logger is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_logger.stats()}
 
-        #Run inference
-        result = inference_pipeline.predict(input_df)
+@app.get("/shadow/stats")
+def shadow_stats():
+    if shadow_scorer is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow_scorer.stats()}
 
-        return ChurnResponse(
-            churn_probability=float(result["churn_probability"].iloc[0]),
-            churn_prediction=str(result["churn_prediction"].iloc[0])
+@app.get("/metrics")
+def metrics():
+    if serving_metrics is None:
+        raise HTTPException(status_code = 404, detail = "Metrics are disabled.")
+    components = {
+        "batching": micro_batcher.stats() if micro_batcher is not None else None,
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "prediction_log": prediction_logger.stats() if prediction_logger is not None else None,
+        "shadow": shadow_scorer.stats() if shadow_scorer is not None else None,
+        "monitor_queue": monitor_queue.stats(),
+        "logging": logging_stats(),
+    }
+    body = serving_metrics.render(model_version=model_reloader.model_version, components=components)
+    return Response(content=body, media_type=CONTENT_TYPE)
+
+@app.post("/predict/batch", response_model=List[ChurnResponse],
+          openapi_extra=_request_body_schema({"type": "array", "items": ChurnRequest.model_json_schema()}))
+async def predict_churn_batch(http_request : Request):
+    requests = _parse_body(BATCH_REQUEST_ADAPTER, await http_request.body())
+    if len(requests) > MAX_BATCH_RECORDS:
+        raise HTTPException(
+            status_code = 413,
+            detail = f"Batch of {len(requests)} records exceeds the limit of {MAX_BATCH_RECORDS}."
         )
+    if not requests:
+        return []
+
+    try:
+        return _json_response(await run_in_threadpool(_score_records, [r.model_dump() for r in requests]))
 
     except Exception as e:
-        raise HTTPException(status_code = 500, detail = str(e))
\ No newline at end of file
+        raise HTTPException(status_code = 500, detail = str(e))
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streams results while the request body is still being read.
+
+    The parent class listens for client disconnects on `receive` while streaming,
+    which would swallow the request body chunks the generator is reading. Here a
+    single task reads `receive` for both: body chunks go through a small queue to
+    `body_chunks()`, and a disconnect cancels the stream as it does in the parent.
+    """
+    media_type = "application/x-ndjson"
+
+    def __init__(self, generate):
+        #At most a few body chunks are held between the socket and the parser
+        self._messages = asyncio.Queue(maxsize=8)
+        super().__init__(generate(self.body_chunks()))
+
+    async def body_chunks(self):
+        while True:
+            message = await self._messages.get()
+            yield message.get("body", b"")
+            if not message.get("more_body", False):
+                return
+
+    async def __call__(self, scope, receive, send):
+        async with anyio.create_task_group() as task_group:
+            async def stream():
+                try:
+                    await self.stream_response(send)
+                except OSError:
+                    #Client went away mid-write (servers on ASGI spec 2.4 report it this way)
+                    pass
+                task_group.cancel_scope.cancel()
+
+            async def read_messages():
+                while True:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        task_group.cancel_scope.cancel()
+                        return
+                    await self._messages.put(message)
+
+            task_group.start_soon(stream)
+            await read_messages()
+
+        if self.background is not None:
+            await self.background()
+
+async def _iter_ndjson_lines(chunks):
+    """
+    Split the incoming body into (line, error) pairs, holding at most one partial line.
+
+    A line longer than MAX_STREAM_LINE_BYTES is dropped as it arrives and reported
+    in its place, so a body without newlines never grows the buffer.
+    """
+    pending = bytearray()
+    oversized = False
+    too_long = [{"type": "line_too_long", "msg": f"Line exceeds {MAX_STREAM_LINE_BYTES} bytes."}]
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if not oversized:
+                pending += chunk[start:] if end < 0 else chunk[start:end]
+                if len(pending) > MAX_STREAM_LINE_BYTES:
+                    oversized = True
+                    pending.clear()
+            if end < 0:
+                break
+            if oversized:
+                yield None, too_long
+                oversized = False
+            elif pending.strip():
+                yield bytes(pending), None
+            pending.clear()
+            start = end + 1
+    if oversized:
+        yield None, too_long
+    elif pending.strip():
+        yield bytes(pending), None
+
+def _ndjson_line(row: dict) -> str:
+    try:
+        return json.dumps(row, allow_nan=False) + "\n"
+    except ValueError:
+        return json.dumps({"error": "Model returned a non-finite churn probability."}) + "\n"
+
+async def _score_chunk(chunk: List[tuple]) -> str:
+    #Invalid lines are kept in place as error objects so output order matches input order
+    valid = [record for record, error in chunk if error is None]
+    try:
+        scored = iter(await run_in_threadpool(_score_records, valid)) if valid else iter(())
+    except Exception as e:
+        #Headers are already sent, so a failed chunk is reported row by row
+        scored = iter([{"error": str(e)}] * len(valid))
+    output = [next(scored) if error is None else {"error": error} for _, error in chunk]
+    start = time.perf_counter()
+    body = "".join(_ndjson_line(row) for row in output)
+    _observe_stage("serialization", start)
+    return body
+
+@app.post("/predict/stream")
+async def predict_churn_stream():
+    async def generate(body_chunks):
+        #Validation is recorded once per chunk, like the other stages of its scoring call
+        chunk, validation_seconds = [], 0.0
+        async for line, error in _iter_ndjson_lines(body_chunks):
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    chunk.append((None, error))
+                else:
+                    chunk.append((ChurnRequest.model_validate_json(line).model_dump(), None))
+            except ValidationError as e:
+                chunk.append((None, e.errors(include_url=False, include_input=False, include_context=False)))
+            validation_seconds += time.perf_counter() - start
+
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                if serving_metrics is not None:
+                    serving_metrics.observe_stage("validation", validation_seconds)
+                yield await _score_chunk(chunk)
+                chunk, validation_seconds = [], 0.0
+
+        if chunk:
+            if serving_metrics is not None:
+                serving_metrics.observe_stage("validation", validation_seconds)
+            yield await _score_chunk(chunk)
+
+    return NDJSONStreamingResponse(generate)
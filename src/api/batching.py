@@ -0,0 +1,202 @@
+#importing library
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.monitoring.serving_metrics import ServingMetrics
+
+logger = get_logger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0)
+
+
+class BatchingMetrics:
+    """Counters and histograms describing how the micro-batcher is flushing."""
+
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.max_batch_size = 0
+        self.queue_wait_ms_sum = 0.0
+        self.queue_wait_ms_max = 0.0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.queue_wait_counts = [0] * (len(QUEUE_WAIT_BUCKETS_MS) + 1)
+
+    def observe_batch(self, batch_size: int, queue_waits_ms: List[float]):
+        self.batches += 1
+        self.items += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.batch_size_counts[bisect_left(BATCH_SIZE_BUCKETS, batch_size)] += 1
+
+        for wait in queue_waits_ms:
+            self.queue_wait_ms_sum += wait
+            self.queue_wait_counts[bisect_left(QUEUE_WAIT_BUCKETS_MS, wait)] += 1
+        if queue_waits_ms:
+            self.queue_wait_ms_max = max(self.queue_wait_ms_max, max(queue_waits_ms))
+
+    def snapshot(self, queue_depth: int = 0) -> Dict:
+        bucket_labels = [str(b) for b in BATCH_SIZE_BUCKETS] + ["+Inf"]
+        wait_labels = [str(b) for b in QUEUE_WAIT_BUCKETS_MS] + ["+Inf"]
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "failed_batches": self.failed_batches,
+            "queue_depth": queue_depth,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": dict(zip(bucket_labels, self.batch_size_counts)),
+            "mean_queue_wait_ms": self.queue_wait_ms_sum / self.items if self.items else 0.0,
+            "max_queue_wait_ms": self.queue_wait_ms_max,
+            "queue_wait_ms_histogram": dict(zip(wait_labels, self.queue_wait_counts)),
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row prediction requests into one DataFrame.
+
+    A batch is flushed as soon as `max_batch_size` rows are queued or the oldest
+    row has waited `max_wait_ms`. When the previous batch held a single row and
+    nothing else is queued the row is flushed immediately, so an idle API does not
+    pay the wait on every call. Batches are scored one at a time in a worker
+    thread; rows arriving while a batch is scored are picked up by the next one.
+    """
+
+    def __init__(self,
+                 predict_fn: Callable[[pd.DataFrame], pd.DataFrame],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0,
+                 max_queue_size: int = 4096,
+                 output_columns: Sequence[str] = ("churn_probability", "churn_prediction"),
+                 serving_metrics: ServingMetrics = None):
+        self.predict_fn = predict_fn
+        self.serving_metrics = serving_metrics
+        self.output_columns = list(output_columns)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue_size = int(max_queue_size)
+        self.metrics = BatchingMetrics()
+
+        self._queue = None
+        self._worker = None
+        #Rows taken off the queue and not answered yet, failed if the worker stops
+        self._in_flight = []
+        self._last_batch_size = 0
+
+    def _ensure_started(self):
+        if self._worker is None or self._worker.done():
+            if self._worker is not None:
+                #The worker died: requests still queued for it would otherwise wait forever
+                error = None if self._worker.cancelled() else self._worker.exception()
+                logger.error(f"Micro-batcher worker stopped ({error!r}). Restarting.")
+                self._fail_pending(RuntimeError("Micro-batcher worker stopped before scoring this request."))
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logger.info(
+                f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:.2f})"
+            )
+
+    async def submit(self, record: Dict) -> Dict:
+        """Queue one request record and wait for its own prediction row."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple]:
+        loop = asyncio.get_running_loop()
+        batch = self._in_flight = [await self._queue.get()]
+
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        # Light traffic: do not hold a lone request back waiting for company
+        if len(batch) == 1 and self._last_batch_size <= 1:
+            return batch
+
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _fail_pending(self, error: Exception):
+        #Fails the rows in flight and everything still queued, so no caller waits forever
+        pending, self._in_flight = self._in_flight, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        try:
+            await self._serve()
+        except asyncio.CancelledError:
+            self._fail_pending(RuntimeError("Micro-batcher was closed before scoring this request."))
+            raise
+        except Exception as e:
+            logger.exception("Micro-batcher worker failed.")
+            self._fail_pending(e)
+            raise
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self._last_batch_size = len(batch)
+
+            flush_time = time.perf_counter()
+            records = [record for record, _, _ in batch]
+            waits_ms = [(flush_time - enqueued) * 1000.0 for _, _, enqueued in batch]
+
+            try:
+                rows = await loop.run_in_executor(None, self._score, records)
+            except Exception as e:
+                self.metrics.failed_batches += 1
+                logger.exception(f"Micro-batch of {len(batch)} rows failed.")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.metrics.observe_batch(len(batch), waits_ms)
+            for (_, future, _), row in zip(batch, rows):
+                if not future.done():
+                    future.set_result(row)
+
+    def _score(self, records: List[Dict]) -> List[Dict]:
+        start = time.perf_counter()
+        input_df = pd.DataFrame(records)
+        if self.serving_metrics is not None:
+            self.serving_metrics.observe_stage("dataframe", time.perf_counter() - start)
+        result = self.predict_fn(input_df)
+        return result[self.output_columns].to_dict("records")
+
+    def stats(self) -> Dict:
+        queue_depth = self._queue.qsize() if self._queue is not None else 0
+        return self.metrics.snapshot(queue_depth=queue_depth)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+        #A worker cancelled before it first ran never reached its own cleanup
+        self._fail_pending(RuntimeError("Micro-batcher was closed before scoring this request."))
@@ -0,0 +1,189 @@
+#importing library
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.config.paths import MODEL_VERSION_PATH, REFERENCE_PROFILE_PATH
+from src.pipeline.inference_pipeline import InferencePipeline
+from src.prediction_cache import PredictionCache
+from src.monitoring.drift_sketch import DriftSketch, DriftSketchRecorder
+from src.monitoring.reference_profile import REFERENCE_PROFILE_FILE
+from src.predict import get_promoted_bundle_path
+from src.monitoring.prediction_logger import PredictionLogger
+from src.monitoring.shadow_scorer import ShadowScorer
+from src.monitoring.serving_metrics import ServingMetrics
+
+logger = get_logger(__name__)
+
+
+class ModelReloader:
+    """
+    Owns the serving InferencePipeline and swaps it when a new model is promoted.
+
+    A background thread polls the promotion marker (`model_version.json`). When it
+    names a version other than the one being served, a new pipeline is loaded and
+    warmed up off the request path and then published with a single reference
+    assignment. Requests read `reloader.pipeline` once when they start, so calls
+    already in flight finish on the model they started with. The drift recorder
+    is then rebound to the new model's reference profile.
+    """
+
+    def __init__(self,
+                 threshold: float = None,
+                 cache: PredictionCache = None,
+                 poll_interval_seconds: float = 10.0,
+                 drift_recorder: DriftSketchRecorder = None,
+                 prediction_logger: PredictionLogger = None,
+                 shadow_scorer: ShadowScorer = None,
+                 metrics: ServingMetrics = None):
+        self.threshold = threshold
+        self.cache = cache
+        self.drift_recorder = drift_recorder
+        self.prediction_logger = prediction_logger
+        self.shadow_scorer = shadow_scorer
+        self.metrics = metrics
+        self.poll_interval_seconds = float(poll_interval_seconds)
+
+        self.pipeline = self._build_pipeline()
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.failed_reloads = 0
+
+        self._marker_mtime = self._read_marker_mtime()
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _build_pipeline(self, shared: bool = True) -> InferencePipeline:
+        #A reload candidate is built without the shared cache and metrics: neither may see it
+        #(binding, warm-up rows, latencies) until it has been checked and published
+        return InferencePipeline(
+            threshold=self.threshold,
+            cache=self.cache if shared else None,
+            drift_recorder=self.drift_recorder,
+            prediction_logger=self.prediction_logger,
+            shadow_scorer=self.shadow_scorer,
+            metrics=self.metrics if shared else None
+        )
+
+    @property
+    def model_version(self) -> str:
+        return self.pipeline.predictor.model_version
+
+    @staticmethod
+    def _read_marker_mtime() -> Optional[float]:
+        try:
+            return os.stat(MODEL_VERSION_PATH).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def check_for_update(self) -> bool:
+        """Reload if the promotion marker names a different model version. Returns True on swap."""
+        marker_mtime = self._read_marker_mtime()
+        if marker_mtime is None or marker_mtime == self._marker_mtime:
+            return False
+
+        try:
+            with open(MODEL_VERSION_PATH, "r") as f:
+                promoted_version = json.load(f)["model_version"]
+        except (OSError, ValueError, KeyError):
+            #Marker is being rewritten; look again on the next poll
+            logger.warning("Could not read model version marker. Retrying on next poll.")
+            return False
+
+        if promoted_version == self.model_version:
+            self._marker_mtime = marker_mtime
+            return False
+
+        if self.reload(expected_version=promoted_version):
+            self._marker_mtime = marker_mtime
+            return True
+        return False
+
+    def reload(self, expected_version: str = None) -> bool:
+        """Load, warm up and atomically publish a new pipeline from the current artifacts."""
+        with self._reload_lock:
+            start = time.perf_counter()
+            try:
+                logger.info(f"Loading promoted model (expected version {expected_version}).")
+                new_pipeline = self._build_pipeline(shared=False)
+                new_version = new_pipeline.predictor.model_version
+
+                if expected_version is not None and new_version != expected_version:
+                    #Artifacts changed again while loading (e.g. a new run is writing them)
+                    logger.warning(
+                        f"Loaded artifacts are version {new_version}, expected {expected_version}. "
+                        "Keeping the current model."
+                    )
+                    self.failed_reloads += 1
+                    return False
+
+                new_pipeline.predictor.warm_up()
+
+            except Exception:
+                self.failed_reloads += 1
+                logger.exception("Hot reload failed. Keeping the current model.")
+                return False
+
+            old_version = self.model_version
+            #Binding clears the cache; entries written meanwhile by in-flight requests carry the old version in their key
+            new_pipeline.attach(cache=self.cache, metrics=self.metrics)
+            self.pipeline = new_pipeline
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self._rebind_drift_recorder(new_version)
+            logger.info(
+                f"Hot reloaded model {old_version} -> {new_version} "
+                f"in {time.perf_counter() - start:.2f}s."
+            )
+            return True
+
+    def _rebind_drift_recorder(self, model_version: str):
+        if self.drift_recorder is None:
+            return
+        #The profile frozen in the bundle belongs to this model; the published copy is the fallback
+        bundle_path = get_promoted_bundle_path()
+        profile_path = REFERENCE_PROFILE_PATH
+        if bundle_path is not None and os.path.basename(bundle_path) == model_version:
+            if os.path.exists(os.path.join(bundle_path, REFERENCE_PROFILE_FILE)):
+                profile_path = os.path.join(bundle_path, REFERENCE_PROFILE_FILE)
+        if not os.path.exists(profile_path):
+            logger.warning(f"No reference profile for model {model_version}. Drift sketches keep the old one.")
+            return
+        try:
+            self.drift_recorder.rebind(DriftSketch.load(profile_path))
+        except Exception:
+            logger.exception(f"Could not load the reference profile of model {model_version}. Drift sketches keep the old one.")
+
+    def _poll(self):
+        while not self._stop_event.wait(self.poll_interval_seconds):
+            try:
+                self.check_for_update()
+            except Exception:
+                logger.exception("Model version poll failed.")
+
+    def start(self):
+        #Called from the app lifespan so the thread is created inside each worker process
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._poll, name="model-reloader", daemon=True)
+            self._thread.start()
+            logger.info(f"Model hot reload watching {MODEL_VERSION_PATH} every {self.poll_interval_seconds}s.")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval_seconds + 1)
+            self._thread = None
+
+    def status(self) -> Dict:
+        return {
+            "model_version": self.model_version,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+        }
@@ -0,0 +1,97 @@
+"""
+Monitoring bookkeeping of single-record requests, off the event loop.
+
+Compiled scoring is cheap enough to run on the event loop, but the drift
+recorder, shadow scorer and prediction logger behind it take locks that a
+flush can hold for a while. For those requests the endpoint only appends
+(pipeline, record, probability, label) to a bounded queue, and a background
+thread hands the rows to `InferencePipeline.monitor`. When the queue is full,
+rows are dropped from monitoring (and counted) rather than blocking a request.
+"""
+#importing library
+import threading
+from collections import deque
+from typing import Dict
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.config.configuration import get_section
+
+logger = get_logger(__name__)
+
+
+class MonitorQueue:
+    def __init__(self, max_pending_rows: int = 100_000, poll_interval_seconds: float = 0.05):
+        self.max_pending_rows = int(max_pending_rows)
+        self.poll_interval_seconds = float(poll_interval_seconds)
+
+        self.submitted_rows = 0
+        self.dropped_rows = 0
+        self.processed_rows = 0
+        self.failed_rows = 0
+
+        #deque appends and pops are atomic; the lock only guards the bound check
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls) -> "MonitorQueue":
+        queue_config = get_section("serving").get("monitor_queue") or {}
+        return cls(max_pending_rows = queue_config.get("max_pending_rows", 100_000))
+
+    def submit(self, pipeline, record: Dict, probability: float, label: str) -> bool:
+        """Queue one scored record for monitoring. Never blocks; returns False if dropped."""
+        with self._lock:
+            if len(self._pending) >= self.max_pending_rows:
+                self.dropped_rows += 1
+                return False
+            self._pending.append((pipeline, record, probability, label))
+            self.submitted_rows += 1
+        return True
+
+    def drain(self):
+        """Monitor everything queued so far, in the calling thread."""
+        while True:
+            try:
+                pipeline, record, probability, label = self._pending.popleft()
+            except IndexError:
+                return
+            try:
+                pipeline.monitor(record, probability, label)
+                self.processed_rows += 1
+            except Exception:
+                self.failed_rows += 1
+                logger.exception("Failed to monitor a served record.")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(self.poll_interval_seconds)
+            self._wake.clear()
+            self.drain()
+
+    def start(self):
+        #Called from the app lifespan so the thread is created inside each worker process
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="monitor-queue", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval_seconds + 5)
+            self._thread = None
+        self.drain()
+
+    def stats(self) -> Dict:
+        return {
+            "submitted_rows": self.submitted_rows,
+            "processed_rows": self.processed_rows,
+            "dropped_rows": self.dropped_rows,
+            "failed_rows": self.failed_rows,
+            "pending_rows": len(self._pending),
+        }
@@ -1,7 +1,12 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
 
 
 class ChurnRequest(BaseModel):
+    #NaN/Infinity literals are rejected with a 422 instead of reaching the model
+    model_config = ConfigDict(allow_inf_nan=False)
+
     SeniorCitizen: int
     Partner: str
     Dependents: str
@@ -23,5 +28,8 @@ class ChurnRequest(BaseModel):
 
 
 class ChurnResponse(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+
     churn_probability: float
     churn_prediction: str
+    model_version: Optional[str] = None
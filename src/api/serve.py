@@ -0,0 +1,108 @@
+"""
+Multi-worker API server.
+
+With `preload` on, the gunicorn master imports `src.api.app` (and so unpickles the
+model artifacts) once before forking, and every worker shares those pages
+copy-on-write instead of loading its own copy. The loaded objects are moved to
+the permanent GC generation before forking so that garbage collection in the
+workers does not write to, and thereby un-share, the preloaded pages.
+
+    python -m src.api.serve --workers 4
+"""
+#importing library
+import argparse
+import gc
+import os
+
+from gunicorn.app.base import BaseApplication
+
+#importing requirements
+from src.config.configuration import get_section
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from uvicorn_worker import UvicornWorker
+    WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+except ImportError:
+    WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+
+def _freeze_preloaded_objects(server, worker):
+    #Runs in the master right before each fork
+    gc.collect()
+    gc.freeze()
+
+
+class ChurnServingApplication(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from src.api.app import app
+        return app
+
+
+def build_options(host: str, port: int, workers: int, preload: bool) -> dict:
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": WORKER_CLASS,
+        "preload_app": preload,
+    }
+    if preload:
+        options["pre_fork"] = _freeze_preloaded_objects
+    return options
+
+
+def read_memory_kb(pid: int) -> dict:
+    """Rss/Pss/shared/private memory of one process in kB, from /proc/<pid>/smaps_rollup (Linux)."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def worker_pids(master_pid: int) -> list:
+    """Child process ids of a gunicorn master (Linux)."""
+    children_path = f"/proc/{master_pid}/task/{master_pid}/children"
+    with open(children_path, "r") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def main():
+    server_config = get_section("serving").get("server") or {}
+
+    parser = argparse.ArgumentParser(description="Run the churn API with multiple workers.")
+    parser.add_argument("--host", default=server_config.get("host", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=server_config.get("port", 8000))
+    parser.add_argument("--workers", type=int, default=server_config.get("workers", 2))
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        default=server_config.get("preload", True),
+                        help="Let every worker load its own copy of the artifacts.")
+    args = parser.parse_args()
+
+    logger.info(
+        f"Starting API with {args.workers} workers on {args.host}:{args.port} "
+        f"(preload={args.preload}, pid={os.getpid()})"
+    )
+    ChurnServingApplication(build_options(args.host, args.port, args.workers, args.preload)).run()
+
+
+if __name__ == "__main__":
+    main()
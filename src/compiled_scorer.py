@@ -0,0 +1,246 @@
+#importing library
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+def _sigmoid_array(z: np.ndarray) -> np.ndarray:
+    #Same values as scipy's expit without importing scipy; tanh does not overflow for large |z|
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+class CompiledLinearScorer:
+    """
+    Scores raw request records with a fitted StandardScaler/OneHotEncoder
+    ColumnTransformer and binary LogisticRegression folded into plain numbers.
+
+    The scaler mean/scale are folded into the numeric coefficients and the
+    intercept, and every one-hot column becomes an additive weight looked up by
+    category value, so one record costs a few dict lookups and one dot product.
+
+    Only numpy is needed to score: the fitted parameters round-trip through
+    `to_dict`/`from_dict`, so a bundle can carry a compiled scorer that serves
+    without importing scikit-learn.
+    """
+
+    def __init__(self,
+                 intercept: float,
+                 numeric_columns: List[str],
+                 numeric_weights: np.ndarray,
+                 categorical_tables: Dict[str, Dict[str, float]],
+                 ignore_unknown: Dict[str, bool]):
+        self.intercept = float(intercept)
+        self.numeric_columns = list(numeric_columns)
+        self.numeric_weights = np.asarray(numeric_weights, dtype=np.float64)
+        self.categorical_tables = categorical_tables
+        self.ignore_unknown = ignore_unknown
+
+        self._numeric_pairs = list(zip(self.numeric_columns, self.numeric_weights.tolist()))
+
+        #Index + weight vector per column for vectorized lookups; the extra
+        #trailing weight is what unknown categories (indexer -1) resolve to
+        self._category_index = {
+            col: (pd.Index(list(table)), np.array(list(table.values()) + [0.0]))
+            for col, table in categorical_tables.items()
+        }
+
+        #Typical numeric values (scaler mean/scale) used to build parity probes
+        self.numeric_center = np.zeros(len(self.numeric_columns))
+        self.numeric_spread = np.ones(len(self.numeric_columns))
+
+    def to_dict(self) -> Dict:
+        return {
+            "intercept": self.intercept,
+            "numeric_columns": self.numeric_columns,
+            "numeric_weights": self.numeric_weights.tolist(),
+            "numeric_center": np.asarray(self.numeric_center, dtype=np.float64).tolist(),
+            "numeric_spread": np.asarray(self.numeric_spread, dtype=np.float64).tolist(),
+            "categorical_tables": self.categorical_tables,
+            "ignore_unknown": self.ignore_unknown,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CompiledLinearScorer":
+        scorer = cls(
+            data["intercept"], data["numeric_columns"], np.array(data["numeric_weights"]),
+            data["categorical_tables"], data["ignore_unknown"]
+        )
+        scorer.numeric_center = np.array(data["numeric_center"])
+        scorer.numeric_spread = np.array(data["numeric_spread"])
+        return scorer
+
+    @classmethod
+    def compile(cls, preprocessor, model) -> Optional["CompiledLinearScorer"]:
+        """Build a scorer, or return None when the artifacts are not a supported linear model."""
+        #Only compiling needs scikit-learn; serving a compiled scorer does not
+        from sklearn.compose import ColumnTransformer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        if not isinstance(model, LogisticRegression) or len(model.classes_) != 2:
+            return None
+        if not isinstance(preprocessor, ColumnTransformer):
+            return None
+
+        coef = model.coef_.ravel()
+        intercept = float(model.intercept_[0])
+        numeric_columns, numeric_weights = [], []
+        numeric_center, numeric_spread = [], []
+        categorical_tables, ignore_unknown = {}, {}
+        offset = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+
+            columns = list(columns)
+            if isinstance(transformer, StandardScaler):
+                weights = coef[offset: offset + len(columns)]
+                mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(len(columns))
+                scale = transformer.scale_ if transformer.scale_ is not None else np.ones(len(columns))
+
+                folded = weights / scale
+                intercept -= float(np.dot(folded, mean))
+                numeric_columns.extend(columns)
+                numeric_weights.extend(folded.tolist())
+                numeric_center.extend(np.broadcast_to(mean, len(columns)).tolist())
+                numeric_spread.extend(np.broadcast_to(scale, len(columns)).tolist())
+                offset += len(columns)
+
+            elif isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None or getattr(transformer, "_infrequent_enabled", False):
+                    return None
+                for col, categories in zip(columns, transformer.categories_):
+                    weights = coef[offset: offset + len(categories)]
+                    categorical_tables[col] = {
+                        category: float(weight) for category, weight in zip(categories.tolist(), weights)
+                    }
+                    ignore_unknown[col] = transformer.handle_unknown != "error"
+                    offset += len(categories)
+
+            else:
+                return None
+
+        if offset != coef.shape[0]:
+            return None
+
+        scorer = cls(intercept, numeric_columns, np.array(numeric_weights), categorical_tables, ignore_unknown)
+        scorer.numeric_center = np.array(numeric_center)
+        scorer.numeric_spread = np.array(numeric_spread)
+        return scorer
+
+    def _lookup(self, col: str, value) -> float:
+        weight = self.categorical_tables[col].get(value)
+        if weight is None:
+            if not self.ignore_unknown[col]:
+                raise ValueError(f"Found unknown category {value!r} in column {col}")
+            return 0.0
+        return weight
+
+    def _check_finite_record(self, record: Dict):
+        #Only reached when z is not finite: name the column, as sklearn rejects NaN/inf features
+        for col in self.numeric_columns:
+            value = float(record[col])
+            if not math.isfinite(value):
+                raise ValueError(f"Input X contains {value} in column {col}")
+
+    def decision_function_record(self, record: Dict) -> float:
+        z = self.intercept
+        for col, weight in self._numeric_pairs:
+            z += weight * float(record[col])
+        if not math.isfinite(z):
+            self._check_finite_record(record)
+        for col in self.categorical_tables:
+            z += self._lookup(col, record[col])
+        return z
+
+    def predict_proba_record(self, record: Dict) -> float:
+        """Churn probability for one request dict, without pandas or sklearn."""
+        return _sigmoid(self.decision_function_record(record))
+
+    def decision_function(self, input_df: pd.DataFrame) -> np.ndarray:
+        numeric = input_df[self.numeric_columns].to_numpy(dtype=np.float64)
+        finite = np.isfinite(numeric)
+        if not finite.all():
+            row, col = np.argwhere(~finite)[0]
+            raise ValueError(f"Input X contains {numeric[row, col]} in column {self.numeric_columns[col]}")
+        z = numeric @ self.numeric_weights
+        z += self.intercept
+        for col, (categories, weights) in self._category_index.items():
+            codes = categories.get_indexer(input_df[col])
+            if not self.ignore_unknown[col] and (codes < 0).any():
+                unknown = input_df[col].iloc[int(np.argmin(codes))]
+                raise ValueError(f"Found unknown category {unknown!r} in column {col}")
+            z += weights[codes]
+        return z
+
+    def predict_proba(self, input_df: pd.DataFrame) -> np.ndarray:
+        """Vectorized churn probabilities for a DataFrame of raw records."""
+        return _sigmoid_array(self.decision_function(input_df))
+
+    def probe_frame(self) -> pd.DataFrame:
+        """Small frame covering every known category, used to check parity with sklearn."""
+        n_rows = max([len(table) for table in self.categorical_tables.values()] + [5])
+        steps = np.linspace(-2.0, 2.0, n_rows)
+        data = {}
+        for i, col in enumerate(self.numeric_columns):
+            data[col] = self.numeric_center[i] + np.roll(steps, i) * self.numeric_spread[i]
+        for col, table in self.categorical_tables.items():
+            categories = list(table)
+            data[col] = [categories[i % len(categories)] for i in range(n_rows)]
+        return pd.DataFrame(data)
+
+
+def compile_linear_scorer(preprocessor, model, atol: float = 1e-9) -> Optional[CompiledLinearScorer]:
+    """
+    Compile the artifacts and confirm the scorer reproduces sklearn's probabilities.
+
+    Returns None when the model is not supported or the parity check fails, in which
+    case callers should keep using `preprocessor.transform` + `model.predict_proba`.
+    """
+    try:
+        scorer = CompiledLinearScorer.compile(preprocessor, model)
+        if scorer is None:
+            logger.info("Model is not a supported linear model. Using sklearn scoring path.")
+            return None
+
+        #A preprocessor with float32 output rounds the scaled features, so sklearn itself is only that precise
+        if any(getattr(transformer, "output_dtype", None) == np.float32 for _, transformer, _ in preprocessor.transformers_):
+            atol = max(atol, 1e-5)
+
+        probe_df = scorer.probe_frame()
+        expected = model.predict_proba(preprocessor.transform(probe_df))[:, 1]
+        max_diff = float(np.max(np.abs(scorer.predict_proba(probe_df) - expected)))
+        record_diff = max(
+            abs(scorer.predict_proba_record(record) - prob)
+            for record, prob in zip(probe_df.to_dict("records"), expected)
+        )
+
+        if max(max_diff, record_diff) > atol:
+            logger.warning(
+                f"Compiled scorer differs from sklearn by {max(max_diff, record_diff):.3e}. "
+                "Using sklearn scoring path."
+            )
+            return None
+
+        logger.info(f"Compiled linear scorer enabled (max parity error {max(max_diff, record_diff):.3e}).")
+        return scorer
+
+    except Exception:
+        #Compilation is an optimization only, never a reason to refuse serving
+        logger.exception("Failed to compile linear scorer. Using sklearn scoring path.")
+        return None
@@ -0,0 +1,17 @@
+import yaml
+from functools import lru_cache
+
+from src.config.paths import CONFIG_FILE_PATH
+
+
+@lru_cache(maxsize=1)
+def load_config() -> dict:
+    """Read `config.yaml` once per process and return it as a dict."""
+    with open(CONFIG_FILE_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    return config or {}
+
+
+def get_section(name: str) -> dict:
+    """Return a top level section of the config, or an empty dict if it is missing."""
+    return load_config().get(name) or {}
@@ -8,6 +8,7 @@ LOGS_DIR = os.path.join(ROOT_DIR, "logs")
 
 #config directory
 CONFIG_DIR = os.path.join(ROOT_DIR, "config")
+CONFIG_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
 
 #data directory
 DATA_DIR = os.path.join(ROOT_DIR, "data")
@@ -15,6 +16,26 @@ RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")
 PROCESSED_DATA_DIR = os.path.join(DATA_DIR, "processed")
 DRIFT_DATA_DIR = os.path.join(DATA_DIR, "drift")
 
+#raw dataset and the typed train/test splits written by ingestion
+RAW_DATA_PATH = os.path.join(RAW_DATA_DIR, "Telco_customer_churn.csv")
+TRAIN_DATA_PATH = os.path.join(PROCESSED_DATA_DIR, "train.parquet")
+TEST_DATA_PATH = os.path.join(PROCESSED_DATA_DIR, "test.parquet")
+
+#new labelled batches (same schema as the raw data) folded in by retraining
+LABELLED_DATA_DIR = os.path.join(DATA_DIR, "labelled")
+
+#synthetic datasets (raw schema) generated for load and scale tests
+SYNTHETIC_DATA_DIR = os.path.join(DATA_DIR, "synthetic")
+
+#per-window drift sketches written by the serving workers
+SKETCH_DIR = os.path.join(DRIFT_DATA_DIR, "sketches")
+
+#partitioned parquet log of served predictions
+PREDICTION_LOG_DIR = os.path.join(DRIFT_DATA_DIR, "predictions")
+
+#drift monitor time series and state
+MONITOR_DIR = os.path.join(DRIFT_DATA_DIR, "monitor")
+
 #artifact directory
 ARTIFACT_DIR = os.path.join(DATA_DIR, "artifacts")
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
@@ -22,6 +43,28 @@ os.makedirs(ARTIFACT_DIR, exist_ok=True)
 #model directory
 MODEL_DIR = os.path.join(ARTIFACT_DIR, "model")
 
+#last trained candidate, bundled only when it is promoted or kept as challenger
+CANDIDATE_DIR = os.path.join(ARTIFACT_DIR, "candidate")
+
+#labelled batches consumed by incremental retraining since the last full refit
+INCREMENTAL_STATE_PATH = os.path.join(ARTIFACT_DIR, "incremental_state.json")
+
+#manifests of the cached training pipeline stages
+STAGE_CACHE_DIR = os.path.join(ARTIFACT_DIR, "stage_cache")
+
+#version marker written whenever a model is promoted to production
+MODEL_VERSION_PATH = os.path.join(ARTIFACT_DIR, "model_version.json")
+
+#challenger bundle scored in shadow next to the production model (a rejected candidate)
+CHALLENGER_VERSION_PATH = os.path.join(ARTIFACT_DIR, "challenger_version.json")
 
+#one versioned bundle directory per promoted model
+BUNDLE_DIR = os.path.join(ARTIFACT_DIR, "bundles")
 
+#profile of the training data and scores the served model was fitted on, published on promotion
+REFERENCE_PROFILE_PATH = os.path.join(ARTIFACT_DIR, "reference_profile.json")
+CONFIDENCE_BASELINE_PATH = os.path.join(ARTIFACT_DIR, "confidence_baseline.json")
 
+#the same baselines for the staged candidate, frozen into its bundle by evaluation
+CANDIDATE_REFERENCE_PROFILE_PATH = os.path.join(CANDIDATE_DIR, "reference_profile.json")
+CANDIDATE_CONFIDENCE_BASELINE_PATH = os.path.join(CANDIDATE_DIR, "confidence_baseline.json")
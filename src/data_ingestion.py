@@ -7,49 +7,114 @@ from sklearn.model_selection import train_test_split
 #importing requirements
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
-from src.config.paths import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from src.utils.common import save_frame, load_frame
+from src.config.paths import RAW_DATA_PATH, TRAIN_DATA_PATH, TEST_DATA_PATH, LABELLED_DATA_DIR
 
 
 
 logger = get_logger(__name__)
 
+def list_labelled_batches(labelled_dir: str = LABELLED_DATA_DIR) -> list:
+    """Labelled batch files (parquet or csv, raw schema incl. Churn) in name order."""
+    if not os.path.isdir(labelled_dir):
+        return []
+    return sorted(
+        os.path.join(labelled_dir, name) for name in os.listdir(labelled_dir)
+        if name.endswith((".parquet", ".csv")) and not name.startswith(".")
+    )
+
+def read_labelled_batch(file_path: str) -> pd.DataFrame:
+    df = pd.read_csv(file_path) if file_path.endswith(".csv") else load_frame(file_path)
+    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+    return df
+
+def split_frame(df: pd.DataFrame, test_size: float = 0.2, random_state: int = 42):
+    """Train/test split of one source, stratified on Churn when every class has enough rows."""
+    if len(df) < 2:
+        return df, df.iloc[:0]
+    try:
+        return train_test_split(df, test_size=test_size, random_state=random_state, stratify=df["Churn"])
+    except ValueError:
+        #A small batch with a single row of one class
+        return train_test_split(df, test_size=test_size, random_state=random_state)
+
+def split_labelled_batches(file_paths: list, test_size: float = 0.2, random_state: int = 42):
+    """
+    (train_df, test_df) of labelled batches, each batch split on its own.
+
+    A row's side depends only on its batch file, so batches arriving later never
+    move rows between the splits, and the test rows of a batch are never
+    trained on by an incremental refit either.
+    """
+    splits = [split_frame(read_labelled_batch(path), test_size, random_state) for path in file_paths]
+    return tuple(pd.concat([split[side] for split in splits], ignore_index=True) for side in (0, 1))
+
 class DataIngestion:
-    def __init__(self, test_size:float=0.2, random_state = 42):
+    def __init__(self, test_size:float=0.2, random_state = 42,
+                 raw_file_path: str = RAW_DATA_PATH,
+                 train_path: str = TRAIN_DATA_PATH,
+                 test_path: str = TEST_DATA_PATH,
+                 labelled_dir: str = LABELLED_DATA_DIR):
         self.test_size= test_size
         self.random_state = random_state
+        self.raw_file_path = raw_file_path
+        self.train_path = train_path
+        self.test_path = test_path
+        self.labelled_dir = labelled_dir
+
+        #Splits of the last run, handed to preprocessing without a round trip through disk
+        self.train_df = None
+        self.test_df = None
+
+    def read_raw_data(self) -> pd.DataFrame:
+        if not os.path.exists(self.raw_file_path):
+            raise FileNotFoundError(f"Raw Data was not found at {self.raw_file_path}")
+
+        logger.info(f"Reading raw data file from {self.raw_file_path}")
+        df = pd.read_csv(self.raw_file_path)
+
+        #Blank TotalCharges become NaN here, once, so every later stage reads a float column
+        df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+        return df
 
     def initiate_data_ingestion(self):
         try:
             logger.info("Data Ingestion Started.")
-            raw_file_path= os.path.join(RAW_DATA_DIR, "telco_customer_churn.csv")
-            
-            if not os.path.exists(raw_file_path):
-                raise FileNotFoundError(f"Raw Data was not found at {raw_file_path}")
-
-            logger.info(f"Reading raw data file from {raw_file_path}")
-            df = pd.read_csv(raw_file_path)
+            df = self.read_raw_data()
 
             logger.info(f"Splitting data into train and test sets.")
-            train_df, test_df = train_test_split(df, test_size=self.test_size, random_state=self.random_state, stratify=df['Churn'])
-
-            os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
+            train_df, test_df = split_frame(df, self.test_size, self.random_state)
 
-            train_path = os.path.join(PROCESSED_DATA_DIR, "train.csv")
-            test_path  = os.path.join(PROCESSED_DATA_DIR, "test.csv")
+            #Labelled batches collected since the original dataset are part of the full history.
+            #Each source is split on its own, so the raw rows keep their side (and the production
+            #model's test rows stay unseen) however many batches arrive
+            batches = list_labelled_batches(self.labelled_dir)
+            if batches:
+                logger.info(f"Adding {len(batches)} labelled batches from {self.labelled_dir}")
+                batch_train, batch_test = split_labelled_batches(batches, self.test_size, self.random_state)
+                train_df = pd.concat([train_df, batch_train], ignore_index=True)
+                test_df = pd.concat([test_df, batch_test], ignore_index=True)
 
-            train_df.to_csv(train_path, index=False)
-            logger.info(f"Training data saved successfully saved at {train_path}")
+            save_frame(self.train_path, train_df)
+            logger.info(f"Training data saved successfully saved at {self.train_path}")
 
-            test_df.to_csv(test_path, index= False)
-            logger.info(f"Testing data saved successfully saved at {test_path}")
+            save_frame(self.test_path, test_df)
+            logger.info(f"Testing data saved successfully saved at {self.test_path}")
 
+            self.train_df, self.test_df = train_df, test_df
             logger.info("Data Ingestion Completed successfully")
 
-            return train_path , test_path
+            return self.train_path , self.test_path
         except Exception as e:
             logger.exception("Data Ingestion Failed.")
             raise ChurnException(e, sys)
 
+    def release_frames(self):
+        """Hand over the in-memory splits and drop this object's references, so the caller can free them."""
+        frames = self.train_df, self.test_df
+        self.train_df, self.test_df = None, None
+        return frames
+
 if __name__ == "__main__":
     obj = DataIngestion()
     training, testing = obj.initiate_data_ingestion()
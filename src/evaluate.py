@@ -4,51 +4,177 @@ import sys
 import pandas as pd
 import numpy as np 
 import json
+from datetime import datetime, timezone
 
 #importing requirements
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
-from src.utils.common import load_object, eval_metrics, save_json
-from src.config.paths import ARTIFACT_DIR
+from src.utils.common import load_object, load_frame, eval_metrics, save_json, get_artifact_version
+from src.utils.metrics import threshold_sweep, select_threshold, bootstrap_metrics
+from src.utils.model_bundle import save_bundle
+from src.compiled_scorer import CompiledLinearScorer, compile_linear_scorer
+from src.config.paths import (
+    TEST_DATA_PATH, ARTIFACT_DIR, CANDIDATE_DIR, MODEL_VERSION_PATH, CHALLENGER_VERSION_PATH, BUNDLE_DIR,
+    REFERENCE_PROFILE_PATH, CONFIDENCE_BASELINE_PATH,
+    CANDIDATE_REFERENCE_PROFILE_PATH, CANDIDATE_CONFIDENCE_BASELINE_PATH
+)
+from src.config.configuration import get_section
 from src.preprocessing import DataPreprocessing
+from src.monitoring.reference_profile import (
+    save_score_baseline, publish_baselines, REFERENCE_PROFILE_FILE, CONFIDENCE_BASELINE_FILE
+)
 
 logger = get_logger(__name__)
 
+#Same value as threshold.recall_target in config.yaml, used when the config leaves it out
+DEFAULT_RECALL_TARGET = 0.85
+
 class ModelEval:
-    def __init__(self, threshold : float):
+    def __init__(self, threshold : float = None, recall_target: float = DEFAULT_RECALL_TARGET,
+                 n_resamples: int = 2000, ci_level: float = 0.95, cv_folds: int = 5, random_state: int = 42):
+        #threshold=None: picked on out-of-fold training scores as the most precise one reaching recall_target
         self.threshold = threshold
+        self.recall_target = recall_target
+        self.n_resamples = n_resamples
+        self.ci_level = ci_level
+        self.cv_folds = cv_folds
+        self.random_state = random_state
+
+    @classmethod
+    def from_config(cls, threshold: float = None) -> "ModelEval":
+        threshold_config = get_section("threshold")
+        bootstrap_config = get_section("metrics").get("bootstrap") or {}
+        return cls(
+            threshold = threshold if threshold is not None else threshold_config.get("value"),
+            recall_target = threshold_config.get("recall_target", DEFAULT_RECALL_TARGET),
+            n_resamples = bootstrap_config.get("n_resamples", 2000),
+            ci_level = bootstrap_config.get("ci_level", 0.95),
+            cv_folds = threshold_config.get("cv_folds", 5)
+        )
+
+    def select_oof_threshold(self, model, X_train, y_train_encoded: np.ndarray) -> float:
+        """
+        Threshold reaching `recall_target` on out-of-fold scores of the training split.
+
+        Each fold is scored by a clone of the candidate fitted on the other folds,
+        so the test split never influences the threshold it is then reported at.
+        """
+        from sklearn.base import clone
+        from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+        estimator = clone(model)
+        if "warm_start" in estimator.get_params():
+            #An incremental candidate is warm started; its folds are fitted from scratch
+            estimator.set_params(warm_start=False)
+        folds = StratifiedKFold(n_splits=self.cv_folds, shuffle=True, random_state=self.random_state)
+        oof_prob = cross_val_predict(estimator, X_train, y_train_encoded, cv=folds, method="predict_proba")[:, 1]
+
+        sweep = threshold_sweep(y_train_encoded, oof_prob)
+        threshold = select_threshold(sweep, self.recall_target)
+        logger.info(
+            f"Threshold {threshold:.4f} selected from {len(sweep['threshold'])} out-of-fold candidates "
+            f"({self.cv_folds} folds) for recall target {self.recall_target}"
+        )
+        return threshold
+
+    def score_production(self, test_df: pd.DataFrame = None):
+        """
+        Metrics and bootstrap intervals of the current production model on the
+        test split, at the threshold it is served with. None when there is no
+        production model to load.
 
-    def initiate_eval(self, X_test : np.ndarray, y_test : np.ndarray):
+        Production is re-scored instead of trusting production_metrics.json, which
+        may come from another test split or, in the legacy layout, have no
+        intervals and a fixed threshold. Ingestion never moves a row into the
+        test split once it was on the training side (see `split_frame`), so
+        production has not been fitted on any of these rows either.
+        """
+        from src.predict import load_production_objects
+
+        try:
+            objects, model_version, threshold = load_production_objects()
+        except Exception:
+            logger.warning("Production model could not be loaded for comparison.")
+            return None
+
+        preprocessing = DataPreprocessing()
+        if test_df is None:
+            test_df = load_frame(TEST_DATA_PATH)
+        test_df = preprocessing.clean_data(test_df)
+        X_test = objects["preprocessor"].transform(test_df.drop(columns=preprocessing.target_column))
+        y_prob = objects["model"].predict_proba(X_test)[:, 1]
+        y_test_encoded = objects["le_churn"].transform(test_df[preprocessing.target_column])
+
+        #Same test rows and resampling seed as the candidate, so both are bootstrapped on the same draws
+        intervals = bootstrap_metrics(
+            y_test_encoded, y_prob, threshold, n_resamples=self.n_resamples, ci_level=self.ci_level
+        )
+        logger.info(f"Production model {model_version} re-scored at threshold {threshold}: {intervals}")
+        return {
+            "Model version": model_version,
+            "Threshold": threshold,
+            "recall score": intervals["recall"]["estimate"],
+            "ROC-AUC score": intervals["roc_auc"]["estimate"],
+            "Confidence Intervals": intervals,
+        }
+
+    def initiate_eval(self, X_test : np.ndarray, y_test : np.ndarray,
+                      X_train : np.ndarray = None, y_train : np.ndarray = None, test_df: pd.DataFrame = None):
+        """
+        Evaluate the staged candidate on the test split and decide its promotion.
+        `X_train`/`y_train` are needed when the threshold is selected; `test_df`
+        is the raw test split production is re-scored on (read from disk when None).
+        """
         try:
             logger.info("Model Evaluation started.")
+            if self.threshold is None and (X_train is None or y_train is None):
+                raise ValueError("Selecting the threshold needs the training split (X_train, y_train).")
 
-            #Load trained model
-            model_path = os.path.join(ARTIFACT_DIR, "Churn_Model.pkl")
+            #Load trained candidate
+            model_path = os.path.join(CANDIDATE_DIR, "Churn_Model.pkl")
             model = load_object(model_path)
 
             #Prediction of probablity
             y_test_prob = model.predict_proba(X_test)[:, 1]
 
-            #Apply Custom threshold 
-            y_pred = (y_test_prob >=self.threshold).astype(int)
-
             #Apply encoding to y_test
-            le_churn_path = os.path.join(ARTIFACT_DIR, "le_churn.pkl")
+            le_churn_path = os.path.join(CANDIDATE_DIR, "le_churn.pkl")
             le_churn = load_object(le_churn_path)
 
             y_test_encoded = le_churn.transform(y_test)
 
+            #Selected on the training split only; the chosen one travels with the promoted bundle
+            threshold = self.threshold
+            if threshold is None:
+                threshold = self.select_oof_threshold(model, X_train, le_churn.transform(y_train))
+
+            #Baseline score distribution the retraining trigger compares served scores with, published on promotion
+            save_score_baseline(
+                y_test_prob, threshold, CANDIDATE_REFERENCE_PROFILE_PATH, CANDIDATE_CONFIDENCE_BASELINE_PATH
+            )
+
+            #Apply Custom threshold 
+            y_pred = (y_test_prob >=threshold).astype(int)
+
             #Evaluating using Metrics 
             acc, recall, f1, prec, roc_auc, report = eval_metrics(y_test_encoded, y_pred, y_test_prob)
+            intervals = bootstrap_metrics(
+                y_test_encoded, y_test_prob, threshold,
+                n_resamples=self.n_resamples, ci_level=self.ci_level
+            )
+            logger.info(f"Bootstrap {self.ci_level:.0%} intervals ({self.n_resamples} resamples): {intervals}")
 
             #Saving metrics to artifacts
             metrics = {
-                "Threshold" :self.threshold,
+                "Threshold" :threshold,
                 "accuracy score": acc,
                 "recall score" : recall,
                 "f1 score" : f1,
                 "Precision score" : prec,
                 "ROC-AUC score" : roc_auc,
+                "Recall target" : self.recall_target,
+                "Threshold selection" : "fixed" if self.threshold is not None else f"out-of-fold ({self.cv_folds} folds)",
+                "Confidence Intervals" : intervals,
                 "Classification Report" : report
             }
 
@@ -60,22 +186,27 @@ class ModelEval:
 
             production_metrics_path = os.path.join(ARTIFACT_DIR, "production_metrics.json")
 
+            #Serving must keep loading the current production model whatever is decided below
+            bundle_legacy_production()
+
+            #Production scored on this very test split at its own threshold
+            production_metrics = self.score_production(test_df)
+
             # If no production model exists, promote automatically
-            if not os.path.exists(production_metrics_path):
+            if production_metrics is None:
                 save_json(production_metrics_path, metrics)
+                mark_promoted_version(threshold, metrics)
                 logger.info("No production model found. Promoting candidate as production.")
                 return metrics_path, metrics
 
-            # Load existing production metrics
-            with open(production_metrics_path, "r") as f:
-                production_metrics = json.load(f)
-
             # Compare models
             if is_model_better(metrics, production_metrics):
                 save_json(production_metrics_path, metrics)
+                mark_promoted_version(threshold, metrics)
                 logger.info("Candidate model promoted to production.")
             else:
                 logger.warning("Candidate model rejected. Production model retained.")
+                mark_challenger_version(threshold, metrics)
 
             return metrics_path, metrics
 
@@ -84,20 +215,186 @@ class ModelEval:
             raise ChurnException(e, sys)
 
 
+def build_bundle_manifest(preprocessor, model, le_churn, threshold: float, metrics: dict = None) -> dict:
+    numeric, categorical = [], {}
+    for _, transformer, columns in preprocessor.transformers_:
+        if hasattr(transformer, "categories_"):
+            categorical.update({col: cats.tolist() for col, cats in zip(columns, transformer.categories_)})
+        elif transformer != "drop":
+            numeric.extend(list(columns))
+
+    return {
+        "model_type": type(model).__name__,
+        "threshold": threshold,
+        "labels": le_churn.classes_.tolist(),
+        "features": {
+            "order": list(preprocessor.feature_names_in_),
+            "numeric": numeric,
+            "categorical": list(categorical),
+        },
+        "schema": {
+            **{col: {"type": "number"} for col in numeric},
+            **{col: {"type": "category", "categories": cats} for col, cats in categorical.items()},
+        },
+        "metrics": {
+            key: value for key, value in (metrics or {}).items() if isinstance(value, (int, float))
+        },
+    }
+
+
+def _artifact_paths(artifact_dir: str) -> list:
+    return [os.path.join(artifact_dir, name) for name in ("preprocessor.pkl", "Churn_Model.pkl", "le_churn.pkl")]
+
+
+def _baseline_files(profile_path: str, confidence_path: str) -> dict:
+    files = {REFERENCE_PROFILE_FILE: profile_path, CONFIDENCE_BASELINE_FILE: confidence_path}
+    return {name: path for name, path in files.items() if os.path.exists(path)}
+
+
+def _compiled_scorer_dict(preprocessor, model):
+    """
+    Parameters of the parity-checked compiled scorer, for serving the bundle
+    without scikit-learn. None when the model does not compile, or does not
+    survive the JSON round trip exactly (e.g. non-string categories).
+    """
+    scorer = compile_linear_scorer(preprocessor, model)
+    if scorer is None:
+        return None
+    compiled = json.loads(json.dumps(scorer.to_dict()))
+    probe_df = scorer.probe_frame()
+    if not np.array_equal(CompiledLinearScorer.from_dict(compiled).predict_proba(probe_df), scorer.predict_proba(probe_df)):
+        logger.warning("Compiled scorer does not round-trip through JSON. Bundle is served with scikit-learn.")
+        return None
+    return compiled
+
+
+def _freeze_bundle(threshold: float, metrics: dict = None, artifact_dir: str = None,
+                   model_version: str = None, baseline_files: dict = None):
+    """
+    Freeze the candidate's artifacts and drift baselines into a versioned bundle;
+    returns (model_version, bundle_path).
+    """
+    artifact_paths = _artifact_paths(artifact_dir or CANDIDATE_DIR)
+    #The threshold is selected per evaluation, so the same model re-promoted with a new one is a new version
+    if model_version is None:
+        model_version = get_artifact_version(artifact_paths, extra=f"threshold={threshold!r}")
+    preprocessor, model, le_churn = [load_object(path) for path in artifact_paths]
+
+    bundle_path = os.path.join(BUNDLE_DIR, model_version)
+    manifest = build_bundle_manifest(preprocessor, model, le_churn, threshold, metrics)
+    manifest["model_version"] = model_version
+    compiled = _compiled_scorer_dict(preprocessor, model)
+    if compiled is not None:
+        manifest["compiled_scorer"] = compiled
+    if baseline_files is None:
+        baseline_files = _baseline_files(CANDIDATE_REFERENCE_PROFILE_PATH, CANDIDATE_CONFIDENCE_BASELINE_PATH)
+    save_bundle(
+        bundle_path,
+        {"preprocessor": preprocessor, "model": model, "le_churn": le_churn},
+        manifest,
+        extra_files = baseline_files
+    )
+    return model_version, bundle_path
+
+
+def _write_version_marker(marker_path: str, model_version: str, bundle_path: str, stamp: str):
+    save_json(marker_path, {
+        "model_version": model_version,
+        "bundle": os.path.relpath(bundle_path, ARTIFACT_DIR),
+        stamp: datetime.now(timezone.utc).isoformat()
+    })
+
+
+def mark_promoted_version(threshold: float, metrics: dict = None) -> str:
+    """
+    Freeze the promoted artifacts into a versioned bundle, publish its drift
+    baselines and point the version marker at it, so serving processes load
+    (or hot reload) exactly this model.
+    """
+    model_version, bundle_path = _freeze_bundle(threshold, metrics)
+    publish_baselines(bundle_path, REFERENCE_PROFILE_PATH, CONFIDENCE_BASELINE_PATH)
+    _write_version_marker(MODEL_VERSION_PATH, model_version, bundle_path, "promoted_at")
+    logger.info(f"Model version {model_version} marked as production.")
+    return model_version
+
+
+def bundle_legacy_production():
+    """
+    Freeze the loose production pickles of the pre-bundle layout into a bundle
+    and write the version marker, once. Returns the model version, or None when
+    a marker already exists or there is no loose production model.
+
+    The bundle keeps the version and threshold the legacy loader served it
+    with, so caches and metrics labels do not change.
+    """
+    artifact_paths = _artifact_paths(ARTIFACT_DIR)
+    if os.path.exists(MODEL_VERSION_PATH) or not all(os.path.exists(path) for path in artifact_paths):
+        return None
+
+    from src.predict import DEFAULT_THRESHOLD
+
+    metrics = {}
+    production_metrics_path = os.path.join(ARTIFACT_DIR, "production_metrics.json")
+    if os.path.exists(production_metrics_path):
+        with open(production_metrics_path, "r") as f:
+            metrics = json.load(f)
+
+    #Whatever baselines are published belong to this model: no candidate has been evaluated against them yet
+    model_version, bundle_path = _freeze_bundle(
+        DEFAULT_THRESHOLD, metrics, artifact_dir=ARTIFACT_DIR, model_version=get_artifact_version(artifact_paths),
+        baseline_files=_baseline_files(REFERENCE_PROFILE_PATH, CONFIDENCE_BASELINE_PATH)
+    )
+    _write_version_marker(MODEL_VERSION_PATH, model_version, bundle_path, "promoted_at")
+    logger.info(f"Loose production artifacts bundled as model version {model_version}.")
+    return model_version
+
+
+def mark_challenger_version(threshold: float, metrics: dict = None) -> str:
+    """
+    Bundle a rejected candidate and name it as the challenger, so serving
+    processes with shadow scoring enabled score live traffic with it too.
+    """
+    model_version, bundle_path = _freeze_bundle(threshold, metrics)
+    _write_version_marker(CHALLENGER_VERSION_PATH, model_version, bundle_path, "challenger_since")
+    logger.info(f"Model version {model_version} marked as challenger for shadow scoring.")
+    return model_version
+
+
+#Bootstrap interval keys of the metrics promotion is decided on, with their point-estimate names
+PROMOTION_METRICS = {"roc_auc": "ROC-AUC score", "recall": "recall score"}
+
 def is_model_better(candidate_metrics: dict, production_metrics: dict) -> bool:
-    return (
-        candidate_metrics["ROC-AUC score"] >= production_metrics["ROC-AUC score"]
-        and
-        candidate_metrics["recall score"] >= production_metrics["recall score"]
+    """
+    The candidate must have a bootstrap interval lower bound at least as high as
+    production's for ROC-AUC and for recall, both scored on the same test split.
+    Metrics without intervals (e.g. a legacy production_metrics.json, recorded at
+    a fixed threshold) are not comparable: the candidate is not promoted.
+    """
+    candidate_intervals = candidate_metrics.get("Confidence Intervals")
+    production_intervals = production_metrics.get("Confidence Intervals")
+
+    if not candidate_intervals or not production_intervals:
+        logger.warning("Candidate and production metrics are not comparable (no bootstrap intervals).")
+        return False
+
+    decision = all(
+        candidate_intervals[key]["low"] >= production_intervals[key]["low"] for key in PROMOTION_METRICS
+    )
+    logger.info(
+        "Promotion on interval lower bounds: " + ", ".join(
+            f"{key} {candidate_intervals[key]['low']:.4f} vs {production_intervals[key]['low']:.4f}"
+            for key in PROMOTION_METRICS
+        )
     )
+    return decision
 
 
 if __name__ == "__main__":
     preprocessor = DataPreprocessing()
     X_train, X_test, y_train, y_test, _ = preprocessor.initiate_preprocessing()
 
-    evaluator = ModelEval(threshold=0.35)
-    path, metric = evaluator.initiate_eval(X_test, y_test)
+    evaluator = ModelEval.from_config()
+    path, metric = evaluator.initiate_eval(X_test, y_test, X_train, y_train)
 
     print(f"Metrics is save at path : {path}")
     print(metric)
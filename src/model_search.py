@@ -0,0 +1,251 @@
+"""
+Parallel candidate search for the training stage.
+
+Candidates and their hyperparameter grids come from `training.search` in
+config.yaml. Every grid point is a trial, scored with stratified K-fold ROC-AUC
+in a process pool. The training matrix is sent to each worker once.
+
+    budget_seconds       wall clock of the whole search: trials still fitting when it runs
+                         out are recorded as timed out and their workers are stopped
+    cpu_budget_seconds   no trial starts once the finished trials used this much CPU time
+    abandon_margin       a trial whose first fold scores this far below the best finished
+                         trial is abandoned without fitting its remaining folds
+
+Candidates whose library is not installed (lightgbm, xgboost, catboost are
+optional) are skipped with a warning.
+"""
+#importing library
+import sys
+import time
+import importlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import zip_longest
+from typing import Dict, List, Optional
+
+import numpy as np
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.config.configuration import get_section
+
+logger = get_logger(__name__)
+
+
+def build_estimator(class_path: str, params: Dict):
+    module_name, class_name = class_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)(**params)
+
+
+#Set once per worker process by the pool initializer
+_WORKER_DATA = {}
+
+def _init_worker(X, y, folds):
+    _WORKER_DATA.update(X=X, y=y, folds=folds)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor):
+    """Stop the pool's worker processes, even in the middle of a fit."""
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        #Python 3.14+
+        terminate()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+
+def _run_trial(trial: Dict, deadline: float, abandon_below: Optional[float]) -> Dict:
+    from sklearn.metrics import roc_auc_score
+
+    X, y, folds = _WORKER_DATA["X"], _WORKER_DATA["y"], _WORKER_DATA["folds"]
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    scores, status, error = [], "completed", None
+
+    try:
+        for train_idx, valid_idx in folds:
+            if time.time() > deadline:
+                status = "timeout"
+                break
+            model = build_estimator(trial["class"], trial["params"])
+            model.fit(X[train_idx], y[train_idx])
+            scores.append(float(roc_auc_score(y[valid_idx], model.predict_proba(X[valid_idx])[:, 1])))
+
+            #Weak trials stop after their first fold
+            if len(scores) == 1 and abandon_below is not None and scores[0] < abandon_below:
+                status = "abandoned"
+                break
+
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+
+    return {
+        **trial,
+        "status": status,
+        "fold_scores": scores,
+        "score": float(np.mean(scores)) if status == "completed" else None,
+        "wall_seconds": time.perf_counter() - wall_start,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "error": error,
+    }
+
+
+class CandidateSearch:
+    def __init__(self, candidates: Dict, n_jobs: int = 2, cv_folds: int = 3,
+                 budget_seconds: float = 600, cpu_budget_seconds: float = None,
+                 abandon_margin: float = 0.02, random_state: int = 42):
+        self.candidates = candidates
+        self.n_jobs = max(1, int(n_jobs))
+        self.cv_folds = int(cv_folds)
+        self.budget_seconds = float(budget_seconds)
+        self.cpu_budget_seconds = float(cpu_budget_seconds) if cpu_budget_seconds else None
+        self.abandon_margin = abandon_margin
+        self.random_state = random_state
+        self.trials = []
+        self.best_trial = None
+        self.skipped_trials = 0
+
+    @classmethod
+    def from_config(cls) -> Optional["CandidateSearch"]:
+        """The configured search, or None when `training.search.enabled` is off."""
+        search_config = (get_section("training") or {}).get("search") or {}
+        if not search_config.get("enabled", False):
+            return None
+        return cls(
+            candidates = search_config.get("candidates") or {},
+            n_jobs = search_config.get("n_jobs", 2),
+            cv_folds = search_config.get("cv_folds", 3),
+            budget_seconds = search_config.get("budget_seconds", 600),
+            cpu_budget_seconds = search_config.get("cpu_budget_seconds"),
+            abandon_margin = search_config.get("abandon_margin", 0.02)
+        )
+
+    def build_trials(self) -> List[Dict]:
+        """Grid points of every installed candidate, interleaved so a tight budget still covers each family."""
+        from sklearn.model_selection import ParameterGrid
+
+        per_candidate = []
+        for name, spec in self.candidates.items():
+            module_name = spec["class"].rsplit(".", 1)[0]
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                logger.warning(f"Skipping candidate {name}: {module_name} is not installed.")
+                continue
+
+            per_candidate.append([
+                {"candidate": name, "class": spec["class"], "params": {**(spec.get("params") or {}), **grid_point}}
+                for grid_point in ParameterGrid(spec.get("grid") or {})
+            ])
+
+        trials = [trial for group in zip_longest(*per_candidate) for trial in group if trial is not None]
+        for trial_id, trial in enumerate(trials):
+            trial["trial_id"] = trial_id
+        return trials
+
+    def _best(self) -> Optional[Dict]:
+        completed = [trial for trial in self.trials if trial["status"] == "completed"]
+        return max(completed, key=lambda trial: trial["score"]) if completed else None
+
+    def _log_trial(self, trial: Dict):
+        import mlflow
+
+        with mlflow.start_run(run_name=f"trial_{trial['trial_id']}_{trial['candidate']}", nested=True):
+            mlflow.log_param("candidate", trial["candidate"])
+            mlflow.log_param("status", trial["status"])
+            mlflow.log_params({f"param_{key}": value for key, value in trial["params"].items()})
+            metrics = {"wall_seconds": trial["wall_seconds"], "cpu_seconds": trial["cpu_seconds"],
+                       "folds_fitted": len(trial["fold_scores"])}
+            if trial["score"] is not None:
+                metrics["cv_roc_auc"] = trial["score"]
+            for fold, score in enumerate(trial["fold_scores"]):
+                metrics[f"fold_{fold}_roc_auc"] = score
+            mlflow.log_metrics(metrics)
+
+    def _time_out(self, running: Dict):
+        """Record the trials still fitting at the deadline as timed out."""
+        for trial, submitted in running.values():
+            trial = {
+                **trial, "status": "timeout", "fold_scores": [], "score": None,
+                "wall_seconds": time.perf_counter() - submitted, "cpu_seconds": 0.0, "error": None,
+            }
+            self.trials.append(trial)
+            self._log_trial(trial)
+            logger.info(f"Trial {trial['trial_id']} {trial['candidate']} {trial['params']}: stopped at the wall budget")
+
+    def run(self, X_train: np.ndarray, y_train: np.ndarray):
+        """Runs the search (inside the caller's MLflow run) and returns the best candidate, unfitted."""
+        try:
+            #Imported before the clock starts: the first trial logged would otherwise pay for it
+            import mlflow
+            from sklearn.model_selection import StratifiedKFold
+
+            pending = self.build_trials()
+            if not pending:
+                raise ValueError("No candidate model is available for the search.")
+
+            folds = list(StratifiedKFold(self.cv_folds, shuffle=True, random_state=self.random_state).split(X_train, y_train))
+            start = time.time()
+            deadline = start + self.budget_seconds
+            cpu_used = 0.0
+            self.trials = []
+            logger.info(
+                f"Candidate search: {len(pending)} trials, {self.n_jobs} workers, "
+                f"{self.budget_seconds}s wall budget, cpu budget {self.cpu_budget_seconds}"
+            )
+
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                     initargs=(X_train, y_train, folds)) as executor:
+                running = {}
+                while pending or running:
+                    over_budget = time.time() > deadline or (
+                        self.cpu_budget_seconds is not None and cpu_used > self.cpu_budget_seconds
+                    )
+                    #Keep every worker busy; the abandon bar reflects the trials finished so far
+                    while pending and not over_budget and len(running) < self.n_jobs:
+                        best = self._best()
+                        abandon_below = best["score"] - self.abandon_margin if best else None
+                        trial = pending.pop(0)
+                        future = executor.submit(_run_trial, trial, deadline, abandon_below)
+                        running[future] = (trial, time.perf_counter())
+
+                    if not running:
+                        break
+                    #Workers only check the deadline between folds; a slow fold is cut off here
+                    done, _ = wait(running, timeout=max(deadline - time.time(), 0), return_when=FIRST_COMPLETED)
+                    if not done:
+                        self._time_out(running)
+                        _terminate_workers(executor)
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    for future in done:
+                        running.pop(future)
+                        trial = future.result()
+                        cpu_used += trial["cpu_seconds"]
+                        self.trials.append(trial)
+                        self._log_trial(trial)
+                        logger.info(
+                            f"Trial {trial['trial_id']} {trial['candidate']} {trial['params']}: "
+                            f"{trial['status']} score={trial['score']} folds={trial['fold_scores']} "
+                            f"({trial['wall_seconds']:.2f}s)"
+                        )
+
+            skipped = len(pending)
+            best = self._best()
+            if best is None:
+                raise ValueError("No trial completed within the search budget.")
+
+            statuses = [trial["status"] for trial in self.trials]
+            logger.info(
+                f"Candidate search finished in {time.time() - start:.1f}s: "
+                f"{statuses.count('completed')} completed, {statuses.count('abandoned')} abandoned, "
+                f"{statuses.count('timeout')} timed out, {statuses.count('failed')} failed, {skipped} not started. "
+                f"Best {best['candidate']} {best['params']} cv_roc_auc={best['score']:.4f}"
+            )
+            self.best_trial = best
+            self.skipped_trials = skipped
+            return build_estimator(best["class"], best["params"])
+
+        except Exception as e:
+            logger.exception("Candidate search failed.")
+            raise ChurnException(e, sys)
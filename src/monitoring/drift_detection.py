@@ -1,23 +1,52 @@
-#importing library 
+#importing library
 import sys
 import os
 import pandas as pd
 import numpy as np
-from scipy.stats import ks_2samp
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
 
 #importing requirements
 from src.utils.logger import get_logger
-from src.utils.exception import ChurnException 
+from src.utils.exception import ChurnException
+from src.config.configuration import get_section
+from src.monitoring.drift_sketch import (
+    DriftSketch, SketchLayout, ks_from_counts, ks_pvalue, chi2_pvalue
+)
 
 logger = get_logger(__name__)
 
+DRIFT_METHODS = ("ks", "psi")
+
 class DataDriftDetector:
-    def __init__(self, p_value_threshold:float = 0.05, drift_ratio_threshold:float = 0.3):
+    def __init__(self, p_value_threshold:float = 0.05, drift_ratio_threshold:float = 0.3,
+                 method:str = "ks", psi_threshold:float = 0.2, n_bins:int = 20):
+        if method not in DRIFT_METHODS:
+            raise ValueError(f"Unknown drift method {method!r}, expected one of {DRIFT_METHODS}")
         self.p_value_threshold = p_value_threshold
         self.drift_ratio_threshold = drift_ratio_threshold
+        self.method = method
+        self.psi_threshold = psi_threshold
+        self.n_bins = n_bins
+
+    @classmethod
+    def from_config(cls) -> "DataDriftDetector":
+        drift_config = get_section("drift")
+        return cls(
+            p_value_threshold = drift_config.get("p_value_threshold", 0.05),
+            drift_ratio_threshold = drift_config.get("drift_ratio_threshold", 0.3),
+            method = drift_config.get("method", "ks"),
+            psi_threshold = drift_config.get("psi_threshold", 0.2),
+            n_bins = (drift_config.get("sketch") or {}).get("n_bins", 20)
+        )
 
     def detect_drift(self, reference_df :pd.DataFrame, current_df : pd.DataFrame) -> Dict:
+        if self.method == "psi":
+            #Reference edges and frequencies are derived once, then the current frame is binned in one pass
+            layout = SketchLayout(DriftSketch.from_reference(reference_df, n_bins=self.n_bins))
+            return self.detect_drift_from_layout(layout, current_df)
+
+        from scipy.stats import ks_2samp
         try:
             logger.info("Starting Data drift detection.")
 
@@ -56,7 +85,212 @@ class DataDriftDetector:
 
             logger.info(f"Drift detection result: {result}")
             return result
-        
+
         except Exception as e:
             logger.exception('Drift Detection Failed.')
             raise ChurnException(e, sys)
+
+    def detect_drift_from_layout(self, layout: SketchLayout, current_df: pd.DataFrame,
+                                 include_categorical: bool = False) -> Dict:
+        """Drift of a raw frame against a precomputed reference layout (e.g. from reference_profile.json)."""
+        try:
+            logger.info(f"Starting {self.method} drift detection on {len(current_df)} rows.")
+            return self._drift_from_counts(layout, layout.bin_counts(current_df), include_categorical)
+
+        except Exception as e:
+            logger.exception('Drift Detection Failed.')
+            raise ChurnException(e, sys)
+
+    def detect_drift_from_counts(self, layout: SketchLayout, current_counts: np.ndarray,
+                                 include_categorical: bool = False) -> Dict:
+        """Drift from slot counts accumulated over several frames with `layout.bin_counts`."""
+        try:
+            return self._drift_from_counts(layout, current_counts, include_categorical)
+
+        except Exception as e:
+            logger.exception('Drift Detection Failed.')
+            raise ChurnException(e, sys)
+
+    def detect_drift_from_sketches(self, reference: DriftSketch, current: DriftSketch,
+                                   include_categorical: bool = False) -> Dict:
+        """
+        Same result as `detect_drift`, computed from sketches instead of raw frames.
+
+        With `ks`, numeric features use a KS test on the binned CDFs; categorical
+        features get a chi-square test on their counts and only count towards the
+        drift ratio with `include_categorical`. With `psi`, every feature is
+        compared with `psi_threshold`. Per-feature statistics are added under
+        `feature_scores`.
+        """
+        try:
+            logger.info(f"Starting sketch based {self.method} drift detection.")
+            layout = SketchLayout(reference)
+            return self._drift_from_counts(layout, layout.sketch_counts(current), include_categorical)
+
+        except Exception as e:
+            logger.exception('Sketch Drift Detection Failed.')
+            raise ChurnException(e, sys)
+
+    def detect_segment_drift(self, layout: SketchLayout, current_df: pd.DataFrame,
+                             segment_columns: List[str], reference_counts: np.ndarray,
+                             min_segment_rows: int = 100, n_jobs: int = 1,
+                             include_categorical: bool = False) -> Dict:
+        """
+        Per-segment drift of a raw frame, e.g. for every Contract x InternetService pair.
+
+        Every segment's slot counts come from one grouped pass over `current_df`
+        (split into row chunks across `n_jobs` processes when > 1) and are compared
+        with the same segment's `reference_counts` (`layout.grouped_bin_counts` of
+        the reference data, stored in reference_profile.json).
+
+        `drifted_segments` lists every segment with at least one drifted feature;
+        `drift_detected` is set when some segment crosses `drift_ratio_threshold`.
+        """
+        try:
+            logger.info(f"Starting {self.method} segment drift detection by {segment_columns} on {len(current_df)} rows.")
+            current_counts = grouped_bin_counts(layout, current_df, segment_columns, n_jobs=n_jobs)
+            return self._segment_drift_from_counts(
+                layout, segment_columns, reference_counts, current_counts, min_segment_rows, include_categorical
+            )
+
+        except Exception as e:
+            logger.exception('Segment Drift Detection Failed.')
+            raise ChurnException(e, sys)
+
+    def detect_segment_drift_from_counts(self, layout: SketchLayout, segment_columns: List[str],
+                                         reference_counts: np.ndarray, current_counts: np.ndarray,
+                                         min_segment_rows: int = 100,
+                                         include_categorical: bool = False) -> Dict:
+        """Segment drift from grouped counts accumulated over several frames."""
+        try:
+            return self._segment_drift_from_counts(
+                layout, segment_columns, reference_counts, current_counts, min_segment_rows, include_categorical
+            )
+
+        except Exception as e:
+            logger.exception('Segment Drift Detection Failed.')
+            raise ChurnException(e, sys)
+
+    def _segment_drift_from_counts(self, layout: SketchLayout, segment_columns: List[str],
+                                   reference_counts: np.ndarray, current_counts: np.ndarray,
+                                   min_segment_rows: int, include_categorical: bool) -> Dict:
+        reference_counts = np.asarray(reference_counts, dtype=np.int64)
+        current_counts = np.asarray(current_counts, dtype=np.int64)
+        if reference_counts.shape != current_counts.shape:
+            raise ValueError(
+                f"Reference segment counts {reference_counts.shape} do not match current {current_counts.shape}."
+            )
+
+        #Every feature's slots sum to the segment's row count, so the first feature gives it
+        first = slice(0, int(layout.sizes[0]))
+        n_reference = reference_counts[:, first].sum(axis=1)
+        n_current = current_counts[:, first].sum(axis=1)
+        psi = layout.psi(current_counts, reference_counts)
+
+        segments = {}
+        drifted_segments = []
+        drift_detected = False
+        for s, key in enumerate(layout.segment_keys(segment_columns)):
+            if n_current[s] < min_segment_rows or n_reference[s] < min_segment_rows:
+                continue
+            name = ", ".join(f"{col}={value}" for col, value in zip(segment_columns, key))
+            result = self._drift_from_counts(
+                layout, current_counts[s], include_categorical,
+                reference_counts=reference_counts[s], psi=psi[s], label=name
+            )
+            result["n_reference"] = int(n_reference[s])
+            result["n_current"] = int(n_current[s])
+            segments[name] = result
+            if result["drifted_features"]:
+                drifted_segments.append(name)
+            drift_detected = drift_detected or result["drift_detected"]
+
+        result = {
+            "drift_detected": drift_detected,
+            "segment_columns": list(segment_columns),
+            "drifted_segments": drifted_segments,
+            "segments": segments,
+        }
+        logger.info(
+            f"Segment drift result by {segment_columns}: {len(segments)} segments checked, "
+            f"drifted_segments={drifted_segments}"
+        )
+        return result
+
+    def _drift_from_counts(self, layout: SketchLayout, current_counts: np.ndarray,
+                           include_categorical: bool, reference_counts: np.ndarray = None,
+                           psi: np.ndarray = None, label: str = None) -> Dict:
+        if reference_counts is None:
+            reference_counts = layout.reference_counts
+        if psi is None:
+            psi = layout.psi(current_counts, reference_counts)
+        reference_segments = layout.segments(reference_counts)
+        current_segments = layout.segments(current_counts)
+
+        drifted_features = []
+        feature_scores = {}
+        checked = 0
+
+        for j, col in enumerate(layout.features):
+            ref_counts, cur_counts = reference_segments[j], current_segments[j]
+            if ref_counts.sum() == 0 or cur_counts.sum() == 0:
+                continue
+
+            score = {"psi": float(psi[j]), "n": int(cur_counts.sum())}
+            if self.method == "psi":
+                counted = True
+                drifted = psi[j] >= self.psi_threshold
+            else:
+                counted = layout.is_numeric[j] or include_categorical
+                if layout.is_numeric[j]:
+                    #The trailing missing-value slot is not part of the distribution
+                    score["ks_statistic"] = ks_from_counts(ref_counts[:-1], cur_counts[:-1])
+                    score["p_value"] = ks_pvalue(score["ks_statistic"], int(ref_counts[:-1].sum()), int(cur_counts[:-1].sum()))
+                else:
+                    score["p_value"] = chi2_pvalue(ref_counts, cur_counts)
+                drifted = score["p_value"] < self.p_value_threshold
+
+            feature_scores[col] = score
+            if not counted:
+                continue
+
+            checked += 1
+            if drifted:
+                drifted_features.append(col)
+                logger.warning(f"Drift Detected in feature {col}{f' [{label}]' if label else ''} ({score})")
+
+        drift_ratio = len(drifted_features) / checked if checked > 0 else 0
+
+        result = {
+            "drift_detected": drift_ratio >= self.drift_ratio_threshold,
+            "drift_ratio": drift_ratio,
+            "drifted_features": drifted_features,
+            "feature_scores": feature_scores,
+        }
+
+        if label is not None:
+            return result
+
+        logger.info(
+            f"Drift detection result ({self.method}): drift_detected={result['drift_detected']}, "
+            f"drift_ratio={drift_ratio}, drifted_features={drifted_features}"
+        )
+        return result
+
+
+def _grouped_counts_job(layout: SketchLayout, frame: pd.DataFrame, segment_columns: List[str]) -> np.ndarray:
+    return layout.grouped_bin_counts(frame, segment_columns)
+
+
+def grouped_bin_counts(layout: SketchLayout, df: pd.DataFrame, segment_columns: List[str],
+                       n_jobs: int = 1) -> np.ndarray:
+    """`layout.grouped_bin_counts`, with row chunks counted in `n_jobs` worker processes and summed."""
+    n_jobs = min(int(n_jobs), len(df) // 100_000) if n_jobs and n_jobs > 1 else 1
+    if n_jobs <= 1:
+        return layout.grouped_bin_counts(df, segment_columns)
+
+    bounds = np.linspace(0, len(df), n_jobs + 1).astype(int)
+    frames = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        parts = executor.map(_grouped_counts_job, [layout] * n_jobs, frames, [segment_columns] * n_jobs)
+        return np.sum(list(parts), axis=0)
@@ -0,0 +1,355 @@
+"""
+Long-running drift monitor over sliding (or tumbling) windows.
+
+Served traffic is folded into one bucket per completed hour: the slot counts of
+the reference layout plus a histogram of churn probabilities. Buckets are read
+from the API's drift sketches, or scanned from the prediction log when an hour
+has no sketches. Each window keeps a running sum of buckets. A new hour is
+added and the hour that fell out of the window is subtracted, so a 7-day window
+never touches raw rows again and memory stays at one small vector per hour.
+
+An hour is folded in `grace_minutes` after it closes, so the sketches and log
+files the API flushes a little late for it are counted. Tumbling windows are
+aligned to `tumbling_anchor` (by default a Monday 00:00 UTC): daily windows
+start at midnight and weekly ones on Monday.
+
+Every evaluated window is appended to `drift_timeseries.jsonl`. Retraining fires
+only after `sustained_evaluations` consecutive breaches of the trigger window,
+and not again within `cooldown_hours`.
+
+    python -m src.monitoring.drift_monitor          # run on a schedule
+    python -m src.monitoring.drift_monitor --once   # catch up and exit
+"""
+#importing library
+import os
+import sys
+import json
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.utils.common import save_json
+from src.config.paths import MONITOR_DIR, REFERENCE_PROFILE_PATH
+from src.config.configuration import get_section
+from src.monitoring.drift_detection import DataDriftDetector
+from src.monitoring.drift_sketch import (
+    DriftSketch, NumericSketch, SketchLayout, SCORE_BIN_EDGES, load_window_sketches, mean_confidence_from_counts
+)
+from src.monitoring.prediction_logger import iter_prediction_log
+from src.monitoring.retraining_trigger import RetrainingTrigger, is_confidence_degraded
+
+logger = get_logger(__name__)
+
+HOUR = timedelta(hours=1)
+WINDOW_MODES = ("sliding", "tumbling")
+#Monday 00:00 UTC; the Unix epoch itself fell on a Thursday
+TUMBLING_ANCHOR = datetime(1970, 1, 5, tzinfo=timezone.utc)
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class HourlyBucket:
+    __slots__ = ("start", "counts", "score_counts", "source")
+
+    def __init__(self, start: datetime, counts: np.ndarray, score_counts: np.ndarray, source: str):
+        self.start = start
+        self.counts = counts
+        self.score_counts = score_counts
+        self.source = source
+
+
+class WindowState:
+    """Running sums of the buckets currently inside one window."""
+
+    def __init__(self, name: str, hours: int, n_slots: int):
+        self.name = name
+        self.hours = int(hours)
+        self.counts = np.zeros(n_slots, dtype=np.int64)
+        self.score_counts = np.zeros(len(SCORE_BIN_EDGES) + 1, dtype=np.int64)
+        self.start = None
+
+    def add(self, bucket: HourlyBucket):
+        if self.start is None:
+            self.start = bucket.start
+        self.counts += bucket.counts
+        self.score_counts += bucket.score_counts
+
+    def subtract(self, bucket: HourlyBucket):
+        self.counts -= bucket.counts
+        self.score_counts -= bucket.score_counts
+        self.start = bucket.start + HOUR
+
+    def reset(self):
+        self.counts[:] = 0
+        self.score_counts[:] = 0
+        self.start = None
+
+
+class DriftMonitor:
+    def __init__(self,
+                 windows: Dict[str, int],
+                 mode: str = "sliding",
+                 trigger_window: str = None,
+                 sustained_evaluations: int = 3,
+                 cooldown_hours: float = 24,
+                 min_rows: int = 0,
+                 retrain_enabled: bool = False,
+                 interval_seconds: float = 300,
+                 grace_minutes: float = 10,
+                 tumbling_anchor: datetime = TUMBLING_ANCHOR,
+                 output_dir: str = MONITOR_DIR,
+                 detector: DataDriftDetector = None):
+        if mode not in WINDOW_MODES:
+            raise ValueError(f"Unknown window mode {mode!r}, expected one of {WINDOW_MODES}")
+        self.windows = {name: int(hours) for name, hours in windows.items()}
+        self.mode = mode
+        self.trigger_window = trigger_window or max(self.windows, key=self.windows.get)
+        if self.trigger_window not in self.windows:
+            raise ValueError(f"Trigger window {self.trigger_window!r} is not one of {list(self.windows)}")
+        self.sustained_evaluations = int(sustained_evaluations)
+        self.cooldown = timedelta(hours=cooldown_hours)
+        self.min_rows = int(min_rows)
+        self.retrain_enabled = retrain_enabled
+        self.interval_seconds = float(interval_seconds)
+        self.grace = timedelta(minutes=grace_minutes)
+        if tumbling_anchor.tzinfo is None:
+            tumbling_anchor = tumbling_anchor.replace(tzinfo=timezone.utc)
+        if tumbling_anchor != _floor_hour(tumbling_anchor):
+            raise ValueError(f"Tumbling anchor {tumbling_anchor} is not on an hour boundary")
+        self.tumbling_anchor = tumbling_anchor
+        self.detector = detector or DataDriftDetector.from_config()
+
+        self.timeseries_path = os.path.join(output_dir, "drift_timeseries.jsonl")
+        self.state_path = os.path.join(output_dir, "monitor_state.json")
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.state = self._load_state()
+        self.layout = None
+        self.reference = None
+        self._profile_mtime = None
+        self._buckets = deque(maxlen=max(self.windows.values()) + 1)
+        self._window_states = {}
+        self._next_hour = None
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def from_config(cls) -> "DriftMonitor":
+        drift_config = get_section("drift")
+        monitor_config = drift_config.get("monitor") or {}
+        retraining_config = get_section("retraining")
+        return cls(
+            windows = monitor_config.get("windows") or {"1h": 1, "24h": 24, "7d": 168},
+            mode = monitor_config.get("mode", "sliding"),
+            trigger_window = monitor_config.get("trigger_window"),
+            sustained_evaluations = monitor_config.get("sustained_evaluations", 3),
+            cooldown_hours = monitor_config.get("cooldown_hours", 24),
+            min_rows = retraining_config.get("min_data_points", 0),
+            retrain_enabled = retraining_config.get("enabled", False),
+            interval_seconds = monitor_config.get("interval_seconds", 300),
+            grace_minutes = monitor_config.get("grace_minutes", 10),
+            tumbling_anchor = (
+                datetime.fromisoformat(str(monitor_config["tumbling_anchor"]))
+                if monitor_config.get("tumbling_anchor") else TUMBLING_ANCHOR
+            )
+        )
+
+    # ---------------------------------------------------------------- state
+
+    def _load_state(self) -> Dict:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        return {"last_evaluated_hour": None, "breach_streak": 0, "last_retrain_at": None}
+
+    def _reference_changed(self) -> bool:
+        mtime = os.stat(REFERENCE_PROFILE_PATH).st_mtime_ns
+        if mtime == self._profile_mtime:
+            return False
+        self._profile_mtime = mtime
+        self.reference = DriftSketch.load(REFERENCE_PROFILE_PATH)
+        self.layout = SketchLayout(self.reference)
+        return True
+
+    # ---------------------------------------------------------------- buckets
+
+    def _bucket_for(self, start: datetime) -> HourlyBucket:
+        end = start + HOUR
+
+        #Sketches recorded against a previous reference profile are skipped
+        sketch = load_window_sketches(start, end, reference=self.reference)
+        if sketch is not None and sketch.n > 0:
+            try:
+                score_counts = sketch.scores.counts if sketch.scores is not None else np.zeros(len(SCORE_BIN_EDGES) + 1, dtype=np.int64)
+                return HourlyBucket(start, self.layout.sketch_counts(sketch), score_counts.copy(), "sketches")
+            except ValueError:
+                #Sketches written against a previous reference profile
+                logger.warning(f"Drift sketches for {start:%Y-%m-%d %H}:00 use old bin edges. Using the prediction log.")
+
+        counts = np.zeros(self.layout.n_slots, dtype=np.int64)
+        scores = NumericSketch(SCORE_BIN_EDGES)
+        for batch in iter_prediction_log(start=start, end=end, columns=self.layout.features + ["churn_probability"]):
+            counts += self.layout.bin_counts(batch)
+            scores.update(batch["churn_probability"])
+        return HourlyBucket(start, counts, scores.counts, "prediction_log" if counts.any() else "empty")
+
+    def _push(self, bucket: HourlyBucket) -> List[WindowState]:
+        """Add a completed hour to every window. Returns the windows that are due for evaluation."""
+        self._buckets.append(bucket)
+        hour_index = (bucket.start - self.tumbling_anchor) // HOUR
+
+        due = []
+        for name, hours in self.windows.items():
+            window = self._window_states[name]
+            if self.mode == "sliding":
+                window.add(bucket)
+                if len(self._buckets) > hours:
+                    window.subtract(self._buckets[-hours - 1])
+                due.append(window)
+            else:
+                if hour_index % hours == 0:
+                    window.reset()
+                window.add(bucket)
+                if (hour_index + 1) % hours == 0:
+                    due.append(window)
+        return due
+
+    def _rebuild(self, until: datetime):
+        """Start over from the raw sources for the longest window (new reference or first run)."""
+        self._buckets.clear()
+        self._window_states = {name: WindowState(name, hours, self.layout.n_slots) for name, hours in self.windows.items()}
+        self._next_hour = until - HOUR * max(self.windows.values())
+        logger.info(f"Drift monitor backfilling from {self._next_hour:%Y-%m-%d %H}:00.")
+
+    # ---------------------------------------------------------------- evaluation
+
+    def _evaluate(self, window: WindowState, window_end: datetime) -> Dict:
+        n_rows = int(self.layout.segments(window.counts)[0].sum())
+        record = {
+            "evaluated_at": datetime.now(timezone.utc).isoformat(),
+            "window": window.name,
+            "window_start": window.start.isoformat() if window.start else None,
+            "window_end": window_end.isoformat(),
+            "n": n_rows,
+        }
+        if n_rows == 0:
+            return record
+
+        drift_result = self.detector.detect_drift_from_counts(self.layout, window.counts)
+        mean_confidence = mean_confidence_from_counts(window.score_counts)
+        record.update({
+            "drift_detected": bool(drift_result["drift_detected"]),
+            "drift_ratio": drift_result["drift_ratio"],
+            "drifted_features": drift_result["drifted_features"],
+            "psi": {col: round(score["psi"], 6) for col, score in drift_result["feature_scores"].items()},
+            "mean_confidence": mean_confidence,
+            "confidence_degraded": (
+                is_confidence_degraded(current_confidence=mean_confidence) if mean_confidence is not None else False
+            ),
+        })
+        return record
+
+    def _handle_breach(self, record: Dict, now: datetime):
+        breached = record["n"] >= self.min_rows and (record.get("drift_detected") or record.get("confidence_degraded"))
+        self.state["breach_streak"] = self.state["breach_streak"] + 1 if breached else 0
+        if self.state["breach_streak"] < self.sustained_evaluations:
+            return
+
+        last_retrain = self.state["last_retrain_at"]
+        if last_retrain is not None and now - datetime.fromisoformat(last_retrain) < self.cooldown:
+            logger.info("Sustained drift breach during retraining cooldown. Not retraining.")
+            return
+
+        logger.warning(
+            f"Drift breached on window {self.trigger_window} for {self.state['breach_streak']} "
+            "consecutive evaluations."
+        )
+        self.state["breach_streak"] = 0
+        self.state["last_retrain_at"] = now.isoformat()
+        if self.retrain_enabled:
+            RetrainingTrigger().retrain()
+        else:
+            logger.warning("Retraining is disabled in config (retraining.enabled). Skipping retraining.")
+
+    def run_once(self, now: datetime = None) -> List[Dict]:
+        """Fold in every hour closed for at least the grace period and evaluate the windows that are due."""
+        try:
+            now = now or datetime.now(timezone.utc)
+            #Late flushes (sketches every flush_interval_seconds, log files on rotation) land within the grace period
+            until = _floor_hour(now - self.grace)
+            if not os.path.exists(REFERENCE_PROFILE_PATH):
+                logger.warning("No reference profile found. Drift monitor is idle until a model is trained.")
+                return []
+
+            if self._reference_changed() or self._next_hour is None:
+                self._rebuild(until)
+
+            last_evaluated = self.state["last_evaluated_hour"]
+            last_evaluated = datetime.fromisoformat(last_evaluated) if last_evaluated else until - 2 * HOUR
+
+            records = []
+            while self._next_hour < until:
+                bucket = self._bucket_for(self._next_hour)
+                self._next_hour += HOUR
+                due = self._push(bucket)
+
+                #Backfilled hours only rebuild the sums; each hour is evaluated once across restarts
+                if bucket.start <= last_evaluated:
+                    continue
+
+                for window in due:
+                    record = self._evaluate(window, self._next_hour)
+                    records.append(record)
+                    if window.name == self.trigger_window:
+                        self._handle_breach(record, now)
+                self.state["last_evaluated_hour"] = bucket.start.isoformat()
+
+            if records:
+                with open(self.timeseries_path, "a") as f:
+                    for record in records:
+                        f.write(json.dumps(record) + "\n")
+                logger.info(f"Drift monitor evaluated {len(records)} windows up to {until:%Y-%m-%d %H}:00.")
+            save_json(self.state_path, self.state)
+            return records
+
+        except Exception as e:
+            logger.exception("Drift monitor run failed.")
+            raise ChurnException(e, sys)
+
+    def run_forever(self):
+        logger.info(f"Drift monitor started: windows={self.windows}, mode={self.mode}, every {self.interval_seconds}s.")
+        while True:
+            try:
+                self.run_once()
+            except ChurnException:
+                #Already logged; try again on the next tick
+                pass
+            if self._stop_event.wait(self.interval_seconds):
+                break
+
+    def stop(self):
+        self._stop_event.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sliding-window drift monitor.")
+    parser.add_argument("--once", action="store_true", help="Process completed hours once and exit.")
+    args = parser.parse_args()
+
+    monitor = DriftMonitor.from_config()
+    if args.once:
+        for evaluation in monitor.run_once():
+            print(json.dumps({k: v for k, v in evaluation.items() if k != "psi"}))
+    else:
+        try:
+            monitor.run_forever()
+        except KeyboardInterrupt:
+            monitor.stop()
@@ -0,0 +1,627 @@
+"""
+Mergeable per-feature summaries for streaming drift detection.
+
+Numeric features are summarised as counts over fixed bin edges taken from the
+reference (training) data, plus count/sum/min/max. Categorical features are
+summarised as value counts. Two sketches built on the same edges can be merged
+by adding counts, so sketches from several workers or time windows combine
+into one without keeping any raw rows. KS and PSI style scores are computed
+from the binned counts.
+"""
+#importing library
+import os
+import sys
+import json
+import math
+import time
+import socket
+import threading
+from bisect import bisect_right
+from itertools import product
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.config.paths import SKETCH_DIR, REFERENCE_PROFILE_PATH
+from src.config.configuration import get_section
+
+logger = get_logger(__name__)
+
+MISSING = "__missing__"
+UNSEEN = "__unseen__"
+WINDOW_FORMAT = "%Y%m%dT%H%M%SZ"
+
+#Interior edges of the churn probability histogram (50 bins of 0.02)
+SCORE_BIN_EDGES = np.round(np.linspace(0, 1, 51)[1:-1], 2)
+
+
+class NumericSketch:
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self._edge_list = self.edges.tolist()
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.missing = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+        valid = values[~np.isnan(values)]
+        self.missing += int(len(values) - len(valid))
+        if len(valid) == 0:
+            return
+        bins = np.searchsorted(self.edges, valid, side="right")
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+        self.total += float(valid.sum())
+        self.min = min(self.min, float(valid.min()))
+        self.max = max(self.max, float(valid.max()))
+
+    def update_value(self, value):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = math.nan
+        if math.isnan(value):
+            self.missing += 1
+            return
+        self.counts[bisect_right(self._edge_list, value)] += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "NumericSketch"):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge numeric sketches built on different bin edges.")
+        self.counts += other.counts
+        self.missing += other.missing
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def empty_like(self) -> "NumericSketch":
+        return NumericSketch(self.edges)
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": "numeric",
+            "edges": self._edge_list,
+            "counts": self.counts.tolist(),
+            "missing": self.missing,
+            "total": self.total,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NumericSketch":
+        sketch = cls(data["edges"])
+        sketch.counts = np.asarray(data["counts"], dtype=np.int64)
+        sketch.missing = data["missing"]
+        sketch.total = data["total"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        return sketch
+
+
+class CategoricalSketch:
+    def __init__(self):
+        self.counts = {}
+
+    @property
+    def n(self) -> int:
+        return sum(self.counts.values())
+
+    def update(self, values):
+        for value, count in pd.Series(values).fillna(MISSING).astype(str).value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+
+    def update_value(self, value):
+        value = MISSING if value is None else str(value)
+        self.counts[value] = self.counts.get(value, 0) + 1
+
+    def merge(self, other: "CategoricalSketch"):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+
+    def empty_like(self) -> "CategoricalSketch":
+        return CategoricalSketch()
+
+    def to_dict(self) -> Dict:
+        return {"type": "categorical", "counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CategoricalSketch":
+        sketch = cls()
+        sketch.counts = {k: int(v) for k, v in data["counts"].items()}
+        return sketch
+
+
+class DriftSketch:
+    """Per-feature sketches for one population (reference data, one worker, one time window...).
+
+    `scores`, when present, is a histogram of the predicted churn probabilities.
+    """
+
+    def __init__(self, features: Dict[str, object], scores: NumericSketch = None):
+        self.features = features
+        self.scores = scores
+
+    @classmethod
+    def from_reference(cls, reference_df: pd.DataFrame, n_bins: int = 20) -> "DriftSketch":
+        """Derive bin edges from the reference data and summarise it on those edges."""
+        features = {}
+        for col in reference_df.columns:
+            if reference_df[col].dtype == object:
+                features[col] = CategoricalSketch()
+            else:
+                values = reference_df[col].dropna().to_numpy(dtype=np.float64)
+                quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+                edges = np.unique(np.quantile(values, quantiles)) if len(values) else np.array([])
+                features[col] = NumericSketch(edges)
+        sketch = cls(features)
+        sketch.update(reference_df)
+        return sketch
+
+    def empty_like(self) -> "DriftSketch":
+        return DriftSketch(
+            {col: s.empty_like() for col, s in self.features.items()},
+            scores=NumericSketch(SCORE_BIN_EDGES)
+        )
+
+    @property
+    def n(self) -> int:
+        return max((s.n for s in self.features.values()), default=0)
+
+    def update(self, df: pd.DataFrame, probabilities=None):
+        for col, sketch in self.features.items():
+            if col in df.columns:
+                sketch.update(df[col])
+        if probabilities is not None:
+            self._score_sketch().update(probabilities)
+
+    def update_record(self, record: Dict, probability: float = None):
+        for col, sketch in self.features.items():
+            if col in record:
+                sketch.update_value(record[col])
+        if probability is not None:
+            self._score_sketch().update_value(probability)
+
+    def _score_sketch(self) -> NumericSketch:
+        if self.scores is None:
+            self.scores = NumericSketch(SCORE_BIN_EDGES)
+        return self.scores
+
+    def mean_confidence(self) -> Optional[float]:
+        """Mean |p - 0.5| of the recorded scores, from the histogram bin midpoints."""
+        if self.scores is None:
+            return None
+        return mean_confidence_from_counts(self.scores.counts, self.scores.edges)
+
+    def same_layout(self, other: "DriftSketch") -> bool:
+        """True when both sketches have the same features and numeric bin edges, i.e. the same reference."""
+        if self.features.keys() != other.features.keys():
+            return False
+        return all(
+            type(sketch) is type(other.features[col])
+            and (not isinstance(sketch, NumericSketch) or np.array_equal(sketch.edges, other.features[col].edges))
+            for col, sketch in self.features.items()
+        )
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        for col, sketch in other.features.items():
+            if col in self.features:
+                self.features[col].merge(sketch)
+            else:
+                self.features[col] = sketch
+        if other.scores is not None:
+            self._score_sketch().merge(other.scores)
+        return self
+
+    def to_dict(self) -> Dict:
+        data = {"features": {col: s.to_dict() for col, s in self.features.items()}}
+        if self.scores is not None:
+            data["scores"] = self.scores.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DriftSketch":
+        features = {}
+        for col, item in data["features"].items():
+            features[col] = (NumericSketch if item["type"] == "numeric" else CategoricalSketch).from_dict(item)
+        scores = NumericSketch.from_dict(data["scores"]) if data.get("scores") else None
+        return cls(features, scores=scores)
+
+    def save(self, file_path: str):
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            tmp_path = f"{file_path}.tmp-{os.getpid()}"
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            logger.exception("Failed to save drift sketch.")
+            raise ChurnException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str) -> "DriftSketch":
+        """Load a sketch file, or the sketch embedded in a reference profile."""
+        try:
+            with open(file_path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except Exception as e:
+            logger.exception("Failed to load drift sketch.")
+            raise ChurnException(e, sys)
+
+
+def mean_confidence_from_counts(score_counts: np.ndarray, edges: np.ndarray = SCORE_BIN_EDGES) -> Optional[float]:
+    """Mean |p - 0.5| of a churn probability histogram, from its bin midpoints."""
+    total = score_counts.sum()
+    if total == 0:
+        return None
+    bounds = np.concatenate([[0.0], edges, [1.0]])
+    midpoints = (bounds[:-1] + bounds[1:]) / 2
+    return float(np.sum(score_counts * np.abs(midpoints - 0.5)) / total)
+
+
+def merge_sketches(sketches: List[DriftSketch]) -> Optional[DriftSketch]:
+    merged = None
+    for sketch in sketches:
+        merged = sketch if merged is None else merged.merge(sketch)
+    return merged
+
+
+class DriftSketchRecorder:
+    """
+    Updates a drift sketch with every scored input, one sketch per time window.
+
+    Each process writes its own file per window (`<window>/<host>-<pid>.json`).
+    Scoring only updates counts in memory: a background thread started by
+    `start` rewrites the files every `flush_interval_seconds`, including the
+    windows that closed since its last pass. Readers merge all files of the
+    windows they care about, so workers never share state.
+
+    When a new model is promoted, `rebind` switches to its reference profile.
+    The window in progress is closed and the rest of it goes to a new file
+    (`<host>-<pid>-<n>.json`), so no file mixes two sets of bin edges. Without a
+    reference (nothing promoted yet) scored inputs are not recorded.
+    """
+
+    def __init__(self,
+                 reference: Optional[DriftSketch],
+                 window_minutes: float = 60,
+                 flush_interval_seconds: float = 30,
+                 output_dir: str = SKETCH_DIR):
+        self.reference = reference
+        self.window_seconds = max(1, int(float(window_minutes) * 60))
+        self.flush_interval_seconds = float(flush_interval_seconds)
+        self.output_dir = output_dir
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._window_start = None
+        self._current = None
+        #Bumped on every rebind, names the file the current sketch is written to
+        self._generation = 0
+        #(window_start, generation, sketch) of windows that closed and are not written yet
+        self._closed = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls) -> Optional["DriftSketchRecorder"]:
+        """Recorder configured from `drift.sketch`, or None when disabled."""
+        sketch_config = get_section("drift").get("sketch") or {}
+        if not sketch_config.get("enabled", False):
+            return None
+        reference = None
+        if os.path.exists(REFERENCE_PROFILE_PATH):
+            reference = DriftSketch.load(REFERENCE_PROFILE_PATH)
+        else:
+            logger.warning(f"No reference profile at {REFERENCE_PROFILE_PATH}. Recording starts with the next promotion.")
+        return cls(
+            reference = reference,
+            window_minutes = sketch_config.get("window_minutes", 60),
+            flush_interval_seconds = sketch_config.get("flush_interval_seconds", 30)
+        )
+
+    def _window_for(self, now: float) -> int:
+        return int(now // self.window_seconds) * self.window_seconds
+
+    def _path_for(self, window_start: int, generation: int = 0) -> str:
+        window = datetime.fromtimestamp(window_start, timezone.utc).strftime(WINDOW_FORMAT)
+        #pid is read at flush time: preloaded workers are forked after the recorder is built
+        name = f"{socket.gethostname()}-{os.getpid()}" + (f"-{generation}" if generation else "")
+        return os.path.join(self.output_dir, window, f"{name}.json")
+
+    def _close_current(self):
+        if self._current is not None and self._current.n > 0:
+            self._closed.append((self._window_start, self._generation, self._current))
+        self._current = None
+
+    def rebind(self, reference: DriftSketch):
+        """Record against a new reference profile from now on (e.g. after a hot reload)."""
+        with self._lock:
+            if self.reference is not None and self.reference.same_layout(reference):
+                self.reference = reference
+                return
+            self._close_current()
+            self._generation += 1
+            self._window_start = None
+            self.reference = reference
+        logger.info("Drift sketch recorder rebound to the new reference profile.")
+
+    def _observe(self, update):
+        #Runs on the request path (the event loop for compiled scoring): counts only, never file I/O
+        window_start = self._window_for(time.time())
+        with self._lock:
+            if self.reference is None:
+                return
+            if window_start != self._window_start:
+                self._close_current()
+                self._window_start = window_start
+                self._current = self.reference.empty_like()
+            update(self._current)
+
+    def update(self, df: pd.DataFrame, probabilities=None):
+        self._observe(lambda sketch: sketch.update(df, probabilities))
+
+    def update_record(self, record: Dict, probability: float = None):
+        self._observe(lambda sketch: sketch.update_record(record, probability))
+
+    def flush(self):
+        """Write the closed windows and the current one; the JSON is written outside the update lock."""
+        with self._flush_lock:
+            with self._lock:
+                pending = [(window, generation, sketch.to_dict()) for window, generation, sketch in self._closed]
+                self._closed = []
+                if self._current is not None and self._current.n > 0:
+                    pending.append((self._window_start, self._generation, self._current.to_dict()))
+
+            for window_start, generation, data in pending:
+                path = self._path_for(window_start, generation)
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp_path = f"{path}.tmp-{os.getpid()}"
+                    with open(tmp_path, "w") as f:
+                        json.dump(data, f)
+                    os.replace(tmp_path, path)
+                except Exception:
+                    logger.exception(f"Failed to write drift sketch {path}.")
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def start(self):
+        #Called from the app lifespan so the thread is created inside each worker process
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-sketch-flush", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval_seconds + 5)
+            self._thread = None
+        self.flush()
+
+
+def load_window_sketches(start: datetime, end: datetime = None, sketch_dir: str = SKETCH_DIR,
+                         reference: DriftSketch = None) -> Optional[DriftSketch]:
+    """
+    Merge every worker sketch whose window starts in [start, end). None when there is none.
+    With `reference`, sketches binned on other edges (recorded against an
+    earlier reference profile) are skipped instead of failing the merge.
+    """
+    end = end or datetime.now(timezone.utc)
+    if not os.path.isdir(sketch_dir):
+        return None
+
+    sketches, skipped = [], 0
+    for window in sorted(os.listdir(sketch_dir)):
+        try:
+            window_start = datetime.strptime(window, WINDOW_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if not (start <= window_start < end):
+            continue
+        window_dir = os.path.join(sketch_dir, window)
+        for name in os.listdir(window_dir):
+            if not name.endswith(".json"):
+                continue
+            sketch = DriftSketch.load(os.path.join(window_dir, name))
+            if reference is not None and not reference.same_layout(sketch):
+                skipped += 1
+                continue
+            sketches.append(sketch)
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} drift sketches recorded against another reference profile.")
+    logger.info(f"Merging {len(sketches)} drift sketches from {sketch_dir}")
+    return merge_sketches(sketches)
+
+
+class SketchLayout:
+    """
+    All features of a reference sketch laid out on one flat bin axis.
+
+    Feature `j` owns the slots `offsets[j]:offsets[j] + sizes[j]`: the histogram
+    bins plus a trailing missing-value slot for numerics, and the reference
+    categories plus a trailing unseen-category slot for categoricals. Binning a
+    frame adds each feature's offset to its bin codes, so a whole chunk of rows
+    and features is counted with a single `np.bincount`.
+    """
+
+    def __init__(self, reference: DriftSketch):
+        self.features = list(reference.features)
+        self.is_numeric = np.array([isinstance(s, NumericSketch) for s in reference.features.values()])
+        self._edges = {}
+        self._categories = {}
+
+        reference_counts = []
+        for col, sketch in reference.features.items():
+            if isinstance(sketch, NumericSketch):
+                self._edges[col] = sketch.edges
+                reference_counts.append(np.append(sketch.counts, sketch.missing))
+            else:
+                self._categories[col] = pd.Index(sorted(sketch.counts))
+                reference_counts.append(np.append([sketch.counts[c] for c in self._categories[col]], 0))
+
+        self.sizes = np.array([len(c) for c in reference_counts], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)[:-1]]).astype(np.int64)
+        self.n_slots = int(self.sizes.sum())
+        self.reference_counts = np.concatenate(reference_counts).astype(np.int64)
+
+    def _codes(self, values: pd.Series, col: str) -> np.ndarray:
+        if col in self._edges:
+            edges = self._edges[col]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors="coerce")
+            values = values.to_numpy(dtype=np.float64)
+            codes = np.searchsorted(edges, values, side="right")
+            codes[np.isnan(values)] = len(edges) + 1
+            return codes
+
+        categories = self._categories[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            #Map the few distinct categories once, then gather by integer code
+            lookup = np.append(categories.get_indexer(values.cat.categories.astype(str)), -1)
+            codes = lookup[values.cat.codes.to_numpy()]
+        else:
+            values = values.to_numpy()
+            codes = categories.get_indexer(values)
+            unmatched = np.flatnonzero(codes < 0)
+            #Missing values only need looking for among the few unmatched rows
+            if len(unmatched) and MISSING in categories:
+                codes[unmatched[pd.isna(values[unmatched])]] = categories.get_loc(MISSING)
+        codes[codes < 0] = len(categories)
+        return codes
+
+    def bin_counts(self, df: pd.DataFrame, chunk_size: int = 1_000_000) -> np.ndarray:
+        """Flat slot counts of `df`, one bincount per chunk of rows across all features."""
+        counts = np.zeros(self.n_slots, dtype=np.int64)
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start: start + chunk_size]
+            codes = np.empty((len(self.features), len(chunk)), dtype=np.int64)
+            for j, col in enumerate(self.features):
+                codes[j] = self._codes(chunk[col], col)
+            codes += self.offsets[:, None]
+            counts += np.bincount(codes.ravel(), minlength=self.n_slots)
+        return counts
+
+    def segment_keys(self, segment_columns: List[str]) -> List[tuple]:
+        """Segment labels in the row order of `grouped_bin_counts`, unseen values last per column."""
+        for col in segment_columns:
+            if col not in self._categories:
+                raise ValueError(f"Segment column {col!r} is not a categorical feature of the reference.")
+        return list(product(*[list(self._categories[col]) + [UNSEEN] for col in segment_columns]))
+
+    def segment_codes(self, df: pd.DataFrame, segment_columns: List[str]) -> np.ndarray:
+        """Segment id of every row: the mixed-radix combination of the segment columns' category codes."""
+        codes = np.zeros(len(df), dtype=np.int64)
+        radix = 1
+        for col in reversed(segment_columns):
+            if col not in self._categories:
+                raise ValueError(f"Segment column {col!r} is not a categorical feature of the reference.")
+            codes += self._codes(df[col], col) * radix
+            radix *= len(self._categories[col]) + 1
+        return codes
+
+    def grouped_bin_counts(self, df: pd.DataFrame, segment_columns: List[str],
+                           chunk_size: int = 1_000_000) -> np.ndarray:
+        """
+        Slot counts of every segment at once, shape (n_segments, n_slots).
+
+        The segment id is folded into the flat slot code, so one bincount per
+        chunk counts all features of all segments; rows follow `segment_keys`.
+        """
+        n_segments = int(np.prod([len(self._categories[col]) + 1 for col in segment_columns]))
+        counts = np.zeros(n_segments * self.n_slots, dtype=np.int64)
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start: start + chunk_size]
+            codes = np.empty((len(self.features), len(chunk)), dtype=np.int64)
+            for j, col in enumerate(self.features):
+                codes[j] = self._codes(chunk[col], col)
+            codes += self.offsets[:, None] + self.segment_codes(chunk, segment_columns)[None, :] * self.n_slots
+            counts += np.bincount(codes.ravel(), minlength=len(counts))
+        return counts.reshape(n_segments, self.n_slots)
+
+    def sketch_counts(self, sketch: DriftSketch) -> np.ndarray:
+        """Flat slot counts of a sketch built on the same reference edges."""
+        counts = []
+        for col in self.features:
+            feature = sketch.features[col]
+            if col in self._edges:
+                if not np.array_equal(feature.edges, self._edges[col]):
+                    raise ValueError(f"Sketch of {col} uses different bin edges than the reference.")
+                counts.append(np.append(feature.counts, feature.missing))
+            else:
+                categories = self._categories[col]
+                known = [feature.counts.get(c, 0) for c in categories]
+                counts.append(np.append(known, feature.n - sum(known)))
+        return np.concatenate(counts).astype(np.int64)
+
+    def segments(self, flat: np.ndarray) -> List[np.ndarray]:
+        return np.split(flat, self.offsets[1:])
+
+    def psi(self, current_counts: np.ndarray, reference_counts: np.ndarray = None,
+            eps: float = 1e-4) -> np.ndarray:
+        """
+        PSI of every feature at once from flat reference and current counts.
+
+        Both count arrays may be 2-D (one row per segment, see `grouped_bin_counts`),
+        giving an (n_segments, n_features) result.
+        """
+        if reference_counts is None:
+            reference_counts = self.reference_counts
+        feature_of_slot = np.repeat(np.arange(len(self.features)), self.sizes)
+
+        def proportions(flat):
+            flat = np.asarray(flat, dtype=np.float64)
+            totals = np.add.reduceat(flat, self.offsets, axis=-1)[..., feature_of_slot]
+            props = np.divide(flat, totals, out=np.zeros(flat.shape), where=totals > 0)
+            return np.clip(props, eps, None)
+
+        ref = proportions(reference_counts)
+        cur = proportions(current_counts)
+        return np.add.reduceat((cur - ref) * np.log(cur / ref), self.offsets, axis=-1)
+
+
+def ks_from_counts(ref_counts, cur_counts) -> float:
+    """Largest gap between the two binned CDFs (KS statistic evaluated at the bin edges)."""
+    ref = np.asarray(ref_counts, dtype=np.float64)
+    cur = np.asarray(cur_counts, dtype=np.float64)
+    if ref.sum() == 0 or cur.sum() == 0:
+        return 0.0
+    return float(np.max(np.abs(np.cumsum(ref) / ref.sum() - np.cumsum(cur) / cur.sum())))
+
+
+def ks_pvalue(statistic: float, n_ref: int, n_cur: int) -> float:
+    """Asymptotic two-sample KS p-value."""
+    from scipy.stats import kstwobign
+    if n_ref == 0 or n_cur == 0:
+        return 1.0
+    return float(kstwobign.sf(statistic * math.sqrt(n_ref * n_cur / (n_ref + n_cur))))
+
+
+def chi2_pvalue(ref_counts, cur_counts) -> float:
+    """Chi-square homogeneity test p-value for two aligned category count vectors."""
+    from scipy.stats import chi2_contingency
+    table = np.vstack([ref_counts, cur_counts]).astype(np.float64)
+    table = table[:, table.sum(axis=0) > 0]
+    if table.shape[1] < 2 or (table.sum(axis=1) == 0).any():
+        return 1.0
+    return float(chi2_contingency(table)[1])
@@ -0,0 +1,324 @@
+"""
+Asynchronous log of served predictions, stored as partitioned Parquet.
+
+    predictions/model_version=<v>/date=<YYYY-MM-DD>/hour=<HH>/part-<host>-<pid>-<n>.parquet
+
+`log` / `log_record` only append to an in-memory queue. A background thread
+drains it every `flush_interval_seconds` and writes each partition's rows as a
+row group of an open Parquet file (zstd). Files are written under a hidden name
+and renamed into place when they rotate (new hour, `rotate_interval_seconds`,
+`max_rows_per_file`, or shutdown), so readers only ever see complete files.
+Memory is bounded by `max_buffered_rows`: when the writer falls behind, new rows
+are dropped and counted instead of blocking requests.
+"""
+#importing library
+import os
+import time
+import socket
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.config.paths import PREDICTION_LOG_DIR
+from src.config.configuration import get_section
+
+logger = get_logger(__name__)
+
+class PredictionLogger:
+    def __init__(self,
+                 output_dir: str = PREDICTION_LOG_DIR,
+                 flush_interval_seconds: float = 5.0,
+                 rotate_interval_seconds: float = 300.0,
+                 max_rows_per_file: int = 1_000_000,
+                 max_buffered_rows: int = 200_000,
+                 compression: str = "zstd"):
+        self.output_dir = output_dir
+        self.flush_interval_seconds = float(flush_interval_seconds)
+        self.rotate_interval_seconds = float(rotate_interval_seconds)
+        self.max_rows_per_file = int(max_rows_per_file)
+        self.max_buffered_rows = int(max_buffered_rows)
+        self.compression = compression
+
+        self.logged_rows = 0
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self.files_written = 0
+        self.failed_flushes = 0
+
+        self._pending = deque()
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._writers = {}
+        self._file_seq = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls) -> Optional["PredictionLogger"]:
+        log_config = get_section("serving").get("prediction_log") or {}
+        if not log_config.get("enabled", False):
+            return None
+        return cls(
+            flush_interval_seconds = log_config.get("flush_interval_seconds", 5),
+            rotate_interval_seconds = log_config.get("rotate_interval_seconds", 300),
+            max_rows_per_file = log_config.get("max_rows_per_file", 1_000_000),
+            max_buffered_rows = log_config.get("max_buffered_rows", 200_000),
+            compression = log_config.get("compression", "zstd")
+        )
+
+    # ---------------------------------------------------------------- request path
+
+    def _offer(self, item: tuple, n_rows: int) -> bool:
+        with self._lock:
+            if self._pending_rows + n_rows > self.max_buffered_rows:
+                self.dropped_rows += n_rows
+                return False
+            self._pending.append(item)
+            self._pending_rows += n_rows
+            self.logged_rows += n_rows
+        return True
+
+    def log(self, input_df: pd.DataFrame, probabilities, labels, model_version: str,
+            logged_at: float = None) -> bool:
+        """
+        Queue a scored frame. The frame must not be modified afterwards. Returns False if dropped.
+        `logged_at` backdates rows logged after the fact (e.g. once shadow scored) to when they were served.
+        """
+        logged_at = time.time() if logged_at is None else logged_at
+        return self._offer((logged_at, model_version, input_df, probabilities, labels), len(input_df))
+
+    def log_record(self, record: Dict, probability: float, label: str, model_version: str) -> bool:
+        return self._offer((time.time(), model_version, [record], [probability], [label]), 1)
+
+    # ---------------------------------------------------------------- writer thread
+
+    def _drain(self) -> List[tuple]:
+        with self._lock:
+            items = list(self._pending)
+            self._pending.clear()
+            self._pending_rows = 0
+        return items
+
+    @staticmethod
+    def _partition_of(item: tuple) -> tuple:
+        logged = datetime.fromtimestamp(item[0], timezone.utc)
+        return item[1], logged.strftime("%Y-%m-%d"), logged.hour
+
+    @staticmethod
+    def _to_frame(items: List[tuple]) -> pd.DataFrame:
+        #Frames and single records are stacked separately, then the output columns are attached once
+        parts = []
+        for is_frame in (True, False):
+            group = [item for item in items if isinstance(item[2], pd.DataFrame) == is_frame]
+            if not group:
+                continue
+            if is_frame:
+                frame = pd.concat([item[2] for item in group], ignore_index=True)
+            else:
+                frame = pd.DataFrame([record for item in group for record in item[2]])
+            frame["churn_probability"] = np.concatenate([np.asarray(item[3], dtype=np.float64) for item in group])
+            frame["churn_prediction"] = np.concatenate([np.asarray(item[4]).astype(str) for item in group])
+            frame["logged_at"] = np.repeat([item[0] for item in group], [len(item[2]) for item in group])
+            parts.append(frame)
+
+        frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        #One numeric type per column so every file shares a schema
+        for col in frame.columns:
+            if pd.api.types.is_numeric_dtype(frame[col]) and not pd.api.types.is_bool_dtype(frame[col]):
+                frame[col] = frame[col].astype(np.float64)
+        frame["logged_at"] = pd.to_datetime(frame["logged_at"], unit="s", utc=True)
+        return frame
+
+    def _partition_dir(self, model_version: str, date: str, hour: int) -> str:
+        return os.path.join(self.output_dir, f"model_version={model_version}", f"date={date}", f"hour={hour:02d}")
+
+    def _open_writer(self, partition: tuple, schema):
+        import pyarrow.parquet as pq
+
+        partition_dir = self._partition_dir(*partition)
+        os.makedirs(partition_dir, exist_ok=True)
+        self._file_seq += 1
+        name = f"part-{socket.gethostname()}-{os.getpid()}-{int(time.time())}-{self._file_seq}.parquet"
+        #Hidden while open: dataset readers skip names starting with "."
+        tmp_path = os.path.join(partition_dir, f".{name}")
+        writer = pq.ParquetWriter(tmp_path, schema, compression=self.compression)
+        state = {
+            "writer": writer,
+            "tmp_path": tmp_path,
+            "path": os.path.join(partition_dir, name),
+            "opened_at": time.time(),
+            "rows": 0,
+        }
+        self._writers[partition] = state
+        return state
+
+    def _close_writer(self, partition: tuple):
+        state = self._writers.pop(partition)
+        state["writer"].close()
+        os.replace(state["tmp_path"], state["path"])
+        self.files_written += 1
+        logger.info(f"Prediction log file closed: {state['path']} ({state['rows']} rows)")
+
+    def _write(self, items: List[tuple]):
+        import pyarrow as pa
+
+        #Items carry one timestamp each, so rows are partitioned per item rather than per row
+        partitions = {}
+        for item in items:
+            partitions.setdefault(self._partition_of(item), []).append(item)
+
+        for partition, partition_items in partitions.items():
+            table = pa.Table.from_pandas(self._to_frame(partition_items), preserve_index=False)
+
+            state = self._writers.get(partition)
+            if state is not None and not table.schema.equals(state["writer"].schema):
+                try:
+                    table = table.cast(state["writer"].schema)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                    #Different columns than the open file: start a new one
+                    self._close_writer(partition)
+                    state = None
+            if state is None:
+                state = self._open_writer(partition, table.schema)
+
+            state["writer"].write_table(table)
+            state["rows"] += table.num_rows
+            self.written_rows += table.num_rows
+
+    def _rotate(self, force: bool = False):
+        now = time.time()
+        current_hour = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d %H")
+        for partition in list(self._writers):
+            state = self._writers[partition]
+            expired = (
+                force
+                or f"{partition[1]} {partition[2]:02d}" != current_hour
+                or now - state["opened_at"] >= self.rotate_interval_seconds
+                or state["rows"] >= self.max_rows_per_file
+            )
+            if expired:
+                self._close_writer(partition)
+
+    def flush(self, close_files: bool = False):
+        """Write everything queued so far; with `close_files`, also publish the open files."""
+        with self._flush_lock:
+            items = self._drain()
+            try:
+                if items:
+                    self._write(items)
+                self._rotate(force=close_files)
+            except Exception:
+                self.failed_flushes += 1
+                logger.exception(f"Failed to write {sum(len(item[2]) for item in items)} logged predictions.")
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def start(self):
+        #Called from the app lifespan so the thread is created inside each worker process
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+            self._thread.start()
+            logger.info(f"Prediction logger writing to {self.output_dir} every {self.flush_interval_seconds}s.")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval_seconds + 5)
+            self._thread = None
+        self.flush(close_files=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending_rows = self._pending_rows
+        return {
+            "logged_rows": self.logged_rows,
+            "dropped_rows": self.dropped_rows,
+            "written_rows": self.written_rows,
+            "pending_rows": pending_rows,
+            "open_files": len(self._writers),
+            "files_written": self.files_written,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+def _dataset(log_dir: str):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(
+        pa.schema([("model_version", pa.string()), ("date", pa.string()), ("hour", pa.int32())]),
+        flavor="hive"
+    )
+    dataset = ds.dataset(log_dir, format="parquet", partitioning=partitioning)
+    #The discovered schema is the first file's. Older files can lack later columns (e.g. the
+    #shadow_* ones), so the schema is unified over every file and missing columns read as nulls
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if len(schemas) < 2:
+        return dataset
+    schema = pa.unify_schemas([dataset.schema] + schemas, promote_options="permissive")
+    return ds.dataset(log_dir, schema=schema, format="parquet", partitioning=partitioning)
+
+
+def _filter(start: datetime = None, end: datetime = None, model_version: str = None):
+    import pyarrow.dataset as ds
+
+    conditions = []
+    if start is not None:
+        #Partition columns first so whole directories are pruned before any file is opened
+        conditions += [ds.field("date") >= start.strftime("%Y-%m-%d"), ds.field("logged_at") >= start]
+    if end is not None:
+        conditions += [ds.field("date") <= end.strftime("%Y-%m-%d"), ds.field("logged_at") < end]
+    if model_version is not None:
+        conditions.append(ds.field("model_version") == model_version)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def iter_prediction_log(start: datetime = None,
+                        end: datetime = None,
+                        model_version: str = None,
+                        columns: List[str] = None,
+                        batch_size: int = 131_072,
+                        log_dir: str = PREDICTION_LOG_DIR) -> Iterator[pd.DataFrame]:
+    """Stream logged predictions as DataFrames of at most `batch_size` rows, reading only `columns`."""
+    if not os.path.isdir(log_dir):
+        return
+
+    dataset = _dataset(log_dir)
+    if columns is not None:
+        columns = [col for col in columns if col in dataset.schema.names]
+    for batch in dataset.to_batches(columns=columns, filter=_filter(start, end, model_version), batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def read_prediction_log(start: datetime = None,
+                        end: datetime = None,
+                        model_version: str = None,
+                        columns: List[str] = None,
+                        log_dir: str = PREDICTION_LOG_DIR) -> pd.DataFrame:
+    """Load the matching logged predictions into one DataFrame (prefer `iter_prediction_log` for large scans)."""
+    frames = list(iter_prediction_log(start, end, model_version, columns, log_dir=log_dir))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+if __name__ == "__main__":
+    #Example: rows logged in the last hour
+    from datetime import timedelta
+
+    recent = read_prediction_log(start=datetime.now(timezone.utc) - timedelta(hours=1))
+    print(f"{len(recent)} predictions logged in the last hour")
+    print(recent.tail())
@@ -0,0 +1,182 @@
+"""
+Reference profile written by the training pipeline next to the model.
+
+    reference_profile.json
+        features        drift sketch of the training features (bin edges + counts)
+        summary         per-feature statistics (mean/std/quantiles, category frequencies)
+        segments        grouped slot counts for each configured list of segment columns
+        scores          histogram of the candidate's churn probabilities on the test split
+        score_baseline  mean score, positive rate and mean confidence
+    confidence_baseline.json
+        mean_confidence of the same scores, read by the retraining trigger
+
+Preprocessing writes the feature part and evaluation adds the score part, both
+for the staged candidate. Evaluation freezes the files into the candidate's
+bundle, and promotion publishes them under data/artifacts/. The retraining
+trigger and the serving drift recorder only ever read the published files,
+never the training data or the model.
+"""
+#importing library
+import os
+import sys
+import json
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.utils.common import save_json
+from src.config.paths import (
+    REFERENCE_PROFILE_PATH, CONFIDENCE_BASELINE_PATH,
+    CANDIDATE_REFERENCE_PROFILE_PATH, CANDIDATE_CONFIDENCE_BASELINE_PATH
+)
+from src.monitoring.drift_sketch import DriftSketch, NumericSketch, SketchLayout, SCORE_BIN_EDGES
+
+logger = get_logger(__name__)
+
+#Names of the baseline files inside a model bundle
+REFERENCE_PROFILE_FILE = "reference_profile.json"
+CONFIDENCE_BASELINE_FILE = "confidence_baseline.json"
+
+
+def compute_mean_confidence(probabilities: np.ndarray) -> float:
+    return float(np.mean(np.abs(np.asarray(probabilities) - 0.5)))
+
+
+def summarize_features(df: pd.DataFrame) -> Dict:
+    summary = {}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == object:
+            summary[col] = {
+                "type": "categorical",
+                "missing": int(values.isna().sum()),
+                "n_categories": int(values.nunique()),
+                "frequencies": values.value_counts(normalize=True).round(6).to_dict(),
+            }
+        else:
+            quantiles = values.quantile([0.05, 0.25, 0.5, 0.75, 0.95])
+            summary[col] = {
+                "type": "numeric",
+                "missing": int(values.isna().sum()),
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "quantiles": {f"p{int(q * 100):02d}": float(v) for q, v in quantiles.items()},
+            }
+    return summary
+
+
+def build_reference_profile(reference_df: pd.DataFrame, n_bins: int = 20,
+                            segments: Optional[List[List[str]]] = None) -> Dict:
+    sketch = DriftSketch.from_reference(reference_df, n_bins=n_bins)
+    profile = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_rows": len(reference_df),
+        **sketch.to_dict(),
+        "summary": summarize_features(reference_df),
+    }
+    if segments:
+        layout = SketchLayout(sketch)
+        profile["segments"] = [
+            {"columns": list(columns), "counts": layout.grouped_bin_counts(reference_df, list(columns)).tolist()}
+            for columns in segments
+        ]
+    return profile
+
+
+def save_reference_profile(reference_df: pd.DataFrame, n_bins: int = 20,
+                           segments: Optional[List[List[str]]] = None,
+                           file_path: str = CANDIDATE_REFERENCE_PROFILE_PATH) -> str:
+    try:
+        save_json(file_path, build_reference_profile(reference_df, n_bins=n_bins, segments=segments))
+        logger.info(f"Reference profile saved at {file_path}")
+        return file_path
+
+    except Exception as e:
+        logger.exception("Failed to save reference profile.")
+        raise ChurnException(e, sys)
+
+
+def load_segment_references(file_path: str = REFERENCE_PROFILE_PATH) -> List[Dict]:
+    """Per-segment reference counts saved with the profile: [{"columns": [...], "counts": 2-D array}]."""
+    segments = load_reference_profile(file_path).get("segments") or []
+    return [{"columns": s["columns"], "counts": np.asarray(s["counts"], dtype=np.int64)} for s in segments]
+
+
+def save_score_baseline(probabilities: np.ndarray, threshold: float,
+                        file_path: str = CANDIDATE_REFERENCE_PROFILE_PATH,
+                        confidence_path: str = CANDIDATE_CONFIDENCE_BASELINE_PATH) -> Dict:
+    """Add the candidate's score distribution to the profile and write confidence_baseline.json."""
+    try:
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        scores = NumericSketch(SCORE_BIN_EDGES)
+        scores.update(probabilities)
+
+        baseline = {
+            "n": len(probabilities),
+            "threshold": threshold,
+            "mean_score": float(probabilities.mean()),
+            "positive_rate": float((probabilities >= threshold).mean()),
+            "mean_confidence": compute_mean_confidence(probabilities),
+        }
+
+        profile = load_reference_profile(file_path) if os.path.exists(file_path) else {}
+        profile["scores"] = scores.to_dict()
+        profile["score_baseline"] = baseline
+        save_json(file_path, profile)
+        save_json(confidence_path, baseline)
+
+        logger.info(f"Score baseline saved: {baseline}")
+        return baseline
+
+    except Exception as e:
+        logger.exception("Failed to save score baseline.")
+        raise ChurnException(e, sys)
+
+
+def load_reference_profile(file_path: str = REFERENCE_PROFILE_PATH) -> Dict:
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def publish_baselines(bundle_path: str,
+                      file_path: str = REFERENCE_PROFILE_PATH,
+                      confidence_path: str = CONFIDENCE_BASELINE_PATH) -> bool:
+    """
+    Copy the baselines frozen in a promoted bundle to the published paths.
+    Each file is replaced atomically, so readers see the old or the new one.
+    Returns False when the bundle carries no baselines (published files are kept).
+    """
+    try:
+        published = False
+        for name, target in ((REFERENCE_PROFILE_FILE, file_path), (CONFIDENCE_BASELINE_FILE, confidence_path)):
+            source = os.path.join(bundle_path, name)
+            if not os.path.exists(source):
+                continue
+            tmp_path = f"{target}.tmp-{os.getpid()}"
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, target)
+            published = True
+
+        if published:
+            logger.info(f"Baselines of {bundle_path} published.")
+        else:
+            logger.warning(f"Bundle {bundle_path} has no baselines. Published baselines left unchanged.")
+        return published
+
+    except Exception as e:
+        logger.exception("Failed to publish baselines.")
+        raise ChurnException(e, sys)
+
+
+if __name__ == "__main__":
+    profile = load_reference_profile()
+    print(f"Reference profile of {profile['n_rows']} rows, created {profile['created_at']}")
+    print(json.dumps(profile.get("score_baseline"), indent=4))
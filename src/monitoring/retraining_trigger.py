@@ -2,72 +2,166 @@
 import sys
 import os
 import json
+from datetime import datetime, timedelta, timezone
 import numpy as np
 import pandas as pd
 
 #importing requirements
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
-from src.utils.common import load_object, save_json
+from src.utils.common import load_frame
 
 from src.monitoring.drift_detection import DataDriftDetector
-from src.pipeline.training_pipeline import TrainingPipeline
-from src.config.paths import PROCESSED_DATA_DIR, DRIFT_DATA_DIR, ARTIFACT_DIR
+from src.monitoring.drift_sketch import DriftSketch, SketchLayout, load_window_sketches
+from src.monitoring.reference_profile import compute_mean_confidence, load_segment_references
+from src.monitoring.prediction_logger import iter_prediction_log
+from src.config.paths import (
+    TRAIN_DATA_PATH, DRIFT_DATA_DIR, REFERENCE_PROFILE_PATH, CONFIDENCE_BASELINE_PATH
+)
+from src.config.configuration import get_section
 
 
 logger = get_logger(__name__)
 
 class RetrainingTrigger:
     def __init__(self):
-        self.drift_detector = DataDriftDetector()
-
-    def run(self):
-        try:
-            logger.info("Starting retraining trigger check")
+        self.drift_detector = DataDriftDetector.from_config()
+        self.segment_config = get_section("drift").get("segments") or {}
+
+    @staticmethod
+    def lookback_start() -> datetime:
+        lookback_hours = (get_section("drift").get("sketch") or {}).get("lookback_hours", 24)
+        return datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+
+    def check_served_sketches(self):
+        """Drift and confidence from the API workers' sketches alone, or None when nothing was served."""
+        #Sketches recorded against an earlier profile are skipped; if that leaves none, the prediction log is read
+        reference = DriftSketch.load(REFERENCE_PROFILE_PATH)
+        current = load_window_sketches(self.lookback_start(), reference=reference)
+        if current is None or current.n == 0:
+            return None
+
+        logger.info(f"Checking {current.n} served rows summarised in drift sketches.")
+        drift_result = self.drift_detector.detect_drift_from_sketches(reference, current)
+        return drift_result, is_confidence_degraded(current_confidence = current.mean_confidence())
+
+    def segment_references(self):
+        """Per-segment reference counts from the profile, or [] when segment drift is not configured."""
+        if not self.segment_config.get("columns") or not os.path.exists(REFERENCE_PROFILE_PATH):
+            return []
+        return load_segment_references(REFERENCE_PROFILE_PATH)
+
+    def check_prediction_log(self):
+        """Drift and confidence from one streaming scan of the prediction log, or None when it is empty."""
+        layout = SketchLayout(DriftSketch.load(REFERENCE_PROFILE_PATH))
+        references = self.segment_references()
+        counts = np.zeros(layout.n_slots, dtype=np.int64)
+        segment_counts = [np.zeros_like(reference["counts"]) for reference in references]
+        confidence_sum, n_rows = 0.0, 0
+
+        for batch in iter_prediction_log(start=self.lookback_start(), columns=layout.features + ["churn_probability"]):
+            counts += layout.bin_counts(batch)
+            for reference, accumulated in zip(references, segment_counts):
+                accumulated += layout.grouped_bin_counts(batch, reference["columns"])
+            confidence_sum += float(np.abs(batch["churn_probability"].to_numpy() - 0.5).sum())
+            n_rows += len(batch)
+
+        if n_rows == 0:
+            return None
+
+        logger.info(f"Checking {n_rows} rows from the prediction log.")
+        drift_result = self.drift_detector.detect_drift_from_counts(layout, counts)
+        drift_result["segments"] = [
+            self.drift_detector.detect_segment_drift_from_counts(
+                layout, reference["columns"], reference["counts"], current,
+                min_segment_rows = self.segment_config.get("min_rows", 100)
+            )
+            for reference, current in zip(references, segment_counts)
+        ]
+        return drift_result, is_confidence_degraded(current_confidence = confidence_sum / n_rows)
+
+    def check_current_data(self):
+        """Drift and confidence of data/drift/current_data.(parquet|csv), or None when it is missing or empty."""
+        # 1. Load current data
+        current_path = os.path.join(DRIFT_DATA_DIR, "current_data.parquet")
+
+        if not os.path.exists(current_path) and not os.path.exists(os.path.join(DRIFT_DATA_DIR, "current_data.csv")):
+            return None
+
+        current_df = load_frame(current_path)
+        if current_df.empty:
+            logger.warning("Current inference data is empty.")
+            return None
+
+        # 2. Detect Drift against the reference profile saved at training time
+        if os.path.exists(REFERENCE_PROFILE_PATH):
+            layout = SketchLayout(DriftSketch.load(REFERENCE_PROFILE_PATH))
+            drift_result = self.drift_detector.detect_drift_from_layout(layout, current_df)
+            drift_result["segments"] = [
+                self.drift_detector.detect_segment_drift(
+                    layout, current_df, reference["columns"], reference["counts"],
+                    min_segment_rows = self.segment_config.get("min_rows", 100),
+                    n_jobs = self.segment_config.get("n_jobs", 1)
+                )
+                for reference in self.segment_references()
+            ]
 
-            # 1. Load reference (training Data)
-            reference_path = os.path.join(PROCESSED_DATA_DIR, "train.csv")
-            reference_df=pd.read_csv(reference_path)
+        else:
+            #No profile yet: fall back to the raw training data
+            reference_df = load_frame(TRAIN_DATA_PATH)
 
             #drop target column if present
             if "Churn" in reference_df.columns:
                 reference_df = reference_df.drop(columns = ["Churn"])
 
-            # 2. Load current data
-            current_path = os.path.join(DRIFT_DATA_DIR, "current_data.csv")
+            drift_result = self.drift_detector.detect_drift(
+                reference_df, current_df
+            )
+
+        return drift_result, is_confidence_degraded(current_df)
+
+    def run(self):
+        try:
+            logger.info("Starting retraining trigger check")
+
+            #Cheapest source first; raw current data is the fallback
+            checks = [self.check_current_data]
+            if os.path.exists(REFERENCE_PROFILE_PATH):
+                checks = [self.check_served_sketches, self.check_prediction_log] + checks
+
+            outcome = None
+            for check in checks:
+                outcome = check()
+                if outcome is not None:
+                    break
 
-            if not os.path.exists(current_path):
+            if outcome is None:
                 logger.warning(
                     "No current inference data found. Skipping drift check."
                 )
                 return
 
-            current_df = pd.read_csv(current_path)
-            if current_df.empty:
-                logger.warning("Current inference data is empty. Skipping retraining.")
-                return
-
-            # 3. Detect Drift
-            drift_result = self.drift_detector.detect_drift(
-                reference_df, current_df
-            )
-
-            confidence_degraded = is_confidence_degraded(current_df)
+            drift_result, confidence_degraded = outcome
 
             if drift_result["drift_detected"]:
                 logger.warning("Data Drift Detected!")
 
+            drifted_segments = [
+                name for segment_result in drift_result.get("segments", [])
+                for name in segment_result["drifted_segments"]
+            ]
+            if drifted_segments:
+                logger.warning(f"Drift detected within segments: {drifted_segments}")
+            segment_drift = self.segment_config.get("trigger_retraining", False) and any(
+                segment_result["drift_detected"] for segment_result in drift_result.get("segments", [])
+            )
+
             if confidence_degraded:
                 logger.warning("Prediction confidence degraded!")
 
-            # 4. Trigger retraining if drift detected
-            if drift_result["drift_detected"] or confidence_degraded:
-                logger.warning("Triggered Retraining.")
-
-                training_pipeline =TrainingPipeline()
-                training_pipeline.run()
-
-                logger.info("✅ Model retraining completed successfully")
+            # 3. Trigger retraining if drift detected
+            if drift_result["drift_detected"] or segment_drift or confidence_degraded:
+                self.retrain()
 
             else:
                 logger.info("✅ No retraining conditions met. System healthy.")
@@ -76,34 +170,54 @@ class RetrainingTrigger:
             logger.exception("Retraining trigger failed")
             raise ChurnException(e, sys)
 
+    def retrain(self):
+        logger.warning("Triggered Retraining.")
+
+        #Imported here: the training stack (mlflow) is only needed when we retrain
+        if get_section("retraining").get("mode", "full") == "incremental":
+            from src.pipeline.incremental_pipeline import IncrementalTrainingPipeline
+            IncrementalTrainingPipeline.from_config().run()
+
+        else:
+            from src.pipeline.training_pipeline import TrainingPipeline
 
-def compute_mean_confidence(probabilities: np.ndarray) -> float:
-    return float(np.mean(np.abs(probabilities - 0.5)))
+            training_pipeline =TrainingPipeline()
+            training_pipeline.run()
 
+        logger.info("✅ Model retraining completed successfully")
 
-def is_confidence_degraded(current_df: pd.DataFrame, threshold: float = 0.15) -> bool:
-    confidence_path = os.path.join(ARTIFACT_DIR, "confidence_baseline.json")
 
+def is_confidence_degraded(current_df: pd.DataFrame = None, threshold: float = 0.15,
+                           current_confidence: float = None) -> bool:
     # No baseline yet → cannot judge degradation
-    if not os.path.exists(confidence_path):
+    if not os.path.exists(CONFIDENCE_BASELINE_PATH):
         logger.info("No confidence baseline found. Skipping confidence check.")
         return False
 
     # Load baseline
-    with open(confidence_path, "r") as f:
+    with open(CONFIDENCE_BASELINE_PATH, "r") as f:
         baseline = json.load(f)
 
-    # Load model & preprocessor
-    model = load_object(os.path.join(ARTIFACT_DIR, "Churn_Model.pkl"))
-    preprocessor = load_object(os.path.join(ARTIFACT_DIR, "preprocessor.pkl"))
+    if current_confidence is None:
+        if current_df is None:
+            logger.info("No current scores available. Skipping confidence check.")
+            return False
 
-    # Prepare data
-    X_current = preprocessor.transform(current_df)
+        if "churn_probability" in current_df.columns:
+            # Scores logged at serving time
+            probs = current_df["churn_probability"].to_numpy(dtype=np.float64)
 
-    # Predict probabilities
-    probs = model.predict_proba(X_current)[:, 1]
+        else:
+            # Unscored data: load model & preprocessor and score it here
+            logger.info("Current data has no churn_probability column. Scoring it with the production model.")
+            from src.predict import load_production_objects
+
+            objects, _, _ = load_production_objects()
+            X_current = objects["preprocessor"].transform(current_df)
+            probs = objects["model"].predict_proba(X_current)[:, 1]
+
+        current_confidence = compute_mean_confidence(probs)
 
-    current_confidence = compute_mean_confidence(probs)
     baseline_confidence = baseline["mean_confidence"]
 
     logger.info(
@@ -117,4 +231,3 @@ def is_confidence_degraded(current_df: pd.DataFrame, threshold: float = 0.15) ->
 if __name__ == "__main__":
     retraining = RetrainingTrigger()
     retraining.run()
-
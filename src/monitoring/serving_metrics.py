@@ -0,0 +1,237 @@
+"""
+Prometheus metrics of the serving process, rendered in the text exposition format by GET /metrics.
+
+    churn_requests_total{endpoint,method,status}         requests handled
+    churn_request_errors_total{endpoint,status}          responses with status >= 400
+    churn_request_duration_seconds{endpoint}             histogram, whole request incl. the ASGI stack
+    churn_stage_duration_seconds{stage}                  histogram per scoring call:
+        validation         pydantic parsing of the request body
+        dataframe          pd.DataFrame construction from the records
+        transform          preprocessor.transform
+        predict_proba      model.predict_proba
+        compiled_score     transform and predict_proba fused (compiled linear scorer)
+        inverse_transform  probabilities to Churn labels
+        serialization      response body to JSON
+    churn_requests_in_flight                             gauge
+    churn_model_info{model_version}                      always 1, labelled with the served version
+
+Stats of the optional components (micro-batching, prediction cache, prediction
+log, shadow scorer) are exported as `churn_<component>_<stat>` gauges.
+
+No client library: every series is a plain int/float, and a stage observation
+is a bisect over the bucket edges into a histogram owned by the calling thread
+(no lock on the hot path; the per-thread histograms are summed when rendered). Each worker process has its
+own registry, so under gunicorn a scrape sees the worker that answered it.
+"""
+#importing library
+import re
+import time
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Optional, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#10us to 10s: compiled single-row scoring sits at the bottom, large batches at the top
+LATENCY_BUCKETS_SECONDS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+STAGES = (
+    "validation", "dataframe", "transform", "predict_proba",
+    "compiled_score", "inverse_transform", "serialization"
+)
+
+_METRIC_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket i counts observations <= buckets[i] that are above buckets[i - 1]."""
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_SECONDS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def add(self, other: "Histogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+
+    def render(self, name: str, **labels) -> list:
+        lines, cumulative = [], 0
+        for edge, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if edge == float("inf") else repr(edge)
+            lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+        suffix = _labels(**labels) if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum!r}")
+        lines.append(f"{name}_count{suffix} {cumulative}")
+        return lines
+
+
+class ServingMetrics:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_SECONDS):
+        self.buckets = tuple(buckets)
+        self.requests = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.request_duration = {}
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+        #Stage histograms are kept per thread and summed when rendered, so observing one takes no lock
+        self._local = threading.local()
+        self._stage_shards = []
+
+    def _thread_stage_histograms(self) -> Dict[str, Histogram]:
+        histograms = {stage: Histogram(self.buckets) for stage in STAGES}
+        with self._lock:
+            self._stage_shards.append(histograms)
+        self._local.stage_duration = histograms
+        return histograms
+
+    def observe_stage(self, stage: str, seconds: float):
+        try:
+            histograms = self._local.stage_duration
+        except AttributeError:
+            histograms = self._thread_stage_histograms()
+        histogram = histograms[stage]
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.sum += seconds
+
+    def stage_duration(self) -> Dict[str, Histogram]:
+        """Stage histograms summed over every thread that has observed one."""
+        with self._lock:
+            shards = list(self._stage_shards)
+        merged = {stage: Histogram(self.buckets) for stage in STAGES}
+        for shard in shards:
+            for stage, histogram in shard.items():
+                merged[stage].add(histogram)
+        return merged
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint: str, method: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(endpoint, method, status)] += 1
+            if status >= 400:
+                self.errors[(endpoint, status)] += 1
+            histogram = self.request_duration.get(endpoint)
+            if histogram is None:
+                histogram = self.request_duration[endpoint] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @staticmethod
+    def _component_lines(component: str, stats: Dict, prefix: str = "") -> list:
+        #Numeric stats only; nested dicts are flattened, histogram dicts and strings are skipped
+        lines = []
+        for key, value in stats.items():
+            name = f"churn_{component}_{prefix}{key}"
+            if isinstance(value, dict):
+                lines.extend(ServingMetrics._component_lines(component, value, prefix=f"{prefix}{key}_"))
+            elif isinstance(value, (bool, int, float)) and _METRIC_NAME.match(name):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {float(value)!r}")
+        return lines
+
+    def render(self, model_version: Optional[str] = None, components: Optional[Dict[str, Dict]] = None) -> str:
+        with self._lock:
+            requests = dict(self.requests)
+            errors = dict(self.errors)
+            in_flight = self.in_flight
+            request_lines = []
+            for endpoint, histogram in sorted(self.request_duration.items()):
+                request_lines.extend(histogram.render("churn_request_duration_seconds", endpoint=endpoint))
+
+        stage_lines = []
+        for stage, histogram in self.stage_duration().items():
+            stage_lines.extend(histogram.render("churn_stage_duration_seconds", stage=stage))
+
+        lines = ["# HELP churn_requests_total Requests handled, by endpoint, method and status.",
+                 "# TYPE churn_requests_total counter"]
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(f"churn_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+        lines += ["# HELP churn_request_errors_total Responses with a 4xx or 5xx status.",
+                  "# TYPE churn_request_errors_total counter"]
+        for (endpoint, status), count in sorted(errors.items()):
+            lines.append(f"churn_request_errors_total{_labels(endpoint=endpoint, status=status)} {count}")
+
+        lines += ["# HELP churn_request_duration_seconds Request latency, whole request.",
+                  "# TYPE churn_request_duration_seconds histogram"] + request_lines
+        lines += ["# HELP churn_stage_duration_seconds Latency of each inference stage, per scoring call.",
+                  "# TYPE churn_stage_duration_seconds histogram"] + stage_lines
+
+        lines += ["# HELP churn_requests_in_flight Requests currently being handled.",
+                  "# TYPE churn_requests_in_flight gauge",
+                  f"churn_requests_in_flight {in_flight}"]
+        if model_version is not None:
+            lines += ["# HELP churn_model_info Model version being served.",
+                      "# TYPE churn_model_info gauge",
+                      f"churn_model_info{_labels(model_version=model_version)} 1"]
+
+        for component, stats in (components or {}).items():
+            if stats:
+                lines.extend(self._component_lines(component, stats))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests, errors, latency and in-flight requests.
+
+    Requests are labelled with the matched route's path template (set in the scope
+    by the router) or, for plain routes such as /openapi.json, with their path when
+    it is one of the app's routes. Unknown paths collapse into "other" instead of
+    creating series.
+    """
+
+    def __init__(self, app, metrics: ServingMetrics):
+        self.app = app
+        self.metrics = metrics
+        self._route_paths = None
+
+    def _endpoint(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        if self._route_paths is None and "app" in scope:
+            self._route_paths = {getattr(route, "path", None) for route in scope["app"].router.routes}
+        return scope["path"] if scope["path"] in (self._route_paths or ()) else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.request_finished(self._endpoint(scope), scope["method"], status, time.perf_counter() - start)
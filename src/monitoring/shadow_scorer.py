@@ -0,0 +1,336 @@
+"""
+Shadow (challenger) scoring of served traffic, off the response path.
+
+The challenger is the bundle named by `challenger_version.json` (written when a
+candidate is rejected at evaluation), or the bundle `serving.shadow.challenger_version`
+names. On the request path `submit` only appends the champion's inputs and
+scores to a bounded queue. A background thread drains it every
+`flush_interval_seconds` (sooner once `max_batch_rows` are queued), scores the
+rows with the challenger in batches, and:
+
+    * updates live comparison metrics (label agreement, score difference,
+      PSI / KS between the two score distributions), served on /shadow/stats
+    * logs each request once to the prediction log, with the champion's
+      churn_probability / churn_prediction and the challenger's
+      shadow_probability / shadow_prediction / shadow_model_version
+
+When the queue is full, rows are dropped from shadow scoring and logged
+without challenger columns, so the request path never waits.
+`summarize_shadow_log` computes the same comparison from the prediction log.
+"""
+#importing library
+import os
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.config.paths import ARTIFACT_DIR, BUNDLE_DIR, CHALLENGER_VERSION_PATH, PREDICTION_LOG_DIR
+from src.config.configuration import get_section
+from src.predict import ChurnPredictor, get_promoted_bundle_path
+from src.monitoring.drift_sketch import NumericSketch, SCORE_BIN_EDGES
+from src.monitoring.prediction_logger import PredictionLogger, iter_prediction_log
+
+logger = get_logger(__name__)
+
+SHADOW_COLUMNS = ["shadow_probability", "shadow_prediction", "shadow_model_version"]
+
+
+class ShadowComparison:
+    """Running champion vs challenger comparison over paired scores."""
+
+    def __init__(self):
+        self.rows = 0
+        self.agreements = 0
+        self.abs_diff_sum = 0.0
+        self.champion_scores = NumericSketch(SCORE_BIN_EDGES)
+        self.challenger_scores = NumericSketch(SCORE_BIN_EDGES)
+
+    def update(self, champion_prob, champion_labels, challenger_prob, challenger_labels):
+        champion_prob = np.asarray(champion_prob, dtype=np.float64)
+        challenger_prob = np.asarray(challenger_prob, dtype=np.float64)
+        self.rows += len(champion_prob)
+        self.agreements += int((np.asarray(champion_labels).astype(str) == np.asarray(challenger_labels).astype(str)).sum())
+        self.abs_diff_sum += float(np.abs(champion_prob - challenger_prob).sum())
+        self.champion_scores.update(champion_prob)
+        self.challenger_scores.update(challenger_prob)
+
+    @staticmethod
+    def score_psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+        expected = np.clip(expected / max(expected.sum(), 1), eps, None)
+        actual = np.clip(actual / max(actual.sum(), 1), eps, None)
+        return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+    def snapshot(self) -> Dict:
+        champion, challenger = self.champion_scores.counts, self.challenger_scores.counts
+        if not self.rows:
+            return {"rows": 0}
+        return {
+            "rows": self.rows,
+            "agreement_rate": self.agreements / self.rows,
+            "mean_abs_score_diff": self.abs_diff_sum / self.rows,
+            "mean_champion_probability": self.champion_scores.total / self.rows,
+            "mean_challenger_probability": self.challenger_scores.total / self.rows,
+            "score_psi": self.score_psi(champion, challenger),
+            #Largest gap between the two score CDFs, at the histogram's resolution
+            "score_ks": float(np.max(np.abs(np.cumsum(champion) - np.cumsum(challenger))) / self.rows),
+            "score_bin_edges": SCORE_BIN_EDGES.tolist(),
+            "champion_score_counts": champion.tolist(),
+            "challenger_score_counts": challenger.tolist(),
+        }
+
+
+class ShadowScorer:
+    def __init__(self,
+                 challenger_version: str = None,
+                 prediction_logger: PredictionLogger = None,
+                 flush_interval_seconds: float = 0.5,
+                 max_batch_rows: int = 2048,
+                 max_pending_rows: int = 50_000,
+                 poll_interval_seconds: float = 10.0):
+        self.challenger_version = challenger_version
+        self.prediction_logger = prediction_logger
+        self.flush_interval_seconds = float(flush_interval_seconds)
+        self.max_batch_rows = max(1, int(max_batch_rows))
+        self.max_pending_rows = int(max_pending_rows)
+        self.poll_interval_seconds = float(poll_interval_seconds)
+
+        self.challenger = None
+        self.comparison = ShadowComparison()
+        self.submitted_rows = 0
+        self.dropped_rows = 0
+        self.failed_rows = 0
+        self.scored_rows = 0
+        self.batches = 0
+        self.lag_ms_sum = 0.0
+        self.lag_ms_max = 0.0
+
+        self._pending = deque()
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_poll = 0.0
+
+    @classmethod
+    def from_config(cls, prediction_logger: PredictionLogger = None) -> Optional["ShadowScorer"]:
+        shadow_config = get_section("serving").get("shadow") or {}
+        if not shadow_config.get("enabled", False):
+            return None
+        return cls(
+            challenger_version = shadow_config.get("challenger_version"),
+            prediction_logger = prediction_logger,
+            flush_interval_seconds = shadow_config.get("flush_interval_seconds", 0.5),
+            max_batch_rows = shadow_config.get("max_batch_rows", 2048),
+            max_pending_rows = shadow_config.get("max_pending_rows", 50_000),
+            poll_interval_seconds = shadow_config.get("poll_interval_seconds", 10)
+        )
+
+    # ---------------------------------------------------------------- request path
+
+    def submit(self, input_data, probabilities, labels, model_version: str) -> bool:
+        """
+        Queue served rows (a record dict or a frame that is not modified afterwards) for shadow scoring.
+        Returns False when they are not taken (no challenger, or the queue is full); the caller logs them itself.
+        """
+        challenger = self.challenger
+        if challenger is None or challenger.model_version == model_version:
+            return False
+
+        n_rows = 1 if isinstance(input_data, dict) else len(input_data)
+        with self._lock:
+            if self._pending_rows + n_rows > self.max_pending_rows:
+                self.dropped_rows += n_rows
+                return False
+            self._pending.append((time.time(), model_version, input_data, probabilities, labels))
+            self._pending_rows += n_rows
+            self.submitted_rows += n_rows
+            full = self._pending_rows >= self.max_batch_rows
+
+        if full:
+            self._wake.set()
+        return True
+
+    # ---------------------------------------------------------------- worker thread
+
+    def _resolve_bundle_path(self) -> Optional[str]:
+        if self.challenger_version is not None:
+            bundle_path = os.path.join(BUNDLE_DIR, self.challenger_version)
+            return bundle_path if os.path.isdir(bundle_path) else None
+        return get_promoted_bundle_path(CHALLENGER_VERSION_PATH)
+
+    def load_challenger(self) -> bool:
+        """(Re)load the challenger when the configured bundle or the challenger marker changed. True on swap."""
+        bundle_path = self._resolve_bundle_path()
+        if bundle_path is None:
+            return False
+        version = os.path.basename(bundle_path)
+        if self.challenger is not None and self.challenger.model_version == version:
+            return False
+
+        try:
+            challenger = ChurnPredictor(bundle_path=bundle_path)
+            challenger.warm_up()
+        except Exception:
+            logger.exception(f"Failed to load shadow challenger from {bundle_path}.")
+            return False
+
+        #Rows queued for the old challenger are still scored by it in the current flush
+        with self._flush_lock:
+            self.challenger = challenger
+            self.comparison = ShadowComparison()
+        logger.info(f"Shadow scoring with challenger model {version} ({os.path.relpath(bundle_path, ARTIFACT_DIR)}).")
+        return True
+
+    def _drain(self) -> List[tuple]:
+        with self._lock:
+            items = list(self._pending)
+            self._pending.clear()
+            self._pending_rows = 0
+        return items
+
+    @staticmethod
+    def _stack(items: List[tuple]):
+        """One frame of the queued inputs plus the matching champion probabilities and labels."""
+        frame_items = [item for item in items if isinstance(item[2], pd.DataFrame)]
+        record_items = [item for item in items if isinstance(item[2], dict)]
+        ordered = frame_items + record_items
+
+        parts = [item[2] for item in frame_items] + ([pd.DataFrame([item[2] for item in record_items])] if record_items else [])
+        #A new frame either way: the served frames themselves are never modified
+        frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+        probabilities = np.concatenate([np.atleast_1d(np.asarray(item[3], dtype=np.float64)) for item in ordered])
+        labels = np.concatenate([np.atleast_1d(np.asarray(item[4]).astype(str)) for item in ordered])
+        return frame, probabilities, labels
+
+    def _score_batch(self, challenger: ChurnPredictor, items: List[tuple]):
+        champion_version = items[0][1]
+        frame, champion_prob, champion_labels = self._stack(items)
+
+        try:
+            shadow_prob = challenger.predict_proba(frame)
+            shadow_labels = challenger.labels[(shadow_prob >= challenger.threshold).astype(int)]
+        except Exception:
+            self.failed_rows += len(frame)
+            logger.exception(f"Shadow scoring of {len(frame)} rows failed.")
+            shadow_prob = None
+
+        now = time.time()
+        oldest = min(item[0] for item in items)
+        if shadow_prob is not None:
+            self.comparison.update(champion_prob, champion_labels, shadow_prob, shadow_labels)
+            self.batches += 1
+            self.scored_rows += len(frame)
+            self.lag_ms_sum += sum((now - item[0]) * 1000.0 * (1 if isinstance(item[2], dict) else len(item[2]))
+                                   for item in items)
+            self.lag_ms_max = max(self.lag_ms_max, (now - oldest) * 1000.0)
+
+        if self.prediction_logger is not None:
+            if shadow_prob is not None:
+                frame["shadow_probability"] = shadow_prob
+                frame["shadow_prediction"] = shadow_labels
+                frame["shadow_model_version"] = challenger.model_version
+            self.prediction_logger.log(frame, champion_prob, champion_labels, champion_version, logged_at=oldest)
+
+    def flush(self):
+        """Score everything queued so far with the current challenger."""
+        with self._flush_lock:
+            items = self._drain()
+            challenger = self.challenger
+            if not items or challenger is None:
+                return
+
+            #Batches of at most max_batch_rows, one champion version each
+            by_version = {}
+            for item in items:
+                by_version.setdefault(item[1], []).append(item)
+            for version_items in by_version.values():
+                batch, batch_rows = [], 0
+                for item in version_items:
+                    batch.append(item)
+                    batch_rows += 1 if isinstance(item[2], dict) else len(item[2])
+                    if batch_rows >= self.max_batch_rows:
+                        self._score_batch(challenger, batch)
+                        batch, batch_rows = [], 0
+                if batch:
+                    self._score_batch(challenger, batch)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                if time.monotonic() - self._last_poll >= self.poll_interval_seconds:
+                    self._last_poll = time.monotonic()
+                    self.load_challenger()
+                self.flush()
+            except Exception:
+                logger.exception("Shadow scoring loop failed.")
+
+    def start(self):
+        #Called from the app lifespan so the thread is created inside each worker process
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._last_poll = 0.0
+            self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+            self._thread.start()
+            logger.info(f"Shadow scorer started (flush every {self.flush_interval_seconds}s).")
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval_seconds + 5)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending_rows = self._pending_rows
+        scored_rows = self.scored_rows
+        return {
+            "challenger_version": self.challenger.model_version if self.challenger is not None else None,
+            "submitted_rows": self.submitted_rows,
+            "scored_rows": scored_rows,
+            "dropped_rows": self.dropped_rows,
+            "failed_rows": self.failed_rows,
+            "pending_rows": pending_rows,
+            "batches": self.batches,
+            "mean_lag_ms": self.lag_ms_sum / scored_rows if scored_rows else 0.0,
+            "max_lag_ms": self.lag_ms_max,
+            #Since the current challenger was loaded
+            "comparison": self.comparison.snapshot(),
+        }
+
+
+def summarize_shadow_log(start: datetime = None, end: datetime = None,
+                         log_dir: str = PREDICTION_LOG_DIR) -> Dict[str, Dict]:
+    """Champion vs challenger comparison per shadow_model_version, from the shadow-scored rows of the prediction log."""
+    comparisons = {}
+    columns = ["churn_probability", "churn_prediction"] + SHADOW_COLUMNS
+    for batch in iter_prediction_log(start=start, end=end, columns=columns, log_dir=log_dir):
+        if "shadow_model_version" not in batch.columns:
+            continue
+        batch = batch[batch["shadow_model_version"].notna()]
+        for version, rows in batch.groupby("shadow_model_version"):
+            comparisons.setdefault(version, ShadowComparison()).update(
+                rows["churn_probability"], rows["churn_prediction"],
+                rows["shadow_probability"], rows["shadow_prediction"]
+            )
+    return {version: comparison.snapshot() for version, comparison in comparisons.items()}
+
+
+if __name__ == "__main__":
+    #Example: how the challengers compared with production on the logged traffic
+    for version, summary in summarize_shadow_log().items():
+        summary = {key: value for key, value in summary.items() if not key.startswith(("score_bin", "champion_score", "challenger_score"))}
+        print(version, json.dumps(summary, indent=4))
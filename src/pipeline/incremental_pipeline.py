@@ -0,0 +1,248 @@
+"""
+Incremental retraining: fold new labelled batches into the production model.
+
+New batches are files dropped into data/labelled/ with the raw schema
+(including Churn). An incremental run keeps the production preprocessor,
+warm-starts the production LogisticRegression and refits it on the unseen
+batches plus a replay sample of the last full training split, then goes
+through the usual evaluation and promotion. Every `full_refit_every` runs the
+full TrainingPipeline runs instead, over the raw data and every batch.
+
+With `compare_with_full_refit`, a model is also fitted from scratch on the whole
+history. Its fit time and test metrics are logged to MLflow next to the
+incremental ones.
+"""
+#importing library
+import os
+import sys
+import json
+import time
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.utils.common import save_object, save_json, load_frame, eval_metrics
+from src.config.paths import (
+    ROOT_DIR, ARTIFACT_DIR, CANDIDATE_DIR, TRAIN_DATA_PATH, TEST_DATA_PATH, MODEL_VERSION_PATH, INCREMENTAL_STATE_PATH,
+    REFERENCE_PROFILE_PATH, CANDIDATE_REFERENCE_PROFILE_PATH
+)
+from src.config.configuration import get_section
+from src.data_ingestion import DataIngestion, list_labelled_batches, split_labelled_batches
+from src.preprocessing import DataPreprocessing
+from src.train import ModelTrainer
+from src.evaluate import ModelEval, bundle_legacy_production
+from src.monitoring.reference_profile import REFERENCE_PROFILE_FILE
+
+logger = get_logger(__name__)
+
+class IncrementalTrainingPipeline:
+    def __init__(self, full_refit_every: int = 5, replay_rows: int = 5000, max_iter: int = 200,
+                 compare_with_full_refit: bool = False, random_state: int = 42):
+        self.full_refit_every = int(full_refit_every)
+        self.replay_rows = int(replay_rows)
+        self.max_iter = int(max_iter)
+        self.compare_with_full_refit = compare_with_full_refit
+        self.random_state = random_state
+
+    @classmethod
+    def from_config(cls) -> "IncrementalTrainingPipeline":
+        incremental_config = get_section("retraining").get("incremental") or {}
+        return cls(
+            full_refit_every = incremental_config.get("full_refit_every", 5),
+            replay_rows = incremental_config.get("replay_rows", 5000),
+            max_iter = incremental_config.get("max_iter", 200),
+            compare_with_full_refit = incremental_config.get("compare_with_full_refit", False)
+        )
+
+    @staticmethod
+    def load_state() -> dict:
+        if not os.path.exists(INCREMENTAL_STATE_PATH):
+            return {"consumed": [], "runs_since_full": 0, "last_full_refit": None, "in_split": []}
+        with open(INCREMENTAL_STATE_PATH, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _name(file_path: str) -> str:
+        return os.path.relpath(file_path, ROOT_DIR)
+
+    @staticmethod
+    def has_production_model() -> bool:
+        return os.path.exists(MODEL_VERSION_PATH) or os.path.exists(os.path.join(ARTIFACT_DIR, "Churn_Model.pkl"))
+
+    @classmethod
+    def unsplit_batches(cls, state: dict, batches: list) -> list:
+        """Batches not yet in TRAIN/TEST: ingestion at the last full refit split the raw data and the batches it saw."""
+        #States written before "in_split" existed only know what was consumed
+        in_split = set(state.get("in_split", state["consumed"]))
+        return [path for path in batches if cls._name(path) not in in_split]
+
+    def run(self):
+        try:
+            state = self.load_state()
+            #The warm start and the promotion check both need production as one versioned bundle
+            bundle_legacy_production()
+            batches = list_labelled_batches()
+            new_batches = [path for path in batches if self._name(path) not in state["consumed"]]
+
+            if not self.has_production_model() or state["runs_since_full"] >= self.full_refit_every:
+                logger.info(f"Full refit due ({state['runs_since_full']} incremental runs since the last one).")
+                return self.full_refit(batches)
+
+            if not new_batches:
+                logger.info("No new labelled batches since the last retraining. Nothing to fold in.")
+                return None
+
+            metrics = self.incremental_refit(new_batches, self.unsplit_batches(state, batches))
+            if metrics is None:
+                #e.g. a tree ensemble promoted by the candidate search
+                logger.info("Production model has no coefficients to warm start from. Running a full refit.")
+                return self.full_refit(batches)
+
+            state["consumed"] += [self._name(path) for path in new_batches]
+            state["runs_since_full"] += 1
+            save_json(INCREMENTAL_STATE_PATH, state)
+            return metrics
+
+        except Exception as e:
+            logger.exception("Incremental retraining failed.")
+            raise ChurnException(e, sys)
+
+    def full_refit(self, batches: list):
+        #Imported here: the training pipeline imports the stage cache and every stage
+        from src.pipeline.training_pipeline import TrainingPipeline
+
+        metrics = TrainingPipeline().run()
+        consumed = [self._name(path) for path in batches]
+        save_json(INCREMENTAL_STATE_PATH, {
+            "consumed": consumed,
+            #Ingestion splits the raw data and these batches together
+            "in_split": consumed,
+            "runs_since_full": 0,
+            "last_full_refit": datetime.now(timezone.utc).isoformat(),
+        })
+        return metrics
+
+    def incremental_refit(self, new_batches: list, unsplit_batches: list):
+        """
+        Warm-start refit on `new_batches`. `unsplit_batches` are every batch not yet in the
+        TRAIN/TEST split (the new ones plus those folded in since the last full refit), which
+        the optional full-refit comparison adds to the training split.
+        """
+        import mlflow
+        from src.predict import load_production_objects
+
+        objects, model_version, _ = load_production_objects()
+        if not hasattr(objects["model"], "coef_"):
+            return None
+        preprocessor, le_churn = objects["preprocessor"], objects["le_churn"]
+        preprocessing = DataPreprocessing()
+        target = preprocessing.target_column
+
+        #Only the training side of each batch, as a full refit would split it: its test side stays unseen
+        ingestion = DataIngestion()
+        def batch_train_rows(batches):
+            return split_labelled_batches(batches, ingestion.test_size, ingestion.random_state)[0]
+
+        new_df = preprocessing.clean_data(batch_train_rows(new_batches))
+        history_df = preprocessing.clean_data(load_frame(TRAIN_DATA_PATH))
+        #Replaying part of the history keeps the refit from drifting towards the new batches only
+        replay_df = history_df.sample(min(self.replay_rows, len(history_df)), random_state=self.random_state)
+        train_df = pd.concat([new_df, replay_df], ignore_index=True)
+        logger.info(
+            f"Incremental retraining of model {model_version} on {len(new_df)} new rows "
+            f"from {len(new_batches)} batches + {len(replay_df)} replayed rows."
+        )
+
+        #The candidate is bundled with the preprocessor it was fitted against
+        save_object(os.path.join(CANDIDATE_DIR, "preprocessor.pkl"), preprocessor)
+        self._stage_reference_profile()
+
+        X_train = preprocessor.transform(train_df.drop(columns=target))
+        trainer = ModelTrainer()
+        start = time.perf_counter()
+        trainer.initiate_incremental_training(
+            objects["model"], le_churn, X_train, train_df[target].values, max_iter=self.max_iter
+        )
+        retrain_seconds = time.perf_counter() - start
+
+        test_df = preprocessing.clean_data(load_frame(TEST_DATA_PATH))
+        X_test = preprocessor.transform(test_df.drop(columns=target))
+        y_test = test_df[target].values
+        #Same threshold rule as a full refit, so the promotion comparison is like for like
+        _, metrics = ModelEval.from_config().initiate_eval(X_test, y_test, X_train, train_df[target].values, test_df)
+
+        comparison = {
+            "incremental_fit_seconds": trainer.fit_seconds,
+            "incremental_retrain_seconds": retrain_seconds,
+            "incremental_train_rows": len(train_df),
+            "incremental_roc_auc": metrics["ROC-AUC score"],
+            "incremental_recall": metrics["recall score"],
+        }
+        if self.compare_with_full_refit:
+            #Full history as a full refit would see it, with the same preprocessor so only the fit differs.
+            #Batches already in the split are in history_df (or the test split) and are not added twice
+            full_df = pd.concat(
+                [history_df] + ([preprocessing.clean_data(batch_train_rows(unsplit_batches))] if unsplit_batches else []),
+                ignore_index=True
+            )
+            comparison.update(self._full_refit_metrics(
+                preprocessor, le_churn, full_df, X_test, y_test, metrics["Threshold"], target
+            ))
+
+        with mlflow.start_run(run_name="incremental_retraining"):
+            mlflow.log_param("base_model_version", model_version)
+            mlflow.log_param("new_batches", len(new_batches))
+            mlflow.log_param("new_rows", len(new_df))
+            mlflow.log_param("replay_rows", len(replay_df))
+            mlflow.log_metrics(comparison)
+
+        logger.info(f"Incremental retraining vs full refit: {comparison}")
+        return metrics
+
+    @staticmethod
+    def _stage_reference_profile():
+        """Production's feature profile for the candidate: same preprocessor, same training reference."""
+        from src.predict import get_promoted_bundle_path
+
+        bundle_path = get_promoted_bundle_path()
+        source = os.path.join(bundle_path, REFERENCE_PROFILE_FILE) if bundle_path is not None else None
+        if source is None or not os.path.exists(source):
+            source = REFERENCE_PROFILE_PATH
+
+        #Never let evaluation add scores to the profile of an earlier full refit
+        if os.path.exists(CANDIDATE_REFERENCE_PROFILE_PATH):
+            os.remove(CANDIDATE_REFERENCE_PROFILE_PATH)
+        if os.path.exists(source):
+            shutil.copyfile(source, CANDIDATE_REFERENCE_PROFILE_PATH)
+
+    @staticmethod
+    def _full_refit_metrics(preprocessor, le_churn, full_df: pd.DataFrame, X_test, y_test,
+                            threshold: float, target: str) -> dict:
+        model = ModelTrainer().model
+        X_full = preprocessor.transform(full_df.drop(columns=target))
+
+        start = time.perf_counter()
+        model.fit(X_full, le_churn.transform(full_df[target].values))
+        full_seconds = time.perf_counter() - start
+
+        y_prob = model.predict_proba(X_test)[:, 1]
+        _, recall, _, _, roc_auc, _ = eval_metrics(
+            le_churn.transform(y_test), (y_prob >= threshold).astype(int), y_prob
+        )
+        return {
+            "full_fit_seconds": full_seconds,
+            "full_train_rows": len(full_df),
+            "full_roc_auc": roc_auc,
+            "full_recall": recall,
+            "full_n_iter": int(np.max(model.n_iter_)),
+        }
+
+
+if __name__ == "__main__":
+    pipeline = IncrementalTrainingPipeline.from_config()
+    print(pipeline.run())
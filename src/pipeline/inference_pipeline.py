@@ -1,29 +1,51 @@
 import os
 import sys
+import time
 import pandas as pd 
 
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
 from src.predict import ChurnPredictor
+from src.prediction_cache import PredictionCache
+from src.monitoring.drift_sketch import DriftSketchRecorder
+from src.monitoring.prediction_logger import PredictionLogger
+from src.monitoring.shadow_scorer import ShadowScorer
+from src.monitoring.serving_metrics import ServingMetrics
 
 logger = get_logger(__name__)
+#Per-request messages, sampled through the logging.sampling config
+request_logger = get_logger(f"{__name__}.requests")
 
 class InferencePipeline:
-    def __init__(self, threshold : float= 0.35):
+    def __init__(self, threshold : float= None, cache : PredictionCache = None,
+                 drift_recorder : DriftSketchRecorder = None,
+                 prediction_logger : PredictionLogger = None,
+                 shadow_scorer : ShadowScorer = None,
+                 metrics : ServingMetrics = None):
         try:
             logger.info("Initiated Inference pipeline.")
-            self.predictor =ChurnPredictor(threshold = threshold)
+            self.predictor =ChurnPredictor(threshold = threshold, cache = cache, metrics = metrics)
+            self.drift_recorder = drift_recorder
+            self.prediction_logger = prediction_logger
+            self.shadow_scorer = shadow_scorer
+            self.metrics = metrics
             logger.info("Inference Pipeline initialized successfully.")
 
         except Exception as e: 
             logger.exception("Failed to initialize inference pipeline!")
             raise ChurnException(e, sys)
 
+    def attach(self, cache: PredictionCache = None, metrics: ServingMetrics = None):
+        """Hand the shared cache and metrics to a pipeline that was built and warmed up without them."""
+        self.predictor.attach(cache=cache, metrics=metrics)
+        self.metrics = metrics
+
     def predict(self, input_data):
         try:
-            logger.info("Starting Interference.")
+            request_logger.info("Starting Interference.")
 
             #convert input to dataframe if required
+            start = time.perf_counter()
             if isinstance(input_data, dict):
                 input_df =pd.DataFrame([input_data])
 
@@ -36,17 +58,79 @@ class InferencePipeline:
             else:
                 raise ValueError("Invalid input type for predictions.")
 
-            logger.info(f"Inference input shape: {input_df.shape}")
+            if self.metrics is not None and input_df is not input_data:
+                self.metrics.observe_stage("dataframe", time.perf_counter() - start)
+
+            #Lazy %-formatting: the shape is only rendered for records that are kept, in the listener thread
+            request_logger.info("Inference input shape: %s", input_df.shape)
 
             result = self.predictor.predict(input_df)
+            self.monitor(input_df, result["churn_probability"].to_numpy(), result["churn_prediction"].to_numpy())
 
-            logger.info("Inference completed successfully")
+            request_logger.info("Inference completed successfully")
             return result
 
         except Exception as e:
             logger.exception("Inference failed")
             raise ChurnException(e, sys)
 
+    def predict_record(self, record: dict, monitor_queue=None) -> dict:
+        """
+        Single-row inference returning a plain dict with probability and label.
+
+        With a `monitor_queue` (compiled scoring on the event loop), only the model
+        arithmetic runs here: the cache is skipped, and the drift, shadow and log
+        bookkeeping is queued for a background thread.
+        """
+        try:
+            if monitor_queue is None:
+                result = self.predictor.predict_record(record)
+                self.monitor(record, result["churn_probability"], result["churn_prediction"])
+                return result
+
+            result = self.predictor.predict_record(record, use_cache=False)
+            if self.has_monitors:
+                monitor_queue.submit(self, record, result["churn_probability"], result["churn_prediction"])
+            return result
+
+        except Exception as e:
+            logger.exception("Inference failed")
+            raise ChurnException(e, sys)
+
+    @property
+    def has_monitors(self) -> bool:
+        return any(c is not None for c in (self.drift_recorder, self.shadow_scorer, self.prediction_logger))
+
+    def monitor(self, input_data, probabilities, labels):
+        #Monitoring bookkeeping must never fail a prediction
+        is_record = isinstance(input_data, dict)
+        if self.drift_recorder is not None:
+            try:
+                if is_record:
+                    self.drift_recorder.update_record(input_data, probabilities)
+                else:
+                    self.drift_recorder.update(input_data, probabilities)
+            except Exception:
+                logger.exception("Failed to update drift sketch.")
+
+        #Rows taken for shadow scoring are logged by the shadow scorer, with both models' scores
+        if self.shadow_scorer is not None:
+            try:
+                if self.shadow_scorer.submit(input_data, probabilities, labels, self.predictor.model_version):
+                    return
+            except Exception:
+                logger.exception("Failed to queue rows for shadow scoring.")
+
+        if self.prediction_logger is not None:
+            try:
+                model_version = self.predictor.model_version
+                if is_record:
+                    self.prediction_logger.log_record(input_data, probabilities, labels, model_version)
+                else:
+                    self.prediction_logger.log(input_data, probabilities, labels, model_version)
+            except Exception:
+                logger.exception("Failed to log predictions.")
+
 if __name__ == "__main__":
     #Example 
     sample_input = {
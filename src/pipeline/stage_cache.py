@@ -0,0 +1,131 @@
+"""
+Content-hash cache for the training pipeline stages.
+
+Every stage declares its inputs (data files, the config it reads, the source
+files of its code) and the files it writes. After a stage runs, a manifest is
+saved under data/artifacts/stage_cache/<stage>.json:
+
+    key            sha256 over the input file hashes, config and code hashes
+    inputs         the individual hashes, to log what changed on a miss
+    outputs        sha256 of every output file as it was written
+    shared_outputs files the stage writes that later stages amend (only checked to exist)
+    seconds        how long the stage took, reported as time saved on a hit
+
+A stage is a hit when its key is unchanged and its outputs are still on disk
+with the recorded hashes.
+"""
+#importing library
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.utils.common import get_file_hash, save_json
+from src.config.paths import ROOT_DIR, STAGE_CACHE_DIR
+
+logger = get_logger(__name__)
+
+
+def hash_config(config) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    def __init__(self, cache_dir: str = STAGE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _manifest_path(self, stage: str) -> str:
+        return os.path.join(self.cache_dir, f"{stage}.json")
+
+    @staticmethod
+    def _relative(file_path: str) -> str:
+        return os.path.relpath(file_path, ROOT_DIR)
+
+    def fingerprint(self, input_files: List[str], config: Dict, code_files: List[str]) -> Dict:
+        """Hashes of everything a stage depends on; `key` combines them."""
+        inputs = {
+            "data": {self._relative(path): get_file_hash(path) for path in input_files},
+            "config": hash_config(config),
+            "code": {self._relative(path): get_file_hash(path) for path in code_files},
+        }
+        return {"key": hash_config(inputs), "inputs": inputs}
+
+    def load_manifest(self, stage: str) -> Optional[Dict]:
+        manifest_path = self._manifest_path(stage)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    def lookup(self, stage: str, fingerprint: Dict) -> Optional[Dict]:
+        """The stage's manifest when its cached outputs are still valid for `fingerprint`, else None."""
+        manifest = self.load_manifest(stage)
+        if manifest is None:
+            logger.info(f"Stage cache miss for {stage}: no manifest.")
+            return None
+
+        if manifest["key"] != fingerprint["key"]:
+            changed = [
+                f"{kind}:{name}"
+                for kind in ("data", "code")
+                for name, digest in fingerprint["inputs"][kind].items()
+                if manifest["inputs"][kind].get(name) != digest
+            ]
+            if manifest["inputs"]["config"] != fingerprint["inputs"]["config"]:
+                changed.append("config")
+            logger.info(f"Stage cache miss for {stage}: inputs changed {changed}")
+            return None
+
+        for name, digest in manifest["outputs"].items():
+            path = os.path.join(ROOT_DIR, name)
+            if not os.path.exists(path) or get_file_hash(path) != digest:
+                logger.info(f"Stage cache miss for {stage}: output {name} is missing or was modified.")
+                return None
+
+        for name in manifest.get("shared_outputs", []):
+            if not os.path.exists(os.path.join(ROOT_DIR, name)):
+                logger.info(f"Stage cache miss for {stage}: output {name} is missing.")
+                return None
+
+        return manifest
+
+    def save(self, stage: str, fingerprint: Dict, outputs: List[str], seconds: float,
+             shared_outputs: List[str] = ()) -> Dict:
+        try:
+            manifest = {
+                "stage": stage,
+                "key": fingerprint["key"],
+                "inputs": fingerprint["inputs"],
+                "outputs": {self._relative(path): get_file_hash(path) for path in outputs},
+                "shared_outputs": [self._relative(path) for path in shared_outputs],
+                "seconds": seconds,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            save_json(self._manifest_path(stage), manifest)
+            return manifest
+
+        except Exception as e:
+            logger.exception(f"Failed to save stage cache manifest for {stage}.")
+            raise ChurnException(e, sys)
+
+    def clear(self, stage: str = None):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json") and (stage is None or name == f"{stage}.json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+if __name__ == "__main__":
+    cache = StageCache()
+    for stage in ("ingestion", "preprocessing", "training", "evaluation"):
+        manifest = cache.load_manifest(stage)
+        if manifest is None:
+            print(f"{stage}: not cached")
+        else:
+            print(f"{stage}: {manifest['key'][:12]} ({manifest['seconds']:.2f}s, {manifest['created_at']})")
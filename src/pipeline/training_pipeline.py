@@ -1,50 +1,186 @@
 #importing library
 import os
 import sys
+import json
+import time
+import argparse
 
 #importing requirements
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
+from src.config.paths import (
+    ROOT_DIR, RAW_DATA_PATH, TRAIN_DATA_PATH, TEST_DATA_PATH, ARTIFACT_DIR, CANDIDATE_DIR, MODEL_VERSION_PATH,
+    CANDIDATE_REFERENCE_PROFILE_PATH, CANDIDATE_CONFIDENCE_BASELINE_PATH
+)
+from src.config.configuration import get_section
 
-from src.data_ingestion import DataIngestion
+from src.data_ingestion import DataIngestion, list_labelled_batches
 from src.preprocessing import DataPreprocessing
 from src.train import ModelTrainer
-from src.evaluate import ModelEval
+from src.evaluate import ModelEval, bundle_legacy_production
+from src.pipeline.stage_cache import StageCache
 
 logger =get_logger(__name__)
 
+STAGES = ("ingestion", "preprocessing", "training", "evaluation")
+
+def _source(*modules: str) -> list:
+    return [os.path.join(ROOT_DIR, "src", *module.split("/")) for module in modules]
+
 class TrainingPipeline:
+    def __init__(self, use_cache: bool = True, force_from: str = None, threshold: float = None):
+        if force_from is not None and force_from not in STAGES:
+            raise ValueError(f"Unknown stage {force_from!r}, expected one of {STAGES}")
+        self.use_cache = use_cache
+        self.force_from = force_from
+        #None: the evaluation config decides (a fixed value or selection by recall target)
+        self.threshold = threshold
+        self.cache = StageCache()
+        self.stage_report = {}
+        self._upstream_ran = False
+
+    def _run_stage(self, stage: str, fn, input_files: list, config: dict, code_files: list,
+                   outputs: list, shared_outputs: list = (), state_files: list = ()):
+        """
+        Runs `fn` unless the stage's cached outputs are still valid; returns (hit, result).
+
+        `state_files` are inputs the stage may itself rewrite (e.g. the production marker on a
+        promotion). Absent ones are left out, and they are hashed again after the stage runs,
+        so the cache entry matches the state the stage left behind.
+        """
+        def fingerprint_now():
+            present = [path for path in state_files if os.path.exists(path)]
+            return self.cache.fingerprint(list(input_files) + present, config, code_files)
+
+        fingerprint = fingerprint_now()
+        forced = self.force_from is not None and STAGES.index(stage) >= STAGES.index(self.force_from)
+
+        #Once a stage has run, everything downstream runs too: it may amend files the cache does not hash
+        if self.use_cache and not forced and not self._upstream_ran:
+            manifest = self.cache.lookup(stage, fingerprint)
+            if manifest is not None:
+                logger.info(f"Stage cache hit for {stage}: skipped, {manifest['seconds']:.2f}s saved.")
+                self.stage_report[stage] = {"status": "hit", "seconds": 0.0, "seconds_saved": manifest["seconds"]}
+                return True, None
+
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+
+        if state_files:
+            fingerprint = fingerprint_now()
+        self.cache.save(stage, fingerprint, outputs, seconds, shared_outputs)
+        self._upstream_ran = True
+        self.stage_report[stage] = {"status": "forced" if forced else "miss", "seconds": seconds, "seconds_saved": 0.0}
+        logger.info(f"Stage {stage} ran in {seconds:.2f}s.")
+        return False, result
+
     def run(self):
         try:
             logger.info("Training Pipeline initiated.")
+            self.stage_report = {}
+            self._upstream_ran = False
+
+            #The candidate stages below never touch what is served; freeze a pre-bundle production model first
+            bundle_legacy_production()
 
             # 1. DataIngestion
             ingestion =DataIngestion()
-            train_path, test_path =ingestion.initiate_data_ingestion()
+            self._run_stage(
+                "ingestion", ingestion.initiate_data_ingestion,
+                input_files = [RAW_DATA_PATH] + list_labelled_batches(ingestion.labelled_dir),
+                config = {"test_size": ingestion.test_size, "random_state": ingestion.random_state},
+                code_files = _source("data_ingestion.py", "utils/common.py"),
+                outputs = [TRAIN_DATA_PATH, TEST_DATA_PATH]
+            )
 
-            logger.info(f"Train Data path : {train_path}")
-            logger.info(f"Test file path : {test_path}")
+            logger.info(f"Train Data path : {TRAIN_DATA_PATH}")
+            logger.info(f"Test file path : {TEST_DATA_PATH}")
 
             #2. Data Preprocessing
-            preprocessor = DataPreprocessing()
-            X_train, X_test, y_train, y_test , preprocessor_path = preprocessor.initiate_preprocessing()
-
+            #The splits are handed over in memory when ingestion ran, read from parquet otherwise
+            preprocessor = DataPreprocessing.from_config()
+            drift_config = get_section("drift")
+            preprocessor_path = os.path.join(CANDIDATE_DIR, "preprocessor.pkl")
+            _, transformed = self._run_stage(
+                "preprocessing", lambda: preprocessor.initiate_preprocessing(*ingestion.release_frames()),
+                input_files = [TRAIN_DATA_PATH, TEST_DATA_PATH],
+                config = {
+                    "target_column": preprocessor.target_column,
+                    "matrix_mode": preprocessor.matrix_mode,
+                    "n_bins": (drift_config.get("sketch") or {}).get("n_bins", 20),
+                    "segments": (drift_config.get("segments") or {}).get("columns"),
+                },
+                code_files = _source(
+                    "preprocessing.py", "monitoring/reference_profile.py", "monitoring/drift_sketch.py", "utils/common.py"
+                ),
+                outputs = [preprocessor_path],
+                shared_outputs = [CANDIDATE_REFERENCE_PROFILE_PATH]
+            )
+
+            def splits():
+                #Cached preprocessing: rebuild the matrices only if a later stage needs them
+                nonlocal transformed
+                if transformed is None:
+                    transformed = preprocessor.load_transformed(*ingestion.release_frames())
+                return transformed
+
+            model_path = os.path.join(CANDIDATE_DIR, "Churn_Model.pkl")
+            le_path = os.path.join(CANDIDATE_DIR, "le_churn.pkl")
             logger.info(f"preprocessor object save at {preprocessor_path}")
 
             #3. Model training
             trainer = ModelTrainer()
-            model_path, le_path = trainer.initiate_training(X_train, y_train)
+            self._run_stage(
+                "training", lambda: trainer.initiate_training(splits()[0], splits()[2]),
+                input_files = [TRAIN_DATA_PATH, preprocessor_path],
+                config = {"model": trainer.model.get_params(), "search": get_section("training").get("search")},
+                code_files = _source("train.py", "model_search.py", "preprocessing.py", "utils/common.py"),
+                outputs = [model_path, le_path]
+            )
 
             logger.info(f"Model saved at {model_path}")
             logger.info(f"label encoder saved at path {le_path}")
 
             # 4. Model evaluation
-            evaluator = ModelEval(threshold=0.35)
-            metrics_path , metrics = evaluator.initiate_eval(X_test, y_test)
+            evaluator = ModelEval.from_config(threshold=self.threshold)
+            metrics_path = os.path.join(ARTIFACT_DIR, "metrics.json")
+            production_metrics_path = os.path.join(ARTIFACT_DIR, "production_metrics.json")
+            hit, evaluation = self._run_stage(
+                "evaluation", lambda: evaluator.initiate_eval(splits()[1], splits()[3], splits()[0], splits()[2]),
+                input_files = [TRAIN_DATA_PATH, TEST_DATA_PATH, preprocessor_path, model_path, le_path],
+                config = {
+                    "threshold": evaluator.threshold,
+                    "recall_target": evaluator.recall_target,
+                    "cv_folds": evaluator.cv_folds,
+                    "n_resamples": evaluator.n_resamples,
+                    "ci_level": evaluator.ci_level,
+                },
+                code_files = _source(
+                    "evaluate.py", "utils/metrics.py", "utils/common.py", "utils/model_bundle.py",
+                    "compiled_scorer.py", "preprocessing.py", "monitoring/reference_profile.py"
+                ),
+                outputs = [metrics_path],
+                shared_outputs = [
+                    production_metrics_path,
+                    CANDIDATE_REFERENCE_PROFILE_PATH,
+                    CANDIDATE_CONFIDENCE_BASELINE_PATH,
+                ],
+                #The promotion decision is against production: a new production model re-runs it.
+                #The marker names the promoted bundle, whose files are checksummed and never change
+                state_files = [MODEL_VERSION_PATH, production_metrics_path]
+            )
+            if hit:
+                with open(metrics_path, "r") as f:
+                    metrics = json.load(f)
+            else:
+                metrics_path, metrics = evaluation
 
             logger.info(f"Metrics saved at: {metrics_path}")
             logger.info(f"Evaluation metrics: {metrics}")
 
+            self._log_stage_report()
+
             logger.info("="* 85)
             logger.info(f"Training pipeline completed successfully.")
             logger.info("="* 85)
@@ -55,6 +191,29 @@ class TrainingPipeline:
             logger.exception("Failed to run pipeline!")
             raise ChurnException(e, sys)
 
+    def _log_stage_report(self):
+        import mlflow
+
+        hits = [stage for stage, report in self.stage_report.items() if report["status"] == "hit"]
+        seconds_saved = sum(report["seconds_saved"] for report in self.stage_report.values())
+        logger.info(
+            f"Stage cache: {len(hits)}/{len(self.stage_report)} stages reused {hits}, {seconds_saved:.2f}s saved."
+        )
+
+        with mlflow.start_run(run_name="training_pipeline_stages"):
+            mlflow.log_param("force_from", self.force_from)
+            mlflow.log_param("use_cache", self.use_cache)
+            mlflow.log_params({f"stage_{stage}": report["status"] for stage, report in self.stage_report.items()})
+            mlflow.log_metric("cache_hits", len(hits))
+            mlflow.log_metric("time_saved_seconds", seconds_saved)
+            for stage, report in self.stage_report.items():
+                mlflow.log_metric(f"{stage}_seconds", report["seconds"])
+
 if __name__ == "__main__":
-    pipeline = TrainingPipeline()
-    pipeline.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the training pipeline, reusing cached stages.")
+    parser.add_argument("--force-from", choices=STAGES, help="re-run this stage and every stage after it")
+    parser.add_argument("--no-cache", action="store_true", help="run every stage")
+    args = parser.parse_args()
+
+    pipeline = TrainingPipeline(use_cache=not args.no_cache, force_from=args.force_from)
+    pipeline.run()
@@ -1,64 +1,277 @@
 #Importing library
 import os
 import sys
+import json
+import time
+import threading
 import pandas as pd
 import numpy as np
 
 #importing dependencies
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
-from src.utils.common import load_object
-from src.config.paths import ARTIFACT_DIR, RAW_DATA_DIR
+from src.utils.common import load_object, get_artifact_version
+from src.utils.model_bundle import load_bundle, read_manifest
+from src.compiled_scorer import CompiledLinearScorer, compile_linear_scorer
+from src.prediction_cache import PredictionCache
+from src.monitoring.serving_metrics import ServingMetrics
+from src.config.paths import ARTIFACT_DIR, RAW_DATA_DIR, MODEL_VERSION_PATH
 
 logger = get_logger(__name__)
+#Per-request messages, sampled through the logging.sampling config
+request_logger = get_logger(f"{__name__}.requests")
+
+DEFAULT_THRESHOLD = 0.35
+
+
+def get_promoted_bundle_path(marker_path: str = MODEL_VERSION_PATH):
+    """Bundle directory named by the promotion marker, or None when only loose pickles exist."""
+    if not os.path.exists(marker_path):
+        return None
+    with open(marker_path, "r") as f:
+        bundle = json.load(f).get("bundle")
+    if bundle is None:
+        return None
+    bundle_path = os.path.join(ARTIFACT_DIR, bundle)
+    return bundle_path if os.path.isdir(bundle_path) else None
+
+
+def load_production_objects(bundle_path: str = None):
+    """
+    (objects, model_version, threshold) of the production model, objects keyed preprocessor/model/le_churn.
+    With `bundle_path`, that bundle is loaded instead (e.g. the shadow challenger).
+    """
+    if bundle_path is None:
+        bundle_path = get_promoted_bundle_path()
+
+    if bundle_path is not None:
+        #Promoted bundle: one atomic, checksummed load of a single model version
+        objects, manifest = load_bundle(bundle_path)
+        return objects, manifest["model_version"], manifest.get("threshold", DEFAULT_THRESHOLD)
+
+    #Legacy layout: loose pickles written by the training run
+    preprocessor_path = os.path.join(ARTIFACT_DIR, "preprocessor.pkl")
+    model_path = os.path.join(ARTIFACT_DIR, "Churn_Model.pkl")
+    le_churn_path  = os.path.join(ARTIFACT_DIR, "le_churn.pkl")
+
+    objects = {
+        "preprocessor": load_object(preprocessor_path),
+        "model": load_object(model_path),
+        "le_churn": load_object(le_churn_path),
+    }
+    return objects, get_artifact_version([preprocessor_path, model_path, le_churn_path]), DEFAULT_THRESHOLD
+
 
 class ChurnPredictor:
-    def __init__(self, threshold: float =0.35):   
-        self.threshold = threshold
+    """
+    Scores requests with the production model (or the bundle at `bundle_path`).
+
+    A bundle frozen with a compiled scorer is served from its manifest alone:
+    the pickled scikit-learn objects, and scikit-learn itself, are only loaded
+    the first time `preprocessor`, `model` or `le_churn` is used.
+    """
+
+    def __init__(self, threshold: float = None, use_compiled: bool = True, cache: PredictionCache = None,
+                 bundle_path: str = None, metrics: ServingMetrics = None):   
+        self.cache = cache
+        #ServingMetrics receiving per-stage latencies (None outside the API)
+        self.metrics = metrics
+        self._objects = None
+        self._objects_lock = threading.Lock()
         try:
             logger.info("Loading prediction artifacts")
-            preprocessor_path = os.path.join(ARTIFACT_DIR, "preprocessor.pkl")
-            model_path = os.path.join(ARTIFACT_DIR, "Churn_Model.pkl")
-            le_churn_path  = os.path.join(ARTIFACT_DIR, "le_churn.pkl")
+            if bundle_path is None:
+                bundle_path = get_promoted_bundle_path()
+            self._bundle_path = bundle_path
+            manifest = read_manifest(bundle_path) if bundle_path is not None else {}
+
+            #Fast path for linear models, None means the sklearn path is used
+            self.compiled_scorer = None
+            if use_compiled and manifest.get("compiled_scorer"):
+                self.compiled_scorer = CompiledLinearScorer.from_dict(manifest["compiled_scorer"])
+                self.model_version = manifest["model_version"]
+                default_threshold = manifest.get("threshold", DEFAULT_THRESHOLD)
+                self.labels = np.asarray(manifest["labels"])
+                self.feature_columns = list(manifest["features"]["order"])
+            else:
+                self._objects, self.model_version, default_threshold = load_production_objects(bundle_path)
+                self.labels = np.asarray(self.le_churn.classes_)
+                self.feature_columns = list(self.preprocessor.feature_names_in_)
+                if use_compiled:
+                    self.compiled_scorer = compile_linear_scorer(self.preprocessor, self.model)
 
-            self.preprocessor= load_object(preprocessor_path)
-            self.model = load_object(model_path)
-            self.le_churn = load_object(le_churn_path)
+            self.threshold = threshold if threshold is not None else default_threshold
+            logger.info(f"All artifacts loaded succesfully (model version {self.model_version}).")
 
-            logger.info("All artifacts loaded succesfully.")
+            if self.cache is not None:
+                self.cache.bind_model_version(self.model_version)
 
         except Exception as e :
             logger.exception("Failed to load prediction artifacts.")
             raise ChurnException(e, sys)
 
+    def attach(self, cache: PredictionCache = None, metrics: ServingMetrics = None):
+        """Start using the shared serving cache and metrics, e.g. once a hot-reloaded model is published."""
+        self.metrics = metrics
+        self.cache = cache
+        if cache is not None:
+            cache.bind_model_version(self.model_version)
+
+    def _load_objects(self) -> dict:
+        if self._objects is None:
+            with self._objects_lock:
+                if self._objects is None:
+                    logger.info(f"Loading the scikit-learn objects of model {self.model_version}.")
+                    self._objects, _, _ = load_production_objects(self._bundle_path)
+        return self._objects
+
+    @property
+    def preprocessor(self):
+        return self._load_objects()["preprocessor"]
+
+    @property
+    def model(self):
+        return self._load_objects()["model"]
+
+    @property
+    def le_churn(self):
+        return self._load_objects()["le_churn"]
+
     def predict(self, input_df: pd.DataFrame) -> pd.DataFrame:
         try: 
-            logger.info("Starting prediction Successfully.")
-
-            #transform the input
-            X_preprocessed= self.preprocessor.transform(input_df)
+            request_logger.info("Starting prediction Successfully.")
 
             #predict probability
-            prob = self.model.predict_proba(X_preprocessed)[:, 1]
-
-            #Applying threshold
-            churn_pred_numeric = (prob >=self.threshold).astype(int)
+            prob = self.predict_proba(input_df)
 
-            #Convert numeric prediction back to label
-            churn_pred_label = self.le_churn.inverse_transform(churn_pred_numeric)
+            #Applying threshold and converting numeric prediction back to label
+            start = time.perf_counter()
+            churn_pred_label = self.labels[(prob >=self.threshold).astype(int)]
+            if self.metrics is not None:
+                self.metrics.observe_stage("inverse_transform", time.perf_counter() - start)
 
             #Final output
             result = input_df.copy()
             result["churn_probability"] = prob
             result["churn_prediction"] = churn_pred_label
 
-            logger.info("Prediction Completed successfully.")
+            request_logger.info("Prediction Completed successfully.")
             return result
 
         except Exception as e:
             logger.exception("Failed to predict output.")
             raise ChurnException(e, sys)
 
+    def predict_proba(self, input_df: pd.DataFrame) -> np.ndarray:
+        if self.cache is None:
+            return self._score(input_df)
+
+        #Only rows missing from the cache are sent to the model
+        keys = self.cache.make_keys(
+            input_df[self.feature_columns].itertuples(index=False, name=None), self.model_version
+        )
+        cached = self.cache.get_many(keys)
+        prob = np.array([np.nan if value is None else value for value in cached], dtype=np.float64)
+
+        #Repeated profiles inside one batch are scored once
+        first_miss = {}
+        for i, value in enumerate(cached):
+            if value is None:
+                first_miss.setdefault(keys[i], i)
+
+        if first_miss:
+            miss_prob = self._score(input_df.iloc[list(first_miss.values())])
+            self.cache.put_many(list(first_miss), miss_prob)
+            scored = dict(zip(first_miss, miss_prob))
+            for i, value in enumerate(cached):
+                if value is None:
+                    prob[i] = scored[keys[i]]
+        return prob
+
+    def _score(self, input_df: pd.DataFrame) -> np.ndarray:
+        if self.metrics is not None:
+            return self._score_timed(input_df)
+        if self.compiled_scorer is not None:
+            return self.compiled_scorer.predict_proba(input_df)
+
+        #transform the input
+        X_preprocessed= self.preprocessor.transform(input_df)
+        return self.model.predict_proba(X_preprocessed)[:, 1]
+
+    def _score_timed(self, input_df: pd.DataFrame) -> np.ndarray:
+        """`_score` with each stage's latency recorded; kept apart so the untimed path stays as it was."""
+        start = time.perf_counter()
+        if self.compiled_scorer is not None:
+            prob = self.compiled_scorer.predict_proba(input_df)
+            self.metrics.observe_stage("compiled_score", time.perf_counter() - start)
+            return prob
+
+        X_preprocessed = self.preprocessor.transform(input_df)
+        transformed = time.perf_counter()
+        prob = self.model.predict_proba(X_preprocessed)[:, 1]
+        self.metrics.observe_stage("transform", transformed - start)
+        self.metrics.observe_stage("predict_proba", time.perf_counter() - transformed)
+        return prob
+
+    def warm_up(self) -> float:
+        """Score one synthetic row through every path so the first real request is not slow."""
+        record = {col: 0 for col in self.feature_columns}
+        if self.compiled_scorer is not None:
+            #Typical values from the compiled tables, so warming up does not load scikit-learn
+            record.update(zip(self.compiled_scorer.numeric_columns, self.compiled_scorer.numeric_center.tolist()))
+            record.update({col: next(iter(table)) for col, table in self.compiled_scorer.categorical_tables.items()})
+        else:
+            for _, transformer, columns in self.preprocessor.transformers_:
+                if hasattr(transformer, "categories_"):
+                    record.update({col: cats[0] for col, cats in zip(columns, transformer.categories_)})
+                elif getattr(transformer, "mean_", None) is not None:
+                    record.update(dict(zip(columns, transformer.mean_.tolist())))
+
+        self.predict(pd.DataFrame([record]))
+        return self.predict_record(record)["churn_probability"]
+
+    def predict_record(self, record: dict, use_cache: bool = True) -> dict:
+        """
+        Score a single request dict, skipping DataFrame construction when the model is compiled.
+        `use_cache=False` skips the cache lock and key hashing, e.g. for compiled scoring on the event loop.
+        """
+        try:
+            prob, key = None, None
+            if use_cache and self.cache is not None:
+                key = self.cache.make_key([record[col] for col in self.feature_columns], self.model_version)
+                prob = self.cache.get_many([key])[0]
+
+            metrics = self.metrics
+            if prob is None:
+                start = time.perf_counter()
+                if self.compiled_scorer is not None:
+                    prob = self.compiled_scorer.predict_proba_record(record)
+                    if metrics is not None:
+                        metrics.observe_stage("compiled_score", time.perf_counter() - start)
+                else:
+                    input_df = pd.DataFrame([record])
+                    if metrics is not None:
+                        metrics.observe_stage("dataframe", time.perf_counter() - start)
+                    prob = float(self._score(input_df)[0])
+                if key is not None:
+                    self.cache.put_many([key], [prob])
+
+            if metrics is None:
+                label = str(self.labels[int(prob >= self.threshold)])
+            else:
+                start = time.perf_counter()
+                label = str(self.labels[int(prob >= self.threshold)])
+                metrics.observe_stage("inverse_transform", time.perf_counter() - start)
+
+            return {
+                "churn_probability": prob,
+                "churn_prediction": label
+            }
+
+        except Exception as e:
+            logger.exception("Failed to predict output.")
+            raise ChurnException(e, sys)
+
 if __name__ =="__main__":
 
     #Example
@@ -0,0 +1,119 @@
+#importing library
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from numbers import Number
+from typing import Dict, Iterable, List, Optional, Sequence
+
+#importing requirements
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _normalize(value):
+    #12, 12.0 and numpy scalars hash the same. Strings are kept as they are: the model
+    #does not strip categories, so " Yes" and "Yes" can score differently
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Number):
+        return float(value)
+    return str(value)
+
+
+class PredictionCache:
+    """
+    Bounded LRU + TTL cache of churn probabilities.
+
+    Keys are a hash of the normalized model input features plus the model version,
+    so a profile scored by one model version is never served for another. Binding a
+    new model version (a promoted retrain being loaded) clears every entry.
+    """
+
+    def __init__(self, max_size: int = 100000, ttl_seconds: float = 600.0):
+        self.max_size = int(max_size)
+        self.ttl_seconds = float(ttl_seconds)
+        self.model_version = None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(values: Sequence, model_version: str) -> str:
+        """Canonical key for one row of feature values given in a fixed feature order."""
+        canonical = repr(tuple(_normalize(v) for v in values)) + "|" + str(model_version)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def make_keys(self, rows: Iterable[Sequence], model_version: str) -> List[str]:
+        return [self.make_key(values, model_version) for values in rows]
+
+    def bind_model_version(self, model_version: str):
+        """Attach the cache to a model version, dropping entries from any previous one."""
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            if self.model_version is not None:
+                self.invalidations += 1
+                logger.info(
+                    f"Model version changed {self.model_version} -> {model_version}. "
+                    f"Invalidating {len(self._entries)} cached predictions."
+                )
+            self._entries.clear()
+            self.model_version = model_version
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[float]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    values.append(None)
+                elif entry[0] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    self.misses += 1
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    values.append(entry[1])
+        return values
+
+    def put_many(self, keys: Sequence[str], values: Sequence[float]):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (expires_at, float(value))
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model_version": self.model_version,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -12,14 +12,49 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 #importing requirements
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
-from src.utils.common import save_object
-from src.config.paths import PROCESSED_DATA_DIR, ARTIFACT_DIR
+from src.utils.common import save_object, load_object, load_frame
+from src.config.paths import TRAIN_DATA_PATH, TEST_DATA_PATH, CANDIDATE_DIR, CANDIDATE_REFERENCE_PROFILE_PATH
+from src.config.configuration import get_section
+from src.monitoring.reference_profile import save_reference_profile
 
 logger = get_logger(__name__)
 
+MATRIX_MODES = ("dense", "compact")
+
+
+class Float32StandardScaler(StandardScaler):
+    """StandardScaler with float32 output, so the scaled block does not upcast a float32 sparse matrix."""
+    output_dtype = np.float32
+
+    def transform(self, X, copy=None):
+        #Cast the input rather than the output: centring and scaling then run in place on a
+        #float32 copy, with no float64 block in between. The copy is ours to modify.
+        X = X.astype(np.float32) if hasattr(X, "astype") else np.asarray(X, dtype=np.float32)
+        return super().transform(X, copy=False)
+
+
+def describe_matrix(X) -> str:
+    nbytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes if hasattr(X, "indptr") else X.nbytes
+    kind = type(X).__name__
+    return f"{kind} {X.shape} {X.dtype} {nbytes / 1e6:.1f}MB"
+
+
 class DataPreprocessing:
-    def __init__(self, target_column : str = "Churn"):
+    def __init__(self, target_column : str = "Churn", matrix_mode: str = "dense"):
+        if matrix_mode not in MATRIX_MODES:
+            raise ValueError(f"Unknown matrix mode {matrix_mode!r}, expected one of {MATRIX_MODES}")
         self.target_column= target_column
+        #dense: sklearn defaults (float64, dense unless the one-hot block is very sparse)
+        #compact: float32, one-hot block kept sparse through training and scoring
+        self.matrix_mode = matrix_mode
+
+    @classmethod
+    def from_config(cls) -> "DataPreprocessing":
+        preprocessing_config = get_section("preprocessing") or {}
+        return cls(
+            target_column = get_section("data").get("target_column", "Churn"),
+            matrix_mode = preprocessing_config.get("matrix_mode", "dense")
+        )
 
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
@@ -30,8 +65,9 @@ class DataPreprocessing:
             df = df.drop(columns =drop_list, errors="ignore")
             
             # Removing null values from TotalCharges
-            #First of all in order to drop " " , we need to replace it with np.nan
-            df["TotalCharges"] = df["TotalCharges"].replace(" ", np.nan)
+            #Splits from ingestion are already float; raw inputs still carry " " for blanks
+            if not pd.api.types.is_float_dtype(df["TotalCharges"]):
+                df["TotalCharges"] = df["TotalCharges"].replace(" ", np.nan)
             df = df.dropna(subset=["TotalCharges"])
             df["TotalCharges"] = df["TotalCharges"].astype(float)
 
@@ -52,12 +88,22 @@ class DataPreprocessing:
             logger.info(f"Categorical Column : {list(categorical_column)}")
             logger.info(f"Numerical Column : {list(numerical_column)}")
 
-            preprocessor = ColumnTransformer(
-                [
-                    ("scaler", StandardScaler(), numerical_column),
-                    ("oh_encoder", OneHotEncoder(handle_unknown="ignore"), categorical_column)
-                ]
-            )
+            if self.matrix_mode == "compact":
+                #Always sparse: the one-hot block is mostly zeros, and float32 halves what is left
+                preprocessor = ColumnTransformer(
+                    [
+                        ("scaler", Float32StandardScaler(), numerical_column),
+                        ("oh_encoder", OneHotEncoder(handle_unknown="ignore", dtype=np.float32), categorical_column)
+                    ],
+                    sparse_threshold=1.0
+                )
+            else:
+                preprocessor = ColumnTransformer(
+                    [
+                        ("scaler", StandardScaler(), numerical_column),
+                        ("oh_encoder", OneHotEncoder(handle_unknown="ignore"), categorical_column)
+                    ]
+                )
             
             return preprocessor
 
@@ -65,36 +111,46 @@ class DataPreprocessing:
             logger.exception("Failed to preprocess data!")
             raise ChurnException(e, sys)
 
-    def initiate_preprocessing(self):
+    def initiate_preprocessing(self, train_df: pd.DataFrame = None, test_df: pd.DataFrame = None):
         try:
             logger.info("Preprocessing Started")
 
-            train_path = os.path.join(PROCESSED_DATA_DIR, "train.csv")
-            test_path = os.path.join(PROCESSED_DATA_DIR, "test.csv")
-
-            #loading dataset
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            #loading dataset, unless the splits were passed in memory by the training pipeline
+            if train_df is None:
+                train_df = load_frame(TRAIN_DATA_PATH)
+            if test_df is None:
+                test_df = load_frame(TEST_DATA_PATH)
 
-            #Cleaning data
+            #Each frame is released as soon as its matrix is built, so raw and transformed copies do not pile up
             train_df = self.clean_data(train_df)
-            test_df = self.clean_data(test_df)
-
             X_train = train_df.drop(columns=self.target_column)
-            y_train = train_df[self.target_column]
+            y_train = train_df[self.target_column].values
+            del train_df
 
-            X_test = test_df.drop(columns=self.target_column)
-            y_test = test_df[self.target_column]
+            #Reference profile that drift checks and inference-time sketches are compared against
+            drift_config = get_section("drift")
+            n_bins = (drift_config.get("sketch") or {}).get("n_bins", 20)
+            segments = (drift_config.get("segments") or {}).get("columns")
+            save_reference_profile(X_train, n_bins=n_bins, segments=segments, file_path=CANDIDATE_REFERENCE_PROFILE_PATH)
 
             preprocessor = self.get_preprocessor(X_train)
 
             logger.info("Fitting preprocessor on training data")
             X_train_transformed = preprocessor.fit_transform(X_train)
+            del X_train
 
             logger.info("Fitting preprocessor on testing data")
-            X_test_transformed = preprocessor.transform(X_test)
+            test_df = self.clean_data(test_df)
+            X_test_transformed = preprocessor.transform(test_df.drop(columns=self.target_column))
+            y_test = test_df[self.target_column].values
+            del test_df
+
+            logger.info(
+                f"Transformed matrices ({self.matrix_mode}): train {describe_matrix(X_train_transformed)}, "
+                f"test {describe_matrix(X_test_transformed)}"
+            )
 
-            preprocessor_path = os.path.join(ARTIFACT_DIR, "preprocessor.pkl")
+            preprocessor_path = os.path.join(CANDIDATE_DIR, "preprocessor.pkl")
             save_object(preprocessor_path, preprocessor)
 
             logger.info("Preprocessing completed successfully")
@@ -102,8 +158,8 @@ class DataPreprocessing:
             return (
                 X_train_transformed,
                 X_test_transformed,
-                y_train.values,
-                y_test.values,
+                y_train,
+                y_test,
                 preprocessor_path
             )
             
@@ -111,8 +167,37 @@ class DataPreprocessing:
             logger.exception("Failed to preprocessing!")
             raise ChurnException(e, sys)
 
+    def load_transformed(self, train_df: pd.DataFrame = None, test_df: pd.DataFrame = None):
+        """Same outputs as `initiate_preprocessing`, from the saved preprocessor instead of refitting it."""
+        try:
+            logger.info("Transforming splits with the saved preprocessor")
+
+            if train_df is None:
+                train_df = load_frame(TRAIN_DATA_PATH)
+            if test_df is None:
+                test_df = load_frame(TEST_DATA_PATH)
+
+            preprocessor_path = os.path.join(CANDIDATE_DIR, "preprocessor.pkl")
+            preprocessor = load_object(preprocessor_path)
+
+            train_df = self.clean_data(train_df)
+            X_train = preprocessor.transform(train_df.drop(columns=self.target_column))
+            y_train = train_df[self.target_column].values
+            del train_df
+
+            test_df = self.clean_data(test_df)
+            X_test = preprocessor.transform(test_df.drop(columns=self.target_column))
+            y_test = test_df[self.target_column].values
+            del test_df
+
+            return X_train, X_test, y_train, y_test, preprocessor_path
+
+        except Exception as e:
+            logger.exception("Failed to transform data with the saved preprocessor!")
+            raise ChurnException(e, sys)
+
 if __name__ == "__main__":
-    obj = DataPreprocessing()
+    obj = DataPreprocessing.from_config()
     x_1, x_2, y_1, y_2 ,path= obj.initiate_preprocessing()
     print(f"🦜testing Data : {x_2}")
     print(f"🦚testing data y_values : {y_2}")
@@ -0,0 +1,227 @@
+"""
+Synthetic Telco churn data at arbitrary scale, fitted on the raw dataset.
+
+Rows are a smoothed bootstrap of the real customers: every synthetic row takes
+the categorical profile (services, contract, payment, gender, SeniorCitizen and
+the Churn label) of a randomly drawn real customer, so the joint distribution
+of the categoricals and their relation to churn are kept as they are. The
+numerical columns are jittered around that customer's values:
+
+    tenure          donor tenure + N(0, tenure_jitter) months, clipped to the observed range
+    MonthlyCharges  donor charge + N(0, charge_jitter), clipped to the observed range
+    TotalCharges    tenure * MonthlyCharges * the donor's TotalCharges / (tenure * MonthlyCharges)
+
+so tenure x TotalCharges x Contract keep their real correlation. Customers with
+tenure 0 stay at 0 with a blank TotalCharges, as in the raw file.
+
+Drift is injected per feature, optionally only from `drift_start_row` on:
+
+    MonthlyCharges: {scale: 1.2, shift: 0.0}    numerical: x * scale + shift
+    Contract: {to: Month-to-month, rate: 0.3}   categorical: `rate` of the rows set to `to`
+
+Output is written chunk by chunk (CSV in the raw format, or one Parquet row
+group per chunk), so memory is bounded by `chunk_rows` whatever the row count.
+Every chunk has its own seed, so a dataset is reproducible for a given seed and
+chunk size.
+"""
+#importing library
+import os
+import sys
+import json
+import argparse
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.config.paths import RAW_DATA_PATH, SYNTHETIC_DATA_DIR
+from src.config.configuration import get_section
+
+logger = get_logger(__name__)
+
+NUMERICAL_COLUMNS = ("tenure", "MonthlyCharges", "TotalCharges")
+ID_COLUMN = "customerID"
+
+
+class SyntheticDataGenerator:
+    def __init__(self,
+                 seed: int = 42,
+                 chunk_rows: int = 250_000,
+                 tenure_jitter: float = 2.0,
+                 charge_jitter: float = 1.0,
+                 drift: Optional[Dict[str, dict]] = None,
+                 drift_start_row: int = 0):
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+        self.tenure_jitter = tenure_jitter
+        self.charge_jitter = charge_jitter
+        self.drift = drift or {}
+        self.drift_start_row = drift_start_row
+
+        #Fitted state: one array per column of the real data
+        self.columns = None
+        self.categorical = {}
+        self.tenure = None
+        self.monthly_charges = None
+        self.total_ratio = None
+        self.tenure_range = None
+        self.charge_range = None
+
+    @classmethod
+    def from_config(cls, **overrides) -> "SyntheticDataGenerator":
+        synthetic_config = get_section("synthetic") or {}
+        params = {
+            "seed": synthetic_config.get("seed", 42),
+            "chunk_rows": synthetic_config.get("chunk_rows", 250_000),
+            "tenure_jitter": synthetic_config.get("tenure_jitter", 2.0),
+            "charge_jitter": synthetic_config.get("charge_jitter", 1.0),
+            "drift": synthetic_config.get("drift") or {},
+            "drift_start_row": synthetic_config.get("drift_start_row", 0),
+        }
+        params.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**params)
+
+    def fit(self, df: Optional[pd.DataFrame] = None) -> "SyntheticDataGenerator":
+        try:
+            if df is None:
+                logger.info(f"Fitting synthetic data generator on {RAW_DATA_PATH}")
+                df = pd.read_csv(RAW_DATA_PATH)
+            df = df.reset_index(drop=True)
+            total_charges = pd.to_numeric(df["TotalCharges"], errors="coerce").to_numpy(dtype=float)
+
+            self.columns = list(df.columns)
+            self.categorical = {
+                col: df[col].to_numpy() for col in self.columns
+                if col not in NUMERICAL_COLUMNS and col != ID_COLUMN
+            }
+            self.tenure = df["tenure"].to_numpy(dtype=np.int64)
+            self.monthly_charges = df["MonthlyCharges"].to_numpy(dtype=float)
+
+            #TotalCharges relative to tenure * MonthlyCharges (1.0 when the charge never changed, and for tenure 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.total_ratio = np.where(self.tenure > 0, total_charges / (self.tenure * self.monthly_charges), 1.0)
+            self.total_ratio = np.nan_to_num(self.total_ratio, nan=1.0)
+            self.tenure_range = (max(int(self.tenure[self.tenure > 0].min()), 1), int(self.tenure.max()))
+            self.charge_range = (float(self.monthly_charges.min()), float(self.monthly_charges.max()))
+
+            unknown = [col for col in self.drift if col not in self.columns]
+            if unknown:
+                raise ValueError(f"Drift configured for unknown columns {unknown}")
+
+            logger.info(f"Synthetic data generator fitted on {len(df)} rows")
+            return self
+
+        except Exception as e:
+            logger.exception("Failed to fit the synthetic data generator!")
+            raise ChurnException(e, sys)
+
+    def _apply_drift(self, data: Dict[str, np.ndarray], columns, drifted: np.ndarray, rng: np.random.Generator):
+        for col in columns:
+            spec = self.drift.get(col)
+            if spec is None or not drifted.any():
+                continue
+            if "to" in spec:
+                flip = drifted & (rng.random(len(drifted)) < spec.get("rate", 1.0))
+                values = data[col].copy()
+                values[flip] = spec["to"]
+            else:
+                values = data[col].astype(float)
+                values[drifted] = values[drifted] * spec.get("scale", 1.0) + spec.get("shift", 0.0)
+                values = np.rint(values).astype(np.int64) if col == "tenure" else np.round(values, 2)
+            data[col] = values
+
+    def sample(self, n_rows: int, start_row: int = 0) -> pd.DataFrame:
+        """Rows `start_row` to `start_row + n_rows` of the dataset; the same range always gives the same rows."""
+        if self.columns is None:
+            raise RuntimeError("SyntheticDataGenerator.fit must be called before sampling")
+
+        rng = np.random.default_rng([self.seed, start_row])
+        donors = rng.integers(0, len(self.tenure), n_rows)
+        row_index = np.arange(start_row, start_row + n_rows)
+
+        #Columns are built as arrays and framed once: every intermediate frame would copy the object block
+        data = {col: values.take(donors) for col, values in self.categorical.items()}
+        data[ID_COLUMN] = np.array([f"SYN-{i:010d}" for i in range(start_row, start_row + n_rows)], dtype=object)
+
+        donor_tenure = self.tenure.take(donors)
+        tenure = np.rint(donor_tenure + rng.normal(0.0, self.tenure_jitter, n_rows)).astype(np.int64)
+        data["tenure"] = np.where(donor_tenure > 0, np.clip(tenure, *self.tenure_range), 0)
+
+        monthly = self.monthly_charges.take(donors) + rng.normal(0.0, self.charge_jitter, n_rows)
+        data["MonthlyCharges"] = np.round(np.clip(monthly, *self.charge_range), 2)
+
+        drifted = row_index >= self.drift_start_row
+        self._apply_drift(data, [col for col in self.drift if col != "TotalCharges"], drifted, rng)
+
+        #Derived after the drift, so a drifted tenure or charge carries through to TotalCharges
+        total = data["tenure"] * data["MonthlyCharges"] * self.total_ratio.take(donors)
+        data["TotalCharges"] = np.where(data["tenure"] > 0, np.round(total, 2), np.nan)
+        self._apply_drift(data, ["TotalCharges"], drifted, rng)
+
+        return pd.DataFrame({col: data.pop(col) for col in self.columns})
+
+    def iter_chunks(self, n_rows: int) -> Iterator[pd.DataFrame]:
+        for start_row in range(0, n_rows, self.chunk_rows):
+            yield self.sample(min(self.chunk_rows, n_rows - start_row), start_row=start_row)
+
+    def write(self, output_path: str, n_rows: int) -> str:
+        """Writes `n_rows` rows to `output_path` (.csv or .parquet), one chunk in memory at a time."""
+        try:
+            if self.columns is None:
+                self.fit()
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            is_parquet = output_path.endswith(".parquet")
+            if not is_parquet and not output_path.endswith(".csv"):
+                raise ValueError(f"Unsupported output format for {output_path}, expected .csv or .parquet")
+
+            logger.info(f"Writing {n_rows} synthetic rows to {output_path} in chunks of {self.chunk_rows}")
+            tmp_path = f"{output_path}.tmp-{os.getpid()}"
+            writer = None
+            try:
+                #Each chunk is sampled and released within one iteration, so only one is held at a time
+                for i, start_row in enumerate(range(0, n_rows, self.chunk_rows)):
+                    chunk = self.sample(min(self.chunk_rows, n_rows - start_row), start_row=start_row)
+                    if is_parquet:
+                        import pyarrow as pa
+                        import pyarrow.parquet as pq
+                        table = pa.Table.from_pandas(chunk, preserve_index=False)
+                        if writer is None:
+                            writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+                        writer.write_table(table)
+                        del table
+                    else:
+                        #Blank TotalCharges as " ", like the raw file
+                        chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False, na_rep=" ")
+                    logger.info(f"Synthetic chunk {i} written ({len(chunk)} rows)")
+                    del chunk
+            finally:
+                if writer is not None:
+                    writer.close()
+            os.replace(tmp_path, output_path)
+
+            logger.info(f"Synthetic dataset of {n_rows} rows saved at {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.exception("Failed to write the synthetic dataset!")
+            raise ChurnException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Telco churn dataset")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--output", default=os.path.join(SYNTHETIC_DATA_DIR, "telco_synthetic.parquet"))
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--chunk-rows", type=int)
+    parser.add_argument("--drift", type=json.loads, help='e.g. \'{"MonthlyCharges": {"scale": 1.2}}\'')
+    parser.add_argument("--drift-start-row", type=int)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator.from_config(
+        seed=args.seed, chunk_rows=args.chunk_rows, drift=args.drift, drift_start_row=args.drift_start_row
+    ).fit()
+    path = generator.write(args.output, args.rows)
+    print(f"Synthetic dataset written to {path}")
@@ -1,6 +1,7 @@
 #importing libraries
 import os
 import sys
+import time
 import pandas as pd 
 import numpy as np 
 
@@ -8,19 +9,28 @@ import numpy as np
 from src.utils.logger import get_logger
 from src.utils.exception import ChurnException
 from src.utils.common import save_object
-from src.config.paths import ARTIFACT_DIR
+from src.config.paths import CANDIDATE_DIR
 from sklearn.preprocessing import LabelEncoder
 from src.preprocessing import DataPreprocessing
+from src.model_search import CandidateSearch
 
 #importing models
 from sklearn.linear_model import LogisticRegression
 
-#mlflow 
-import mlflow
-import mlflow.sklearn
-
 logger = get_logger(__name__)
 
+def log_sklearn_model(model):
+    import mlflow.sklearn
+
+    #Fitted in this process, so the types skops cannot vouch for (tree node storage, boosters) are trusted
+    try:
+        from skops.io import dumps, get_untrusted_types
+        trusted_types = get_untrusted_types(data=dumps(model)) or None
+    except ImportError:
+        trusted_types = None
+    mlflow.sklearn.log_model(model, artifact_path = "model", skops_trusted_types = trusted_types)
+
+
 class ModelTrainer:
     def __init__(self):
         self.model = LogisticRegression(
@@ -29,9 +39,13 @@ class ModelTrainer:
             max_iter=1000,
             solver="lbfgs"
         )
+        self.fit_seconds = None
 
     def initiate_training(self, X_train : np.ndarray, y_train: np.ndarray):
         try:
+            #mlflow is slow to import, load it only when a model is actually trained
+            import mlflow
+
             logger.info("Model Trainig started.")
 
             #Encoding Target variable
@@ -42,12 +56,17 @@ class ModelTrainer:
 
             with mlflow.start_run(run_name="churn_model_training"):
 
+                #Configured search: trials are logged as nested runs, the best candidate replaces the default model
+                search = CandidateSearch.from_config()
+                if search is not None:
+                    self.model = search.run(X_train, y_train_encoded)
+                    mlflow.log_param("search_trials", len(search.trials))
+                    mlflow.log_param("search_trials_not_started", search.skipped_trials)
+                    mlflow.log_metric("best_cv_roc_auc", search.best_trial["score"])
+
                 #Log model parameters
-                mlflow.log_param("model_type", "LogisticRegression")
-                mlflow.log_param("C", self.model.C)
-                mlflow.log_param("class_weight", self.model.class_weight)
-                mlflow.log_param("solver", self.model.solver)
-                mlflow.log_param("max_iter", self.model.max_iter)
+                mlflow.log_param("model_type", type(self.model).__name__)
+                mlflow.log_params(self.model.get_params())
 
                 #Log data properties
                 mlflow.log_param("train_samples", X_train.shape[0])
@@ -59,14 +78,14 @@ class ModelTrainer:
                 logger.info("Model Training Completed")
 
                 #Log model to MLflow
-                mlflow.sklearn.log_model(self.model, artifact_path = "model")
+                log_sklearn_model(self.model)
 
-            #Saving model to local
-            model_path = os.path.join(ARTIFACT_DIR, "Churn_Model.pkl")
+            #Saving model to the candidate staging area; evaluation decides whether it is bundled and served
+            model_path = os.path.join(CANDIDATE_DIR, "Churn_Model.pkl")
             save_object(model_path, self.model)
 
             #Saving label encoder instance to local
-            le_path = os.path.join(ARTIFACT_DIR, "le_churn.pkl")
+            le_path = os.path.join(CANDIDATE_DIR, "le_churn.pkl")
             save_object(le_path, le_churn)
 
             logger.info("Model and Label encoder instance saved to local successfully.")
@@ -79,6 +98,57 @@ class ModelTrainer:
             raise ChurnException(e, sys)
 
 
+    def initiate_incremental_training(self, base_model, le_churn, X_train: np.ndarray, y_train: np.ndarray,
+                                      max_iter: int = 200):
+        """
+        Continue fitting `base_model` (the production LogisticRegression) on `X_train`.
+
+        lbfgs starts from the production coefficients (warm_start), so it needs
+        far fewer iterations than a fit from zero. The production label encoder
+        is kept so class indices do not move.
+        """
+        try:
+            import mlflow
+            from sklearn.base import clone
+
+            logger.info(f"Incremental training started on {X_train.shape[0]} rows.")
+
+            model = clone(base_model).set_params(warm_start=True, max_iter=max_iter)
+            model.coef_ = base_model.coef_.copy()
+            model.intercept_ = base_model.intercept_.copy()
+            model.classes_ = base_model.classes_
+            y_train_encoded = le_churn.transform(y_train)
+
+            with mlflow.start_run(run_name="churn_model_incremental_training"):
+                mlflow.log_param("model_type", type(model).__name__)
+                mlflow.log_param("warm_start", True)
+                mlflow.log_param("max_iter", max_iter)
+                mlflow.log_param("train_samples", X_train.shape[0])
+                mlflow.log_param("num_features", X_train.shape[1])
+
+                start = time.perf_counter()
+                model.fit(X_train, y_train_encoded)
+                self.fit_seconds = time.perf_counter() - start
+                mlflow.log_metric("fit_seconds", self.fit_seconds)
+                mlflow.log_metric("n_iter", int(np.max(model.n_iter_)))
+
+                logger.info(f"Incremental training completed in {int(np.max(model.n_iter_))} iterations.")
+                log_sklearn_model(model)
+
+            #Staged like a full refit: production keeps serving until evaluation promotes the candidate
+            model_path = os.path.join(CANDIDATE_DIR, "Churn_Model.pkl")
+            save_object(model_path, model)
+
+            le_path = os.path.join(CANDIDATE_DIR, "le_churn.pkl")
+            save_object(le_path, le_churn)
+
+            return model_path, le_path
+
+        except Exception as e:
+            logger.exception("Incremental Model Training Failed")
+            raise ChurnException(e, sys)
+
+
 if __name__ == "__main__":
     preprocessor = DataPreprocessing()
     X_train, X_test, y_train, y_test, _ = preprocessor.initiate_preprocessing()
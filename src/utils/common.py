@@ -3,19 +3,12 @@ import os
 import sys
 import pickle
 import json
+import hashlib
 
 
 from src.utils.exception import ChurnException
 from src.utils.logger import get_logger
 
-from sklearn.metrics import (accuracy_score, 
-                            recall_score, 
-                            f1_score, 
-                            precision_score, 
-                            roc_auc_score, 
-                            classification_report,
-                            )
-
 logger = get_logger(__name__)
 
 #Creating a function for saving object
@@ -51,6 +44,14 @@ def load_object(file_path:str):
 # Creating a function for metrics evaluation and Roc-auc curve plotting
 
 def eval_metrics(true, pred, prob):
+    #sklearn.metrics is only needed by training/evaluation, keep it off the serving import path
+    from sklearn.metrics import (accuracy_score, 
+                                recall_score, 
+                                f1_score, 
+                                precision_score, 
+                                roc_auc_score, 
+                                classification_report,
+                                )
     try:
         acc = accuracy_score(true, pred)
         recall = recall_score(true, pred)
@@ -74,11 +75,79 @@ def save_json(file_path : str, json_obj):
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        with open(file_path, "w") as f:
+        #Write then rename so readers never see a half written file
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
             json.dump(json_obj, f, indent =4)
+        os.replace(tmp_path, file_path)
 
         logger.info("JSON Object saved successfully.")
 
     except Exception as e:
         logger.exception("Error Occured while saving json files.")
         raise ChurnException(e, sys)
+
+
+#Creating a function to hash file contents
+def get_file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    except Exception as e:
+        logger.exception("Error Occured while hashing file.")
+        raise ChurnException(e, sys)
+
+
+#Creating a function to derive a model version from its artifact files
+def get_artifact_version(file_paths: list, extra: str = None) -> str:
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        digest.update(get_file_hash(file_path).encode("utf-8"))
+    #Settings that ship with the artifacts (e.g. the decision threshold) are part of the version
+    if extra is not None:
+        digest.update(extra.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+#Creating a function to save a DataFrame as typed, columnar parquet
+def save_frame(file_path: str, df):
+    try:
+        dir_path = os.path.dirname(file_path)
+        os.makedirs(dir_path, exist_ok=True)
+
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        df.to_parquet(tmp_path, index=False, compression="zstd")
+        os.replace(tmp_path, file_path)
+
+        logger.info(f"Frame of {len(df)} rows saved at {file_path}")
+
+    except Exception as e:
+        logger.exception("Error Occured while saving frame.")
+        raise ChurnException(e, sys)
+
+
+#Creating a function to load a parquet frame, reading only the requested columns
+def load_frame(file_path: str, columns: list = None):
+    import pandas as pd
+    try:
+        if not os.path.exists(file_path):
+            #Splits written before the move to parquet
+            csv_path = os.path.splitext(file_path)[0] + ".csv"
+            if not os.path.exists(csv_path):
+                raise Exception(f"File not found at {file_path}")
+            logger.info(f"Parquet not found, reading {csv_path}")
+            return pd.read_csv(csv_path, usecols=columns)
+
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(file_path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(file_path, columns=columns)
+
+    except Exception as e:
+        logger.exception("Error Occured while loading frame")
+        raise ChurnException(e, sys)
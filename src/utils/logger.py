@@ -1,21 +1,198 @@
-import logging
+"""
+Process-wide logging setup, configured from the `logging` section of config.yaml.
+
+    logs/log_<timestamp>.log    under the repository root, whatever the working directory
+
+* queue: callers only put records on a bounded in-memory queue. A background
+  QueueListener thread formats them and writes the file. When the queue is full,
+  INFO/DEBUG records are dropped and counted. WARNING and above wait for room.
+* sampling: a fraction of the INFO/DEBUG records of chosen loggers (and their
+  children) is kept, e.g. the per-request `*.requests` loggers of the serving
+  path. WARNING and above are never sampled.
+* format: `text` (the original line format) or `json`, one object per line.
+"""
 import os
-import sys
-from datetime import datetime
+import json
+import queue
+import atexit
+import logging
+import itertools
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from src.config.paths import LOGS_DIR
+from src.config.configuration import get_section
 
-LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
+LOG_DIR = LOGS_DIR
 
 LOG_FILE = f"log_{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.log"
 LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE)
 
-logging.basicConfig(
-    filename = LOG_FILE_PATH,
-    level = logging.INFO,
-    format = '[%(asctime)s] %(name)s - %(levelname)s - %(message)s',
-)
+TEXT_FORMAT = '[%(asctime)s] %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, process, and the traceback if any."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        sample_every = getattr(record, "sample_every", None)
+        if sample_every is not None:
+            entry["sample_every"] = sample_every
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every round(1 / rate) INFO/DEBUG records of each sampled logger; WARNING and above always pass.
+
+    `rates` maps logger names to the fraction kept; the longest matching name
+    wins, so a rate for "src.api" also covers "src.api.app". A rate of 0 drops
+    every INFO/DEBUG record of that logger.
+    """
+
+    def __init__(self, rates: dict = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._every = {}
+        #itertools.count per logger: next() is atomic, so request threads share one exact ratio without a lock
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, name: str) -> int:
+        matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+        rate = float(self.rates[max(matches, key=len)]) if matches else 1.0
+        every = 0 if rate <= 0 else max(1, round(1 / rate))
+        with self._lock:
+            self._counters.setdefault(name, itertools.count())
+            self._every.setdefault(name, every)
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        every = self._every.get(record.name)
+        if every is None:
+            every = self._resolve(record.name)
+        if every == 1:
+            return True
+        if every == 0:
+            return False
+
+        record.sample_every = every
+        return next(self._counters[record.name]) % every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread and never blocks on INFO/DEBUG records."""
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        #Only the traceback is rendered here, while its frames are still current; the message is formatted later
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_state = {"configured": False, "level": logging.INFO, "handler": None, "listener": None, "loggers": set()}
+
+
+def _stop_listener():
+    listener = _state["listener"]
+    if listener is not None:
+        #Writes what is still queued before returning
+        listener.stop()
+        _state["listener"] = None
+
+
+def _restart_listener_after_fork():
+    #The listener thread does not survive fork (e.g. gunicorn workers forked from a preloaded master)
+    handler, listener = _state["handler"], _state["listener"]
+    if listener is None:
+        return
+    handler.queue = queue.Queue(handler.queue.maxsize)
+    _state["listener"] = QueueListener(handler.queue, *listener.handlers, respect_handler_level=True)
+    _state["listener"].start()
+
+
+def configure_logging(level: str = None, fmt: str = None, use_queue: bool = None, max_queue_size: int = None,
+                      sampling: dict = None, log_file: str = LOG_FILE_PATH):
+    """(Re)configure the root handler; arguments left as None come from the `logging` config section."""
+    logging_config = get_section("logging")
+    queue_config = logging_config.get("queue") or {}
+    level = level or logging_config.get("level", "INFO")
+    fmt = fmt or logging_config.get("format", "text")
+    use_queue = queue_config.get("enabled", True) if use_queue is None else use_queue
+    max_queue_size = max_queue_size or queue_config.get("max_size", 10000)
+    sampling = logging_config.get("sampling") if sampling is None else sampling
+
+    root = logging.getLogger()
+    previous = [_state["handler"]] if _state["handler"] is not None else []
+    if _state["listener"] is not None:
+        previous += list(_state["listener"].handlers)
+    _stop_listener()
+    for handler in previous:
+        root.removeHandler(handler)
+        handler.close()
+
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    if use_queue:
+        handler = NonBlockingQueueHandler(queue.Queue(max_queue_size))
+        _state["listener"] = QueueListener(handler.queue, file_handler, respect_handler_level=True)
+        _state["listener"].start()
+    else:
+        handler = file_handler
+    handler.addFilter(SamplingFilter(sampling))
+
+    root.addHandler(handler)
+    _state.update(configured=True, level=logging.getLevelName(level.upper()), handler=handler)
+    root.setLevel(_state["level"])
+    for name in _state["loggers"]:
+        logging.getLogger(name).setLevel(_state["level"])
+
+
+def logging_stats() -> dict:
+    handler = _state["handler"]
+    if not isinstance(handler, NonBlockingQueueHandler):
+        return {"queued": 0, "dropped_records": 0}
+    return {"queued": handler.queue.qsize(), "dropped_records": handler.dropped}
+
+
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
 def get_logger(name:str) -> logging.Logger:
+    if not _state["configured"]:
+        configure_logging()
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(_state["level"])
+    _state["loggers"].add(name)
     return logger
-    
@@ -0,0 +1,139 @@
+"""
+Vectorized evaluation metrics: every-threshold sweep and bootstrap intervals.
+
+`threshold_sweep` sorts the scores once and reads the confusion matrix of every
+distinct threshold from cumulative sums, so all candidate thresholds cost
+O(n log n) together. `bootstrap_metrics` draws the resamples as a
+(n_resamples, n) matrix of row counts (how often each test row is drawn). Accuracy, precision, recall,
+F1 and ROC-AUC of every resample then come from matrix products and one
+cumulative sum over the sorted scores. Resamples without positives (or, for
+ROC-AUC, without negatives) leave recall and ROC-AUC undefined and are left
+out of those intervals rather than counted as 0.
+"""
+#importing library
+from typing import Dict
+
+import numpy as np
+
+METRICS = ("accuracy", "precision", "recall", "f1", "roc_auc")
+
+
+def _safe_divide(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
+
+
+def threshold_sweep(y_true: np.ndarray, y_prob: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Confusion-matrix metrics for every distinct score used as a threshold (predict 1 when prob >= threshold).
+
+    Thresholds are returned in decreasing order, so recall is non-decreasing along the arrays.
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+
+    order = np.argsort(-y_prob, kind="mergesort")
+    scores, labels = y_prob[order], y_true[order]
+    #Last index of each run of tied scores: everything up to it is predicted positive
+    last = np.flatnonzero(np.r_[scores[1:] != scores[:-1], True])
+
+    tp = np.cumsum(labels)[last]
+    fp = (last + 1) - tp
+    positives, n = int(labels.sum()), len(labels)
+    fn, tn = positives - tp, (n - positives) - fp
+
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, positives)
+    return {
+        "threshold": scores[last],
+        "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": precision,
+        "recall": recall,
+        "f1": _safe_divide(2 * precision * recall, precision + recall),
+        "accuracy": (tp + tn) / n,
+    }
+
+
+def select_threshold(sweep: Dict[str, np.ndarray], recall_target: float) -> float:
+    """Highest threshold whose recall reaches `recall_target` (the most precise one that does)."""
+    reaching = np.flatnonzero(sweep["recall"] >= recall_target)
+    index = reaching[0] if len(reaching) else len(sweep["threshold"]) - 1
+    return float(sweep["threshold"][index])
+
+
+def _weighted_metrics(weights: np.ndarray, y_true: np.ndarray, predicted: np.ndarray,
+                      order: np.ndarray, starts: np.ndarray) -> Dict[str, np.ndarray]:
+    """METRICS for every row of `weights` (one weight per test row)."""
+    cells = np.stack([y_true & predicted, ~y_true & predicted, y_true & ~predicted, ~y_true & ~predicted], axis=1)
+    tp, fp, fn, tn = (weights @ cells.astype(np.float64)).T
+    precision = _safe_divide(tp, tp + fp)
+    #Undefined (NaN) on a resample without positives
+    recall = np.where(tp + fn > 0, _safe_divide(tp, tp + fn), np.nan)
+
+    #Weighted Mann-Whitney ROC-AUC: each positive counts the negatives scored below it, ties count half
+    sorted_weights = weights[:, order]
+    positive_weights = np.add.reduceat(sorted_weights * y_true[order], starts, axis=1)
+    negative_weights = np.add.reduceat(sorted_weights, starts, axis=1) - positive_weights
+    negatives_below = np.cumsum(negative_weights, axis=1) - negative_weights
+    pairs = positive_weights.sum(axis=1) * negative_weights.sum(axis=1)
+    roc_auc = np.where(
+        pairs > 0,
+        _safe_divide((positive_weights * (negatives_below + 0.5 * negative_weights)).sum(axis=1), pairs),
+        np.nan
+    )
+
+    return {
+        "accuracy": (tp + tn) / weights.sum(axis=1),
+        "precision": precision,
+        "recall": recall,
+        "f1": _safe_divide(2 * precision * recall, precision + recall),
+        "roc_auc": roc_auc,
+    }
+
+
+def bootstrap_metrics(y_true: np.ndarray, y_prob: np.ndarray, threshold: float,
+                      n_resamples: int = 2000, ci_level: float = 0.95,
+                      random_state: int = 42, max_cells: int = 20_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Point estimate and percentile interval of every metric in METRICS at `threshold`.
+
+    Resamples are drawn in blocks of at most `max_cells` weights, so memory stays
+    bounded on large test sets.
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+    n = len(y_true)
+
+    predicted = y_prob >= threshold
+    order = np.argsort(y_prob, kind="mergesort")
+    scores = y_prob[order]
+    starts = np.flatnonzero(np.r_[True, scores[1:] != scores[:-1]])
+
+    point = _weighted_metrics(np.ones((1, n)), y_true, predicted, order, starts)
+
+    #Row b of a block holds how often each test row is drawn in resample b
+    rng = np.random.default_rng(random_state)
+    block = max(1, max_cells // max(n, 1))
+    samples = {metric: [] for metric in METRICS}
+    for size in [block] * (n_resamples // block) + ([n_resamples % block] if n_resamples % block else []):
+        draws = rng.integers(0, n, size=(size, n)) + np.arange(size)[:, None] * n
+        weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+        for metric, values in _weighted_metrics(weights, y_true, predicted, order, starts).items():
+            samples[metric].append(values)
+
+    tail = (1 - ci_level) / 2 * 100
+    intervals = {}
+    for metric in METRICS:
+        values = np.concatenate(samples[metric])
+        #Single-class resamples have no recall / ROC-AUC; the interval comes from the others
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            values = np.array([np.nan])
+        intervals[metric] = {
+            "estimate": float(point[metric][0]),
+            "low": float(np.percentile(values, tail)),
+            "high": float(np.percentile(values, 100 - tail)),
+        }
+    return intervals
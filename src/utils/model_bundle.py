@@ -0,0 +1,154 @@
+"""
+Versioned model bundle: one directory per model version.
+
+    bundles/<model_version>/
+        manifest.json   schema, feature order, threshold, library versions, checksums
+        objects.pkl     the fitted objects, pickled with protocol 5 out-of-band buffers
+        arrays.bin      the raw numpy buffers those objects reference, 64-byte aligned
+        *.json          extra files frozen with the model (e.g. its drift baselines)
+
+On load, `arrays.bin` is memory-mapped and its slices handed back to pickle, so the
+numeric parts of the model are never copied. The pages live in the OS page cache
+and are shared by every process that maps the same bundle. Bundles are written to a
+temporary directory and renamed into place, so a failed run never leaves a partial
+bundle behind.
+"""
+#importing library
+import os
+import sys
+import json
+import mmap
+import pickle
+import shutil
+import platform
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+#importing requirements
+from src.utils.logger import get_logger
+from src.utils.exception import ChurnException
+from src.utils.common import get_file_hash
+
+logger = get_logger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+OBJECTS_FILE = "objects.pkl"
+ARRAYS_FILE = "arrays.bin"
+ALIGNMENT = 64
+
+
+def _library_versions() -> Dict[str, str]:
+    import numpy
+    import sklearn
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "scikit-learn": sklearn.__version__,
+    }
+
+
+def save_bundle(bundle_dir: str, objects: Dict[str, object], manifest: Dict,
+                extra_files: Dict[str, str] = None) -> str:
+    """
+    Write `objects` and `manifest` as a bundle at `bundle_dir`, plus `extra_files`
+    ({name in the bundle: source path}) copied and checksummed with them.
+    Existing bundles are left untouched.
+    """
+    try:
+        if os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+            logger.info(f"Bundle already exists at {bundle_dir}")
+            return bundle_dir
+
+        parent_dir = os.path.dirname(bundle_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_dir = os.path.join(parent_dir, f".tmp-{os.path.basename(bundle_dir)}-{os.getpid()}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        buffers = []
+        payload = pickle.dumps(objects, protocol=5, buffer_callback=buffers.append)
+
+        with open(os.path.join(tmp_dir, OBJECTS_FILE), "wb") as f:
+            f.write(payload)
+
+        layout = []
+        with open(os.path.join(tmp_dir, ARRAYS_FILE), "wb") as f:
+            offset = 0
+            for buffer in buffers:
+                raw = buffer.raw()
+                padding = (-offset) % ALIGNMENT
+                f.write(b"\0" * padding)
+                offset += padding
+                f.write(raw)
+                layout.append({"offset": offset, "length": raw.nbytes})
+                offset += raw.nbytes
+
+        for name, source_path in (extra_files or {}).items():
+            shutil.copyfile(source_path, os.path.join(tmp_dir, name))
+
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "library_versions": _library_versions(),
+            **manifest,
+            "buffers": layout,
+            "files": {
+                name: {
+                    "sha256": get_file_hash(os.path.join(tmp_dir, name)),
+                    "size": os.path.getsize(os.path.join(tmp_dir, name)),
+                }
+                for name in (OBJECTS_FILE, ARRAYS_FILE, *(extra_files or {}))
+            },
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=4)
+
+        os.rename(tmp_dir, bundle_dir)
+        logger.info(f"Model bundle saved at {bundle_dir} ({len(layout)} array buffers)")
+        return bundle_dir
+
+    except Exception as e:
+        logger.exception("Error Occured while saving model bundle.")
+        raise ChurnException(e, sys)
+
+
+def read_manifest(bundle_dir: str) -> Dict:
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), "r") as f:
+        return json.load(f)
+
+
+def load_bundle(bundle_dir: str, verify: bool = True) -> Tuple[Dict[str, object], Dict]:
+    """Load a bundle, memory-mapping its arrays. Returns (objects, manifest)."""
+    try:
+        manifest = read_manifest(bundle_dir)
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format {manifest.get('format_version')} at {bundle_dir}")
+
+        if verify:
+            for name, expected in manifest["files"].items():
+                if get_file_hash(os.path.join(bundle_dir, name)) != expected["sha256"]:
+                    raise ValueError(f"Checksum mismatch for {name} in bundle {bundle_dir}")
+
+        trained_with = manifest["library_versions"].get("scikit-learn")
+        current = _library_versions()["scikit-learn"]
+        if trained_with != current:
+            logger.warning(f"Bundle was saved with scikit-learn {trained_with}, running {current}.")
+
+        buffers = []
+        arrays_path = os.path.join(bundle_dir, ARRAYS_FILE)
+        if manifest["buffers"]:
+            with open(arrays_path, "rb") as f:
+                mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            buffers = [mapped[b["offset"]: b["offset"] + b["length"]] for b in manifest["buffers"]]
+
+        with open(os.path.join(bundle_dir, OBJECTS_FILE), "rb") as f:
+            objects = pickle.loads(f.read(), buffers=buffers)
+
+        logger.info(f"Model bundle loaded from {bundle_dir}")
+        return objects, manifest
+
+    except Exception as e:
+        logger.exception("Error Occured while loading model bundle.")
+        raise ChurnException(e, sys)
+
@@ -0,0 +1,18 @@
+#importing library
+import pytest
+import pandas as pd
+
+#importing requirements
+from src.preprocessing import DataPreprocessing
+from src.config.paths import RAW_DATA_PATH
+
+
+@pytest.fixture(scope="session")
+def telco_df() -> pd.DataFrame:
+    """Cleaned raw Telco data, target included."""
+    return DataPreprocessing().clean_data(pd.read_csv(RAW_DATA_PATH))
+
+
+@pytest.fixture(scope="session")
+def telco_features(telco_df) -> pd.DataFrame:
+    return telco_df.drop(columns=["Churn"])
@@ -0,0 +1,59 @@
+#importing library
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+#importing requirements
+import src.api.app as app_module
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app_module.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def record(telco_features):
+    return telco_features.iloc[0].to_dict()
+
+
+def _raw_json(obj) -> str:
+    #json.dumps writes NaN/Infinity literals by default, like a lenient client would
+    return json.dumps(obj)
+
+
+def test_non_finite_request_fields_are_rejected(client, record):
+    for value in (float("nan"), float("inf")):
+        body = _raw_json({**record, "TotalCharges": value})
+        headers = {"content-type": "application/json"}
+
+        response = client.post("/predict", content=body, headers=headers)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "TotalCharges"]
+
+        response = client.post("/predict/batch", content=f"[{body}]", headers=headers)
+        assert response.status_code == 422
+
+        lines = client.post("/predict/stream", content=body + "\n").text.splitlines()
+        assert "error" in json.loads(lines[0])
+
+
+def test_non_finite_scores_never_produce_invalid_json(client, record, monkeypatch):
+    def score_nan(records):
+        return [{"churn_probability": float("nan"), "churn_prediction": "No", "model_version": "x"} for _ in records]
+
+    monkeypatch.setattr(app_module, "_score_records", score_nan)
+
+    response = client.post("/predict/batch", json=[record])
+    assert response.status_code == 500
+
+    lines = client.post("/predict/stream", content=json.dumps(record) + "\n").text.splitlines()
+    assert json.loads(lines[0]) == {"error": "Model returned a non-finite churn probability."}
+
+
+def test_finite_batch_is_unchanged(client, record):
+    response = client.post("/predict/batch", json=[record, record])
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == 2 and 0.0 <= rows[0]["churn_probability"] <= 1.0
@@ -0,0 +1,79 @@
+#importing library
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+#importing requirements
+import src.api.app as app_module
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app_module.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def lines(telco_features):
+    return [json.dumps(record) for record in telco_features.head(5).to_dict("records")]
+
+
+def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start: start + size]
+
+
+def test_lines_split_across_chunks_are_scored_in_order(client, lines):
+    body = ("\n".join(lines) + "\n").encode()
+    whole = client.post("/predict/stream", content=body).text.splitlines()
+    #Tiny chunks put line boundaries mid-chunk and lines across many chunks
+    chunked = client.post("/predict/stream", content=_chunks(body, 7)).text.splitlines()
+
+    assert len(whole) == len(lines)
+    assert chunked == whole
+
+
+def test_oversized_line_is_reported_in_place(client, lines, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_STREAM_LINE_BYTES", 1000)
+    body = "\n".join([lines[0], "x" * 5000, lines[1]]).encode()
+
+    rows = [json.loads(line) for line in client.post("/predict/stream", content=_chunks(body, 256)).text.splitlines()]
+
+    assert [("error" in row) for row in rows] == [False, True, False]
+    assert rows[1]["error"][0]["type"] == "line_too_long"
+
+
+def test_body_without_newlines_is_never_buffered_whole(monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_STREAM_LINE_BYTES", 1000)
+
+    async def body():
+        for _ in range(1000):
+            yield b"x" * 1024
+
+    async def collect():
+        return [item async for item in app_module._iter_ndjson_lines(body())]
+
+    assert asyncio.run(collect()) == [(None, [{"type": "line_too_long", "msg": "Line exceeds 1000 bytes."}])]
+
+
+def test_client_disconnect_stops_the_stream():
+    messages = [{"type": "http.request", "body": b"{}", "more_body": True}, {"type": "http.disconnect"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    async def generate(body_chunks):
+        async for _ in body_chunks:
+            yield "waiting for the rest of the body\n"
+
+    async def run():
+        await asyncio.wait_for(app_module.NDJSONStreamingResponse(generate)({"type": "http"}, receive, send), timeout=5)
+
+    asyncio.run(run())
+    assert sent[0]["type"] == "http.response.start"
@@ -0,0 +1,94 @@
+#importing library
+import time
+import asyncio
+import pandas as pd
+import pytest
+
+#importing requirements
+from src.api.batching import MicroBatcher
+
+
+def _echo(input_df: pd.DataFrame) -> pd.DataFrame:
+    result = input_df.copy()
+    result["churn_probability"] = result["x"] / 10
+    result["churn_prediction"] = "No"
+    return result
+
+
+def test_concurrent_requests_get_their_own_rows():
+    async def scenario():
+        batcher = MicroBatcher(_echo, max_batch_size=8, max_wait_ms=5)
+        rows = await asyncio.gather(*[batcher.submit({"x": i}) for i in range(20)])
+        await batcher.close()
+        return rows, batcher.stats()
+
+    rows, stats = asyncio.run(scenario())
+    assert [row["churn_probability"] for row in rows] == [i / 10 for i in range(20)]
+    assert stats["items"] == 20 and stats["max_batch_size"] <= 8
+
+
+def test_failed_batch_fails_only_its_requests():
+    def flaky(input_df):
+        if (input_df["x"] < 0).any():
+            raise ValueError("bad row")
+        return _echo(input_df)
+
+    async def scenario():
+        batcher = MicroBatcher(flaky, max_batch_size=1)
+        with pytest.raises(ValueError, match="bad row"):
+            await batcher.submit({"x": -1})
+        row = await batcher.submit({"x": 3})
+        await batcher.close()
+        return row
+
+    assert asyncio.run(scenario())["churn_probability"] == pytest.approx(0.3)
+
+
+def test_close_fails_pending_requests():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+
+        def slow(input_df):
+            loop.call_soon_threadsafe(lambda: started.done() or started.set_result(None))
+            time.sleep(0.2)
+            return _echo(input_df)
+
+        batcher = MicroBatcher(slow, max_batch_size=1)
+        in_flight = asyncio.ensure_future(batcher.submit({"x": 1}))
+        await started
+        queued = [asyncio.ensure_future(batcher.submit({"x": i})) for i in range(3)]
+        await asyncio.sleep(0)
+        await batcher.close()
+        results = await asyncio.wait_for(asyncio.gather(in_flight, *queued, return_exceptions=True), timeout=2)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) and "closed" in str(r) for r in results)
+
+
+def test_dead_worker_fails_queued_requests_and_restarts():
+    async def scenario():
+        batcher = MicroBatcher(_echo, max_batch_size=4)
+        batcher._ensure_started()
+        await batcher.close()
+
+        #A worker that died without reaching its cleanup, with requests still queued for it
+        async def crashed():
+            raise RuntimeError("worker crashed")
+        batcher._worker = asyncio.ensure_future(crashed())
+        await asyncio.sleep(0)
+        batcher._queue = asyncio.Queue()
+        queued = []
+        for i in range(3):
+            future = asyncio.get_running_loop().create_future()
+            batcher._queue.put_nowait(({"x": i}, future, time.perf_counter()))
+            queued.append(future)
+
+        row = await asyncio.wait_for(batcher.submit({"x": 5}), timeout=2)
+        await batcher.close()
+        return queued, row
+
+    queued, row = asyncio.run(scenario())
+    assert all(future.done() and isinstance(future.exception(), RuntimeError) for future in queued)
+    assert row["churn_probability"] == pytest.approx(0.5)
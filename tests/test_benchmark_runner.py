@@ -0,0 +1,69 @@
+#importing library
+import os
+import sys
+import json
+import subprocess
+
+#importing requirements
+from benchmarks import run as runner
+from src.config.paths import ROOT_DIR
+
+
+def results(**cases) -> dict:
+    return {"cases": cases}
+
+
+def test_compare_flags_only_moves_in_the_wrong_direction():
+    baseline = results(predict={
+        "batch_ms": 10.0, "rows_per_second": 1000.0, "record_p50_us": 50.0, "rows": 100, "new_seconds": 0.0
+    })
+    current = results(predict={
+        "batch_ms": 13.0, "rows_per_second": 1200.0, "record_p50_us": 30.0, "rows": 500, "new_seconds": 1.0,
+        "unmatched_seconds": 1.0,
+    })
+    comparison = runner.compare(current, baseline, tolerance=0.25)
+
+    #rows is informational, new_seconds has no usable baseline and unmatched_seconds none at all
+    assert comparison["compared"] == 3
+    assert [(entry["metric"], round(entry["change"], 6)) for entry in comparison["regressions"]] == [("batch_ms", 0.3)]
+
+    slower_throughput = results(predict={"rows_per_second": 700.0})
+    assert [entry["metric"] for entry in runner.compare(slower_throughput, baseline, 0.25)["regressions"]] == [
+        "rows_per_second"
+    ]
+
+
+def test_run_records_every_case_and_its_time(monkeypatch):
+    calls = []
+    monkeypatch.setitem(runner.CASES, "fake", lambda quick: calls.append(quick) or {"work_seconds": 0.5})
+    output = runner.run(["fake"], quick=True)
+
+    assert calls == [True]
+    assert output["quick"] is True
+    assert output["cases"] == {"fake": {"work_seconds": 0.5}}
+    assert output["case_seconds"]["fake"] >= 0
+    assert output["environment"]["python"]
+
+
+def test_cli_writes_results_and_fails_on_a_regression(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    output_path = tmp_path / "results.json"
+
+    def cli(*extra):
+        return subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--cases", "drift", "--quick", "--output", str(output_path), *extra],
+            cwd=ROOT_DIR, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ROOT_DIR}
+        )
+
+    first = cli()
+    assert first.returncode == 0, first.stderr
+    written = json.loads(output_path.read_text())
+    assert set(written["cases"]) == {"drift"}
+    assert all(value > 0 for value in written["cases"]["drift"].values())
+
+    #Every timing of the baseline a thousand times faster than this machine can run them
+    written["cases"]["drift"] = {metric: value / 1000 for metric, value in written["cases"]["drift"].items()}
+    baseline_path.write_text(json.dumps(written))
+    second = cli("--baseline", str(baseline_path))
+    assert second.returncode == 1
+    assert "REGRESSION drift." in second.stderr
@@ -0,0 +1,155 @@
+#importing library
+import numpy as np
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+#importing requirements
+from src.compiled_scorer import CompiledLinearScorer, compile_linear_scorer
+from src.predict import load_production_objects
+from src.preprocessing import DataPreprocessing
+
+
+def _sklearn_proba(preprocessor, model, df):
+    return model.predict_proba(preprocessor.transform(df))[:, 1]
+
+
+def _fit_small_model(telco_df, matrix_mode="dense"):
+    sample = telco_df.sample(n=1500, random_state=0)
+    X, y = sample.drop(columns=["Churn"]), (sample["Churn"] == "Yes").astype(int)
+    preprocessor = DataPreprocessing(matrix_mode=matrix_mode).get_preprocessor(X)
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.fit_transform(X), y)
+    return preprocessor, model
+
+
+@pytest.fixture(scope="module")
+def production():
+    objects, _, _ = load_production_objects()
+    return objects["preprocessor"], objects["model"]
+
+
+@pytest.fixture(scope="module")
+def small_model(telco_df):
+    return _fit_small_model(telco_df)
+
+
+@pytest.mark.parametrize("artifacts", ["production", "small_model"])
+def test_parity_with_sklearn(artifacts, telco_features, request):
+    preprocessor, model = request.getfixturevalue(artifacts)
+    scorer = compile_linear_scorer(preprocessor, model)
+    assert scorer is not None
+
+    df = telco_features.sample(n=500, random_state=1)
+    expected = _sklearn_proba(preprocessor, model, df)
+    np.testing.assert_allclose(scorer.predict_proba(df), expected, rtol=0, atol=1e-9)
+
+    records = df.to_dict("records")
+    np.testing.assert_allclose([scorer.predict_proba_record(r) for r in records], expected, rtol=0, atol=1e-9)
+
+
+def test_parity_with_compact_matrix_mode(telco_df, telco_features):
+    preprocessor, model = _fit_small_model(telco_df, matrix_mode="compact")
+    scorer = compile_linear_scorer(preprocessor, model)
+    assert scorer is not None
+
+    df = telco_features.sample(n=200, random_state=2)
+    np.testing.assert_allclose(scorer.predict_proba(df), _sklearn_proba(preprocessor, model, df), rtol=0, atol=1e-5)
+
+
+def test_unknown_categories_match_ignored_one_hot(small_model, telco_features):
+    preprocessor, model = small_model
+    scorer = compile_linear_scorer(preprocessor, model)
+
+    df = telco_features.head(20).copy()
+    df["Contract"] = "Decade-long"
+    df.loc[df.index[::2], "PaymentMethod"] = np.nan
+    expected = _sklearn_proba(preprocessor, model, df)
+
+    np.testing.assert_allclose(scorer.predict_proba(df), expected, rtol=0, atol=1e-9)
+    records = df.to_dict("records")
+    np.testing.assert_allclose([scorer.predict_proba_record(r) for r in records], expected, rtol=0, atol=1e-9)
+
+
+def test_unknown_category_raises_when_encoder_errors(telco_df, telco_features):
+    X, y = telco_df.drop(columns=["Churn"]), (telco_df["Churn"] == "Yes").astype(int)
+    numeric = ["tenure", "MonthlyCharges", "TotalCharges"]
+    preprocessor = ColumnTransformer([
+        ("scaler", StandardScaler(), numeric),
+        ("oh_encoder", OneHotEncoder(handle_unknown="error"), ["Contract"]),
+    ])
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.fit_transform(X), y)
+    scorer = CompiledLinearScorer.compile(preprocessor, model)
+
+    df = telco_features.head(3).copy()
+    df["Contract"] = "Decade-long"
+    with pytest.raises(ValueError):
+        preprocessor.transform(df)
+    with pytest.raises(ValueError, match="unknown category"):
+        scorer.predict_proba(df)
+    with pytest.raises(ValueError, match="unknown category"):
+        scorer.predict_proba_record(df.iloc[0].to_dict())
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf])
+def test_non_finite_numeric_input_is_rejected_like_sklearn(small_model, telco_features, value):
+    preprocessor, model = small_model
+    scorer = compile_linear_scorer(preprocessor, model)
+
+    df = telco_features.head(5).copy()
+    df.loc[df.index[3], "TotalCharges"] = value
+    with pytest.raises(ValueError, match="Input X contains"):
+        _sklearn_proba(preprocessor, model, df)
+    with pytest.raises(ValueError, match="Input X contains .* in column TotalCharges"):
+        scorer.predict_proba(df)
+    with pytest.raises(ValueError, match="Input X contains .* in column TotalCharges"):
+        scorer.predict_proba_record(df.iloc[3].to_dict())
+
+
+def test_unsupported_model_falls_back_to_sklearn(small_model):
+    from sklearn.tree import DecisionTreeClassifier
+
+    preprocessor, _ = small_model
+    model = DecisionTreeClassifier()
+    model.classes_ = np.array([0, 1])
+    assert compile_linear_scorer(preprocessor, model) is None
+
+
+def test_predictor_rejects_nan_on_the_compiled_path(telco_features):
+    from src.predict import ChurnPredictor
+    from src.utils.exception import ChurnException
+
+    predictor = ChurnPredictor()
+    assert predictor.compiled_scorer is not None
+
+    record = telco_features.iloc[0].to_dict()
+    record["TotalCharges"] = float("nan")
+    with pytest.raises(ChurnException, match="Input X contains nan"):
+        predictor.predict_record(record)
+    with pytest.raises(ChurnException, match="Input X contains nan"):
+        predictor.predict(telco_features.head(1).assign(TotalCharges=float("nan")))
+
+
+def test_bundle_with_compiled_scorer_serves_without_loading_sklearn_objects(production, telco_features, tmp_path):
+    from src.evaluate import build_bundle_manifest, _compiled_scorer_dict
+    from src.predict import ChurnPredictor
+    from src.utils.model_bundle import save_bundle
+
+    preprocessor, model = production
+    objects, _, _ = load_production_objects()
+    manifest = build_bundle_manifest(preprocessor, model, objects["le_churn"], 0.35)
+    manifest["model_version"] = "compiled"
+    manifest["compiled_scorer"] = _compiled_scorer_dict(preprocessor, model)
+    bundle_path = save_bundle(str(tmp_path / "compiled"), objects, manifest)
+
+    predictor = ChurnPredictor(bundle_path=bundle_path)
+    df = telco_features.sample(n=200, random_state=5)
+    result = predictor.predict(df)
+    predictor.warm_up()
+    assert predictor._objects is None
+
+    expected = _sklearn_proba(preprocessor, model, df)
+    np.testing.assert_allclose(result["churn_probability"], expected, rtol=0, atol=1e-9)
+    assert set(result["churn_prediction"]) <= set(objects["le_churn"].classes_)
+    #The sklearn objects are still there for whoever needs them
+    assert type(predictor.model).__name__ == "LogisticRegression"
@@ -0,0 +1,42 @@
+#importing library
+import pandas as pd
+
+#importing requirements
+from src.config.paths import RAW_DATA_PATH
+from src.data_ingestion import DataIngestion, split_frame
+
+
+def ingest(tmp_path, labelled_dir):
+    ingestion = DataIngestion(
+        train_path=str(tmp_path / "train.parquet"), test_path=str(tmp_path / "test.parquet"),
+        labelled_dir=str(labelled_dir)
+    )
+    ingestion.initiate_data_ingestion()
+    return ingestion.release_frames()
+
+
+def test_new_batches_never_move_rows_between_the_splits(tmp_path):
+    labelled_dir = tmp_path / "labelled"
+    labelled_dir.mkdir()
+    train_before, test_before = ingest(tmp_path, labelled_dir)
+
+    batch = pd.read_csv(RAW_DATA_PATH).sample(300, random_state=1)
+    batch["customerID"] = "batch-" + batch["customerID"]
+    batch.to_csv(labelled_dir / "batch_001.csv", index=False)
+    train_after, test_after = ingest(tmp_path, labelled_dir)
+
+    #Rows production was trained on before the batch arrived never land in the test split
+    assert set(train_before["customerID"]) <= set(train_after["customerID"])
+    assert set(test_before["customerID"]) <= set(test_after["customerID"])
+    batch_test = set(test_after["customerID"]) - set(test_before["customerID"])
+    assert batch_test and all(customer.startswith("batch-") for customer in batch_test)
+
+
+def test_split_frame_handles_tiny_batches():
+    df = pd.read_csv(RAW_DATA_PATH)
+    one_churner = pd.concat([df[df["Churn"] == "Yes"].head(1), df[df["Churn"] == "No"].head(5)])
+    train_df, test_df = split_frame(one_churner)
+    assert len(train_df) + len(test_df) == 6 and len(test_df) > 0
+
+    train_df, test_df = split_frame(df.head(1))
+    assert len(train_df) == 1 and test_df.empty
@@ -0,0 +1,117 @@
+#importing library
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency, ks_2samp
+
+#importing requirements
+from src.monitoring.drift_detection import DataDriftDetector
+from src.monitoring.drift_sketch import DriftSketch, SketchLayout, ks_from_counts, ks_pvalue, chi2_pvalue
+
+
+@pytest.fixture(scope="module")
+def frames(telco_features):
+    reference = telco_features.sample(n=3000, random_state=0).reset_index(drop=True)
+    current = telco_features.sample(n=2000, random_state=1).reset_index(drop=True)
+    current["MonthlyCharges"] = current["MonthlyCharges"] * 1.3
+    current.loc[::3, "Contract"] = "Month-to-month"
+    current.loc[::50, "TotalCharges"] = np.nan
+    current.loc[::40, "PaymentMethod"] = "Crypto"
+    return reference, current
+
+
+@pytest.fixture(scope="module")
+def layout(frames):
+    return SketchLayout(DriftSketch.from_reference(frames[0], n_bins=10))
+
+
+def _brute_force_psi(ref_counts, cur_counts, eps=1e-4):
+    ref = np.clip(np.asarray(ref_counts) / np.sum(ref_counts), eps, None)
+    cur = np.clip(np.asarray(cur_counts) / np.sum(cur_counts), eps, None)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def test_layout_psi_matches_per_feature_psi(layout, frames):
+    current_counts = layout.bin_counts(frames[1])
+    psi = layout.psi(current_counts)
+
+    for j, (ref_counts, cur_counts) in enumerate(zip(layout.segments(layout.reference_counts),
+                                                      layout.segments(current_counts))):
+        assert psi[j] == pytest.approx(_brute_force_psi(ref_counts, cur_counts), rel=1e-12)
+    assert psi[layout.features.index("MonthlyCharges")] > 0.2
+    assert psi[layout.features.index("Partner")] < 0.05
+
+
+def test_sketch_counts_match_raw_binning(layout, frames):
+    reference, current = frames
+    sketch = DriftSketch.from_reference(reference, n_bins=10).empty_like()
+    #Half through the vectorised path, half record by record, as the API does
+    sketch.update(current.iloc[:1000])
+    for record in current.iloc[1000:].to_dict("records"):
+        sketch.update_record(record)
+
+    np.testing.assert_array_equal(layout.sketch_counts(sketch), layout.bin_counts(current))
+
+
+@pytest.mark.parametrize("method", ["psi", "ks"])
+def test_drift_from_sketches_matches_raw_frames(frames, method):
+    reference, current = frames
+    reference_sketch = DriftSketch.from_reference(reference, n_bins=10)
+    current_sketch = reference_sketch.empty_like()
+    current_sketch.update(current)
+    detector = DataDriftDetector(method=method, n_bins=10)
+
+    from_sketches = detector.detect_drift_from_sketches(reference_sketch, current_sketch, include_categorical=True)
+    from_frames = detector.detect_drift_from_layout(SketchLayout(reference_sketch), current, include_categorical=True)
+
+    assert from_sketches == from_frames
+    assert "MonthlyCharges" in from_sketches["drifted_features"]
+
+
+def test_ks_from_counts_is_the_ks_statistic_at_the_edges(frames):
+    reference, current = frames
+    ref_values = reference["MonthlyCharges"].to_numpy()
+    cur_values = current["MonthlyCharges"].to_numpy()
+    edges = np.quantile(ref_values, np.linspace(0, 1, 21)[1:-1])
+
+    ref_counts = np.bincount(np.searchsorted(edges, ref_values, side="right"), minlength=len(edges) + 1)
+    cur_counts = np.bincount(np.searchsorted(edges, cur_values, side="right"), minlength=len(edges) + 1)
+    #Empirical CDFs compared just below every edge
+    expected = max(abs((ref_values < e).mean() - (cur_values < e).mean()) for e in edges)
+
+    assert ks_from_counts(ref_counts, cur_counts) == pytest.approx(expected, abs=1e-12)
+    #Binning can only hide part of the gap, never add to it
+    assert ks_from_counts(ref_counts, cur_counts) <= ks_2samp(ref_values, cur_values).statistic + 1e-12
+    assert ks_from_counts(ref_counts, np.zeros_like(cur_counts)) == 0.0
+
+
+def test_ks_pvalue_matches_scipy_asymptotics(frames):
+    reference, current = frames
+    ref_values = reference["tenure"].to_numpy(dtype=np.float64)
+    cur_values = current["tenure"].to_numpy(dtype=np.float64) + 3
+    result = ks_2samp(ref_values, cur_values, method="asymp")
+
+    assert ks_pvalue(result.statistic, len(ref_values), len(cur_values)) == pytest.approx(result.pvalue, rel=0.05)
+    assert ks_pvalue(0.0, 100, 100) == 1.0
+    assert ks_pvalue(0.5, 0, 100) == 1.0
+
+
+def test_chi2_pvalue_matches_scipy_and_drops_empty_categories():
+    ref_counts = np.array([500, 300, 200, 0])
+    cur_counts = np.array([420, 330, 230, 0])
+
+    expected = chi2_contingency(np.vstack([ref_counts[:3], cur_counts[:3]]))[1]
+    assert chi2_pvalue(ref_counts, cur_counts) == pytest.approx(expected, rel=1e-12)
+    assert chi2_pvalue([10, 0], [5, 0]) == 1.0
+    assert chi2_pvalue([0, 0], [5, 3]) == 1.0
+
+
+def test_grouped_counts_match_counts_of_each_segment(layout, frames):
+    current = frames[1]
+    segment_columns = ["Contract", "InternetService"]
+    grouped = layout.grouped_bin_counts(current, segment_columns)
+
+    for key, counts in zip(layout.segment_keys(segment_columns), grouped):
+        mask = np.logical_and.reduce([current[col] == value for col, value in zip(segment_columns, key)])
+        np.testing.assert_array_equal(counts, layout.bin_counts(current[mask]))
+    assert grouped.sum() == len(current) * len(layout.features)
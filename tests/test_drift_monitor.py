@@ -0,0 +1,109 @@
+#importing library
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+#importing requirements
+from src.monitoring import drift_monitor
+from src.monitoring.drift_detection import DataDriftDetector
+from src.monitoring.drift_monitor import HOUR, DriftMonitor, HourlyBucket
+from src.monitoring.drift_sketch import SCORE_BIN_EDGES, DriftSketch, SketchLayout
+
+#Monday 2024-01-01 00:00 UTC
+MONDAY = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def reference(telco_features) -> DriftSketch:
+    return DriftSketch.from_reference(telco_features)
+
+
+def make_monitor(tmp_path, reference, **kwargs) -> DriftMonitor:
+    monitor = DriftMonitor(output_dir=str(tmp_path), detector=DataDriftDetector(), **kwargs)
+    monitor.reference = reference
+    monitor.layout = SketchLayout(reference)
+    return monitor
+
+
+def random_bucket(monitor, start, rng) -> HourlyBucket:
+    counts = rng.integers(0, 50, size=monitor.layout.n_slots)
+    score_counts = rng.integers(0, 50, size=len(SCORE_BIN_EDGES) + 1)
+    return HourlyBucket(start, counts, score_counts, "sketches")
+
+
+def test_sliding_windows_hold_exactly_the_last_n_hours(tmp_path, reference):
+    monitor = make_monitor(tmp_path, reference, windows={"1h": 1, "3h": 3, "5h": 5})
+    monitor._rebuild(MONDAY)
+    rng = np.random.default_rng(0)
+
+    pushed = []
+    for hour in range(12):
+        bucket = random_bucket(monitor, MONDAY + hour * HOUR, rng)
+        pushed.append(bucket)
+        due = monitor._push(bucket)
+        assert [window.name for window in due] == ["1h", "3h", "5h"]
+
+        for window in due:
+            inside = pushed[-window.hours:]
+            np.testing.assert_array_equal(window.counts, sum(b.counts for b in inside))
+            np.testing.assert_array_equal(window.score_counts, sum(b.score_counts for b in inside))
+            assert window.start == inside[0].start
+
+
+def test_tumbling_windows_start_at_midnight_and_on_monday(tmp_path, reference):
+    monitor = make_monitor(tmp_path, reference, windows={"24h": 24, "7d": 168}, mode="tumbling")
+    monitor._rebuild(MONDAY)
+    rng = np.random.default_rng(1)
+
+    #Start mid-week, mid-day so the first windows are partial
+    start = MONDAY + timedelta(days=2, hours=5)
+    evaluated = []
+    for hour in range(24 * 14):
+        bucket = random_bucket(monitor, start + hour * HOUR, rng)
+        for window in monitor._push(bucket):
+            evaluated.append((window.name, window.start, bucket.start + HOUR))
+
+    daily = [(s, e) for name, s, e in evaluated if name == "24h"]
+    weekly = [(s, e) for name, s, e in evaluated if name == "7d"]
+    assert all(end.hour == 0 and end - window_start <= timedelta(days=1) for window_start, end in daily)
+    assert all(window_start.hour == 0 for window_start, _ in daily[1:])
+    assert all(end.weekday() == 0 and end.hour == 0 for _, end in weekly)
+    assert [window_start for window_start, _ in weekly[1:]] == [MONDAY + timedelta(days=7)]
+    assert weekly[-1][1] == MONDAY + timedelta(days=14)
+
+
+def test_tumbling_anchor_must_be_on_an_hour(tmp_path, reference):
+    with pytest.raises(ValueError):
+        DriftMonitor(
+            windows={"24h": 24}, mode="tumbling", tumbling_anchor=MONDAY + timedelta(minutes=30),
+            output_dir=str(tmp_path), detector=DataDriftDetector()
+        )
+
+
+def test_late_sketches_are_counted_once_the_grace_period_passes(tmp_path, reference, telco_features, monkeypatch):
+    profile_path = tmp_path / "reference_profile.json"
+    reference.save(str(profile_path))
+    monkeypatch.setattr(drift_monitor, "REFERENCE_PROFILE_PATH", str(profile_path))
+
+    monitor = DriftMonitor(
+        windows={"1h": 1}, grace_minutes=10, output_dir=str(tmp_path / "monitor"), detector=DataDriftDetector()
+    )
+    layout = SketchLayout(reference)
+    flushed = {}
+
+    def bucket_for(start):
+        counts = layout.bin_counts(flushed[start]) if start in flushed else np.zeros(layout.n_slots, dtype=np.int64)
+        return HourlyBucket(start, counts, np.zeros(len(SCORE_BIN_EDGES) + 1, dtype=np.int64), "sketches")
+
+    monkeypatch.setattr(monitor, "_bucket_for", bucket_for)
+
+    hour = MONDAY + 10 * HOUR
+    flushed[hour] = telco_features.iloc[:100]
+    #The hour has closed, but the API has not flushed its last sketch for it yet
+    records = monitor.run_once(now=hour + HOUR + timedelta(minutes=2))
+    assert (hour + HOUR).isoformat() not in [r["window_end"] for r in records]
+
+    flushed[hour] = telco_features.iloc[:150]
+    records = monitor.run_once(now=hour + HOUR + timedelta(minutes=11))
+    assert [(r["window_end"], r["n"]) for r in records] == [((hour + HOUR).isoformat(), 150)]
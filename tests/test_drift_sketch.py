@@ -0,0 +1,87 @@
+#importing library
+import os
+import numpy as np
+import pytest
+
+#importing requirements
+from src.monitoring.drift_sketch import DriftSketch, DriftSketchRecorder, load_window_sketches
+
+
+@pytest.fixture(scope="module")
+def reference(telco_features):
+    return DriftSketch.from_reference(telco_features, n_bins=10)
+
+
+def _sketch_files(directory):
+    return [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+
+
+def test_recorder_writes_only_on_flush(reference, telco_features, tmp_path, monkeypatch):
+    recorder = DriftSketchRecorder(reference, window_minutes=60, flush_interval_seconds=0, output_dir=str(tmp_path))
+    #Scoring must never touch the disk, whatever the flush interval
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("file I/O on the request path"))
+    for record in telco_features.head(50).to_dict("records"):
+        recorder.update_record(record, 0.3)
+    recorder.update(telco_features.iloc[50:100], np.full(50, 0.7))
+    monkeypatch.undo()
+
+    assert _sketch_files(tmp_path) == []
+    recorder.flush()
+    files = _sketch_files(tmp_path)
+    assert len(files) == 1
+    assert DriftSketch.load(files[0]).n == 100
+
+
+def test_recorder_keeps_closed_windows_until_flushed(reference, telco_features, tmp_path, monkeypatch):
+    clock = {"now": 7200.0}
+    monkeypatch.setattr("src.monitoring.drift_sketch.time.time", lambda: clock["now"])
+    recorder = DriftSketchRecorder(reference, window_minutes=60, output_dir=str(tmp_path))
+
+    recorder.update(telco_features.head(30))
+    clock["now"] += 3600
+    recorder.update(telco_features.head(20))
+    recorder.flush()
+
+    assert sorted(DriftSketch.load(path).n for path in _sketch_files(tmp_path)) == [20, 30]
+
+
+def test_background_flush_and_stop(reference, telco_features, tmp_path):
+    from datetime import datetime, timezone
+
+    recorder = DriftSketchRecorder(reference, flush_interval_seconds=0.05, output_dir=str(tmp_path))
+    recorder.start()
+    recorder.update(telco_features.head(10))
+    recorder.stop()
+
+    merged = load_window_sketches(datetime.fromtimestamp(0, timezone.utc), sketch_dir=str(tmp_path))
+    assert merged.n == 10
+
+
+def test_rebind_starts_a_new_file_and_readers_skip_old_edges(reference, telco_features, tmp_path):
+    from datetime import datetime, timezone
+
+    recorder = DriftSketchRecorder(reference, output_dir=str(tmp_path))
+    recorder.update(telco_features.head(30))
+    new_reference = DriftSketch.from_reference(telco_features.tail(2000), n_bins=5)
+    recorder.rebind(new_reference)
+    recorder.update(telco_features.head(20))
+    recorder.flush()
+
+    assert sorted(DriftSketch.load(path).n for path in _sketch_files(tmp_path)) == [20, 30]
+    start = datetime.fromtimestamp(0, timezone.utc)
+    assert load_window_sketches(start, sketch_dir=str(tmp_path), reference=new_reference).n == 20
+    assert load_window_sketches(start, sketch_dir=str(tmp_path), reference=reference).n == 30
+    with pytest.raises(ValueError):
+        load_window_sketches(start, sketch_dir=str(tmp_path))
+
+
+def test_recorder_without_reference_records_after_rebind(reference, telco_features, tmp_path):
+    recorder = DriftSketchRecorder(None, output_dir=str(tmp_path))
+    recorder.update(telco_features.head(10))
+    recorder.flush()
+    assert _sketch_files(tmp_path) == []
+
+    recorder.rebind(reference)
+    recorder.update(telco_features.head(10))
+    recorder.flush()
+    assert [DriftSketch.load(path).n for path in _sketch_files(tmp_path)] == [10]
@@ -0,0 +1,146 @@
+#importing library
+import json
+import os
+
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.preprocessing import LabelEncoder
+
+#importing requirements
+import src.evaluate as evaluate
+from src.preprocessing import DataPreprocessing
+from src.utils.common import save_object, save_json, get_artifact_version
+from src.utils.model_bundle import load_bundle
+
+
+def _save_artifacts(artifact_dir, telco_df, random_state):
+    sample = telco_df.sample(n=800, random_state=random_state)
+    X, y = sample.drop(columns=["Churn"]), sample["Churn"]
+    le_churn = LabelEncoder().fit(y)
+    preprocessor = DataPreprocessing().get_preprocessor(X)
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.fit_transform(X), le_churn.transform(y))
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    for name, obj in (("preprocessor.pkl", preprocessor), ("Churn_Model.pkl", model), ("le_churn.pkl", le_churn)):
+        save_object(os.path.join(artifact_dir, name), obj)
+    return evaluate._artifact_paths(artifact_dir)
+
+
+@pytest.fixture
+def artifact_tree(tmp_path, monkeypatch):
+    """Points the evaluation module at an empty artifact directory."""
+    artifact_dir = str(tmp_path / "artifacts")
+    monkeypatch.setattr(evaluate, "ARTIFACT_DIR", artifact_dir)
+    monkeypatch.setattr(evaluate, "CANDIDATE_DIR", os.path.join(artifact_dir, "candidate"))
+    monkeypatch.setattr(evaluate, "BUNDLE_DIR", os.path.join(artifact_dir, "bundles"))
+    monkeypatch.setattr(evaluate, "MODEL_VERSION_PATH", os.path.join(artifact_dir, "model_version.json"))
+    monkeypatch.setattr(evaluate, "CHALLENGER_VERSION_PATH", os.path.join(artifact_dir, "challenger_version.json"))
+    monkeypatch.setattr(evaluate, "REFERENCE_PROFILE_PATH", os.path.join(artifact_dir, "reference_profile.json"))
+    monkeypatch.setattr(evaluate, "CONFIDENCE_BASELINE_PATH", os.path.join(artifact_dir, "confidence_baseline.json"))
+    monkeypatch.setattr(
+        evaluate, "CANDIDATE_REFERENCE_PROFILE_PATH", os.path.join(artifact_dir, "candidate", "reference_profile.json")
+    )
+    monkeypatch.setattr(
+        evaluate, "CANDIDATE_CONFIDENCE_BASELINE_PATH", os.path.join(artifact_dir, "candidate", "confidence_baseline.json")
+    )
+    return artifact_dir
+
+
+def _save_baselines(profile_path, confidence_path, mean_confidence):
+    save_json(profile_path, {"n_rows": 1})
+    save_json(confidence_path, {"mean_confidence": mean_confidence})
+
+
+def _marker(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def test_legacy_production_is_bundled_with_its_served_version(artifact_tree, telco_df):
+    legacy_paths = _save_artifacts(artifact_tree, telco_df, random_state=0)
+
+    model_version = evaluate.bundle_legacy_production()
+
+    assert model_version == get_artifact_version(legacy_paths)
+    marker = _marker(evaluate.MODEL_VERSION_PATH)
+    assert marker["model_version"] == model_version
+    _, manifest = load_bundle(os.path.join(artifact_tree, marker["bundle"]))
+    assert manifest["threshold"] == 0.35
+    #Only once: a second call leaves the marker alone
+    assert evaluate.bundle_legacy_production() is None
+
+
+def test_rejected_candidate_does_not_touch_production(artifact_tree, telco_df):
+    legacy_paths = _save_artifacts(artifact_tree, telco_df, random_state=0)
+    production_version = evaluate.bundle_legacy_production()
+    _save_artifacts(evaluate.CANDIDATE_DIR, telco_df, random_state=1)
+
+    challenger_version = evaluate.mark_challenger_version(0.4, {})
+
+    assert challenger_version != production_version
+    assert _marker(evaluate.MODEL_VERSION_PATH)["model_version"] == production_version
+    assert get_artifact_version(legacy_paths) == production_version
+    objects, manifest = load_bundle(os.path.join(artifact_tree, _marker(evaluate.CHALLENGER_VERSION_PATH)["bundle"]))
+    assert manifest["threshold"] == 0.4
+    assert objects["model"].coef_.shape[1] > 0
+
+
+def test_no_legacy_bundle_without_loose_artifacts(artifact_tree):
+    assert evaluate.bundle_legacy_production() is None
+    assert not os.path.exists(evaluate.MODEL_VERSION_PATH)
+
+
+def test_baselines_are_published_only_on_promotion(artifact_tree, telco_df):
+    _save_artifacts(artifact_tree, telco_df, random_state=0)
+    _save_baselines(evaluate.REFERENCE_PROFILE_PATH, evaluate.CONFIDENCE_BASELINE_PATH, 0.30)
+    evaluate.bundle_legacy_production()
+    _save_artifacts(evaluate.CANDIDATE_DIR, telco_df, random_state=1)
+    _save_baselines(evaluate.CANDIDATE_REFERENCE_PROFILE_PATH, evaluate.CANDIDATE_CONFIDENCE_BASELINE_PATH, 0.25)
+
+    evaluate.mark_challenger_version(0.4, {})
+    assert _marker(evaluate.CONFIDENCE_BASELINE_PATH)["mean_confidence"] == 0.30
+    production_bundle = os.path.join(artifact_tree, _marker(evaluate.MODEL_VERSION_PATH)["bundle"])
+    assert _marker(os.path.join(production_bundle, "confidence_baseline.json"))["mean_confidence"] == 0.30
+
+    evaluate.mark_promoted_version(0.4, {})
+    assert _marker(evaluate.CONFIDENCE_BASELINE_PATH)["mean_confidence"] == 0.25
+    #Frozen and checksummed with the model it describes
+    promoted_bundle = os.path.join(artifact_tree, _marker(evaluate.MODEL_VERSION_PATH)["bundle"])
+    _, manifest = load_bundle(promoted_bundle)
+    assert {"reference_profile.json", "confidence_baseline.json"} <= set(manifest["files"])
+
+
+def test_recall_target_default_matches_config():
+    from src.config.configuration import get_section
+
+    assert evaluate.ModelEval().recall_target == get_section("threshold")["recall_target"]
+    assert evaluate.ModelEval.from_config().recall_target == evaluate.DEFAULT_RECALL_TARGET
+
+
+def test_legacy_metrics_without_intervals_are_not_comparable():
+    legacy = {"Threshold": 0.35, "recall score": 0.5, "ROC-AUC score": 0.5}
+    interval = {"low": 0.9, "estimate": 0.95, "high": 0.99}
+    candidate = {
+        "recall score": 0.95, "ROC-AUC score": 0.95,
+        "Confidence Intervals": {"recall": interval, "roc_auc": interval},
+    }
+    assert evaluate.is_model_better(candidate, legacy) is False
+    assert evaluate.is_model_better(candidate, candidate) is True
+
+
+def test_threshold_is_selected_without_the_test_split(telco_df):
+    sample = telco_df.sample(n=1200, random_state=0)
+    X, y = sample.drop(columns=["Churn"]), (sample["Churn"] == "Yes").astype(int).to_numpy()
+    X_train = DataPreprocessing().get_preprocessor(X).fit_transform(X)
+    model = LogisticRegression(max_iter=1000).fit(X_train, y)
+
+    evaluator = evaluate.ModelEval(recall_target=0.8, cv_folds=3)
+    threshold = evaluator.select_oof_threshold(model, X_train, y)
+
+    folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=evaluator.random_state)
+    oof_prob = cross_val_predict(LogisticRegression(max_iter=1000), X_train, y, cv=folds, method="predict_proba")[:, 1]
+    assert ((oof_prob >= threshold)[y == 1]).mean() >= 0.8
+    assert ((oof_prob > threshold)[y == 1]).mean() < 0.8
+    with pytest.raises(Exception, match="training split"):
+        evaluator.initiate_eval(X_train, sample["Churn"].to_numpy())
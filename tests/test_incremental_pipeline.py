@@ -0,0 +1,26 @@
+#importing library
+import os
+
+#importing requirements
+from src.config.paths import ROOT_DIR
+from src.pipeline.incremental_pipeline import IncrementalTrainingPipeline
+
+
+def _batch(name):
+    return os.path.join(ROOT_DIR, "data", "labelled", name)
+
+
+def test_only_batches_outside_the_split_are_added_to_the_comparison():
+    batches = [_batch(name) for name in ("a.csv", "b.csv", "c.csv", "d.csv")]
+    names = [IncrementalTrainingPipeline._name(path) for path in batches]
+    #a and b went through ingestion at the last full refit, c was folded in incrementally since, d is new
+    state = {"consumed": names[:3], "in_split": names[:2], "runs_since_full": 1}
+
+    assert IncrementalTrainingPipeline.unsplit_batches(state, batches) == batches[2:]
+
+
+def test_states_without_split_record_never_add_consumed_batches():
+    batches = [_batch(name) for name in ("a.csv", "b.csv")]
+    state = {"consumed": [IncrementalTrainingPipeline._name(batches[0])], "runs_since_full": 0}
+
+    assert IncrementalTrainingPipeline.unsplit_batches(state, batches) == batches[1:]
@@ -0,0 +1,90 @@
+#importing library
+import json
+import queue
+import logging
+import threading
+
+import pytest
+
+#importing requirements
+from src.utils import logger as logger_module
+from src.utils.logger import NonBlockingQueueHandler, SamplingFilter, configure_logging, logging_stats
+
+
+def record(name: str, level: int = logging.INFO, msg: str = "message") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, msg, None, None)
+
+
+def test_sampling_uses_the_longest_matching_logger_name():
+    sampler = SamplingFilter({"svc": 0.5, "svc.requests": 0.1, "svc.noisy": 0})
+
+    def kept(name, level=logging.INFO, n=100):
+        return sum(sampler.filter(record(name, level)) for _ in range(n))
+
+    assert kept("svc.requests.scoring") == 10
+    assert kept("svc.other") == 50
+    assert kept("elsewhere") == 100
+    assert kept("svc.noisy") == 0
+    #Warnings and errors are never sampled
+    assert kept("svc.requests", logging.WARNING) == kept("svc.noisy", logging.ERROR) == 100
+
+
+def test_sampling_ratio_is_exact_across_threads():
+    sampler = SamplingFilter({"svc.requests": 0.01})
+    kept = []
+
+    def log_many():
+        kept.append(sum(sampler.filter(record("svc.requests")) for _ in range(5000)))
+
+    threads = [threading.Thread(target=log_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(kept) == 8 * 5000 // 100
+
+
+def test_full_queue_drops_info_and_waits_for_warnings():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(record("svc"))
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
+
+    #A warning waits until the listener has made room, instead of being dropped
+    warning = threading.Thread(target=handler.handle, args=(record("svc", logging.WARNING),))
+    warning.start()
+    warning.join(timeout=0.2)
+    assert warning.is_alive()
+    handler.queue.get_nowait()
+    warning.join(timeout=5)
+    assert not warning.is_alive()
+    assert [r.levelno for r in list(handler.queue.queue)] == [logging.INFO, logging.WARNING]
+    assert handler.dropped == 3
+
+
+@pytest.fixture
+def json_log(tmp_path):
+    log_file = tmp_path / "test.log"
+    configure_logging(fmt="json", use_queue=True, sampling={"test_logger.requests": 0.25}, log_file=str(log_file))
+    yield log_file
+    #Back to the session's configuration
+    configure_logging()
+
+
+def test_queued_json_log_keeps_sampled_and_error_records(json_log):
+    logger = logging.getLogger("test_logger.requests")
+    for i in range(8):
+        logger.info(f"request {i}")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("scoring failed")
+    assert logging_stats()["dropped_records"] == 0
+
+    #Stopping the listener writes everything still queued
+    logger_module._stop_listener()
+    entries = [json.loads(line) for line in json_log.read_text().splitlines()]
+
+    assert [entry["message"] for entry in entries] == ["request 0", "request 4", "scoring failed"]
+    assert entries[0]["sample_every"] == 4 and entries[0]["logger"] == "test_logger.requests"
+    assert entries[-1]["level"] == "ERROR" and "RuntimeError: boom" in entries[-1]["exception"]
@@ -0,0 +1,85 @@
+#importing library
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+#importing requirements
+from src.utils.metrics import threshold_sweep, select_threshold, bootstrap_metrics
+
+
+@pytest.fixture(scope="module")
+def scores():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 600)
+    #Rounded so that many scores tie, as they do for a model on one-hot features
+    y_prob = np.round(np.clip(0.35 * y_true + rng.normal(0.35, 0.2, 600), 0, 1), 2)
+    return y_true, y_prob
+
+
+def test_threshold_sweep_matches_sklearn_at_every_threshold(scores):
+    y_true, y_prob = scores
+    sweep = threshold_sweep(y_true, y_prob)
+
+    assert np.array_equal(sweep["threshold"], np.unique(y_prob)[::-1])
+    for i, threshold in enumerate(sweep["threshold"]):
+        y_pred = (y_prob >= threshold).astype(int)
+        assert sweep["recall"][i] == pytest.approx(recall_score(y_true, y_pred))
+        assert sweep["precision"][i] == pytest.approx(precision_score(y_true, y_pred, zero_division=0))
+        assert sweep["f1"][i] == pytest.approx(f1_score(y_true, y_pred, zero_division=0))
+        assert sweep["accuracy"][i] == pytest.approx(accuracy_score(y_true, y_pred))
+
+
+def test_select_threshold_is_the_highest_reaching_the_target(scores):
+    y_true, y_prob = scores
+    sweep = threshold_sweep(y_true, y_prob)
+    threshold = select_threshold(sweep, 0.85)
+
+    assert recall_score(y_true, y_prob >= threshold) >= 0.85
+    higher = sweep["threshold"][sweep["threshold"] > threshold]
+    assert all(recall_score(y_true, y_prob >= t) < 0.85 for t in higher)
+    #An unreachable target falls back to the lowest threshold (everything positive)
+    assert select_threshold(sweep, 1.1) == y_prob.min()
+
+
+def test_bootstrap_point_estimates_match_sklearn(scores):
+    y_true, y_prob = scores
+    intervals = bootstrap_metrics(y_true, y_prob, 0.5, n_resamples=200)
+    y_pred = (y_prob >= 0.5).astype(int)
+
+    assert intervals["accuracy"]["estimate"] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert intervals["precision"]["estimate"] == pytest.approx(precision_score(y_true, y_pred))
+    assert intervals["recall"]["estimate"] == pytest.approx(recall_score(y_true, y_pred))
+    assert intervals["f1"]["estimate"] == pytest.approx(f1_score(y_true, y_pred))
+    assert intervals["roc_auc"]["estimate"] == pytest.approx(roc_auc_score(y_true, y_prob))
+    for interval in intervals.values():
+        assert interval["low"] <= interval["estimate"] <= interval["high"]
+
+
+def test_bootstrap_resamples_match_a_reference_loop(scores):
+    y_true, y_prob = scores
+    intervals = bootstrap_metrics(y_true, y_prob, 0.5, n_resamples=50, ci_level=0.9, random_state=3)
+
+    rng = np.random.default_rng(3)
+    draws = rng.integers(0, len(y_true), size=(50, len(y_true)))
+    roc_auc = [roc_auc_score(y_true[d], y_prob[d]) for d in draws]
+    recall = [recall_score(y_true[d], y_prob[d] >= 0.5) for d in draws]
+    assert intervals["roc_auc"]["low"] == pytest.approx(np.percentile(roc_auc, 5))
+    assert intervals["recall"]["high"] == pytest.approx(np.percentile(recall, 95))
+
+
+def test_bootstrap_blocks_do_not_change_the_result(scores):
+    y_true, y_prob = scores
+    whole = bootstrap_metrics(y_true, y_prob, 0.4, n_resamples=100)
+    blocked = bootstrap_metrics(y_true, y_prob, 0.4, n_resamples=100, max_cells=7 * len(y_true))
+    for metric, interval in whole.items():
+        assert blocked[metric] == pytest.approx(interval)
+
+
+def test_single_class_resamples_do_not_drag_the_interval_down():
+    #Two positives in 40 rows, perfectly separated: about 1 resample in 9 draws no positive at all
+    y_true = np.r_[np.ones(2), np.zeros(38)].astype(int)
+    y_prob = np.r_[[0.9, 0.8], np.linspace(0.1, 0.5, 38)]
+    intervals = bootstrap_metrics(y_true, y_prob, 0.7, n_resamples=500)
+
+    assert intervals["roc_auc"] == {"estimate": 1.0, "low": 1.0, "high": 1.0}
+    assert intervals["recall"] == {"estimate": 1.0, "low": 1.0, "high": 1.0}
@@ -0,0 +1,66 @@
+#importing library
+import json
+import os
+import shutil
+
+import pytest
+
+#importing requirements
+from src.api.model_reloader import ModelReloader
+from src.prediction_cache import PredictionCache
+from src.monitoring.serving_metrics import ServingMetrics
+from src.predict import get_promoted_bundle_path
+
+
+def _observations(metrics):
+    return sum(sum(histogram.counts) for histogram in metrics.stage_duration().values())
+
+
+@pytest.fixture
+def reloader(telco_features):
+    reloader = ModelReloader(cache=PredictionCache(), metrics=ServingMetrics())
+    reloader.pipeline.predict(telco_features.head(5))
+    return reloader
+
+
+@pytest.fixture
+def other_bundle(tmp_path, monkeypatch):
+    """The production bundle under another version, served as the promoted one."""
+    bundle_path = str(tmp_path / "other")
+    shutil.copytree(get_promoted_bundle_path(), bundle_path)
+    manifest_path = os.path.join(bundle_path, "manifest.json")
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    manifest["model_version"] = "other"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    monkeypatch.setattr("src.predict.get_promoted_bundle_path", lambda: bundle_path)
+    return bundle_path
+
+
+def test_rejected_reload_leaves_the_live_cache_and_metrics_alone(reloader, other_bundle):
+    cache, metrics = reloader.cache, reloader.metrics
+    served_version = reloader.model_version
+    size, observations = cache.stats()["size"], _observations(metrics)
+
+    #The marker moved on again while "other" was loading
+    assert reloader.reload(expected_version="newer") is False
+
+    assert cache.stats()["model_version"] == served_version
+    assert cache.stats()["size"] == size
+    assert _observations(metrics) == observations
+
+
+def test_successful_reload_publishes_without_warm_up_side_effects(reloader):
+    old_pipeline = reloader.pipeline
+    size, observations = reloader.cache.stats()["size"], _observations(reloader.metrics)
+
+    assert reloader.reload() is True
+
+    predictor = reloader.pipeline.predictor
+    assert reloader.pipeline is not old_pipeline
+    assert predictor.cache is reloader.cache and predictor.metrics is reloader.metrics
+    assert reloader.cache.stats()["model_version"] == predictor.model_version
+    #The synthetic warm-up row is neither cached nor timed
+    assert reloader.cache.stats()["size"] == size
+    assert _observations(reloader.metrics) == observations
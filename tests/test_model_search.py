@@ -0,0 +1,63 @@
+#importing library
+import time
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+#importing requirements
+from src.model_search import CandidateSearch
+
+
+class SlowClassifier(LogisticRegression):
+    """A model whose first fold alone takes far longer than the search budget."""
+
+    def fit(self, X, y, sample_weight=None):
+        time.sleep(60)
+        return super().fit(X, y, sample_weight)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=300) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def logged_trials(monkeypatch):
+    logged = []
+    monkeypatch.setattr(CandidateSearch, "_log_trial", lambda self, trial: logged.append(trial))
+    return logged
+
+
+def search(budget_seconds, **candidates):
+    return CandidateSearch(
+        {name: {"class": class_path, "grid": grid} for name, (class_path, grid) in candidates.items()},
+        n_jobs=2, cv_folds=3, budget_seconds=budget_seconds, abandon_margin=1.0
+    )
+
+
+def test_search_picks_the_best_trial(data, logged_trials):
+    searcher = search(120, logistic=("sklearn.linear_model.LogisticRegression", {"C": [1e-4, 1.0]}))
+    model = searcher.run(*data)
+
+    assert [trial["status"] for trial in searcher.trials] == ["completed", "completed"]
+    assert searcher.best_trial["params"] == {"C": 1.0} and model.get_params()["C"] == 1.0
+    assert len(logged_trials) == 2
+
+
+def test_a_slow_fold_cannot_overshoot_the_wall_budget(data, logged_trials):
+    searcher = search(
+        3,
+        logistic=("sklearn.linear_model.LogisticRegression", {"C": [1.0]}),
+        slow=(f"{SlowClassifier.__module__}.SlowClassifier", {"C": [1.0]}),
+    )
+    start = time.perf_counter()
+    searcher.run(*data)
+
+    assert time.perf_counter() - start < 20
+    statuses = {trial["candidate"]: trial["status"] for trial in searcher.trials}
+    assert statuses == {"logistic": "completed", "slow": "timeout"}
+    assert searcher.best_trial["candidate"] == "logistic"
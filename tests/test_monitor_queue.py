@@ -0,0 +1,57 @@
+#importing library
+import threading
+
+#importing requirements
+from src.api.monitor_queue import MonitorQueue
+
+
+class _Pipeline:
+    def __init__(self, block: threading.Event = None):
+        self.rows = []
+        self.block = block
+
+    def monitor(self, record, probability, label):
+        if self.block is not None:
+            self.block.wait(5)
+        self.rows.append((record["id"], probability, label))
+
+
+def test_rows_are_monitored_in_order_by_the_background_thread():
+    pipeline, monitor_queue = _Pipeline(), MonitorQueue()
+    monitor_queue.start()
+    for i in range(100):
+        assert monitor_queue.submit(pipeline, {"id": i}, i / 100, "No")
+    monitor_queue.stop()
+
+    assert [row[0] for row in pipeline.rows] == list(range(100))
+    assert monitor_queue.stats()["processed_rows"] == 100
+
+
+def test_full_queue_drops_rows_instead_of_blocking():
+    block = threading.Event()
+    pipeline, monitor_queue = _Pipeline(block), MonitorQueue(max_pending_rows=10)
+    #A slow monitor (e.g. a drift flush holding its lock) must never hold up submit
+    accepted = [monitor_queue.submit(pipeline, {"id": i}, 0.5, "No") for i in range(15)]
+
+    assert accepted == [True] * 10 + [False] * 5
+    assert monitor_queue.stats()["dropped_rows"] == 5
+    block.set()
+    monitor_queue.drain()
+    assert len(pipeline.rows) == 10
+
+
+def test_compiled_requests_queue_their_bookkeeping(telco_features, tmp_path):
+    from src.monitoring.drift_sketch import DriftSketch, DriftSketchRecorder
+    from src.pipeline.inference_pipeline import InferencePipeline
+
+    recorder = DriftSketchRecorder(DriftSketch.from_reference(telco_features), output_dir=str(tmp_path))
+    pipeline = InferencePipeline(drift_recorder=recorder)
+    monitor_queue = MonitorQueue()
+    record = telco_features.iloc[0].to_dict()
+
+    queued = pipeline.predict_record(record, monitor_queue=monitor_queue)
+    assert recorder._current is None
+    monitor_queue.drain()
+
+    assert recorder._current.n == 1
+    assert queued == pipeline.predict_record(record)
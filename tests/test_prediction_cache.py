@@ -0,0 +1,95 @@
+#importing library
+import numpy as np
+import pytest
+
+#importing requirements
+from src.prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr("src.prediction_cache.time.monotonic", lambda: now["t"])
+    return now
+
+
+def test_equivalent_rows_share_a_key_per_model_version():
+    key = PredictionCache.make_key([12, "Yes", 70.5], "v1")
+
+    assert PredictionCache.make_key([12.0, "Yes", np.float64(70.5)], "v1") == key
+    assert PredictionCache.make_key([np.int64(12), "Yes", 70.5], "v1") == key
+    assert PredictionCache.make_key([12, "Yes", 70.5], "v2") != key
+    assert PredictionCache.make_key([13, "Yes", 70.5], "v1") != key
+
+
+def test_padded_category_is_not_served_the_clean_categorys_score():
+    #The encoder treats " Month-to-month" as unseen, so it must not share a cache entry
+    assert PredictionCache.make_key([" Month-to-month"], "v1") != PredictionCache.make_key(["Month-to-month"], "v1")
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_size=2, ttl_seconds=60)
+    cache.put_many(["a", "b"], [0.1, 0.2])
+    #Reading "a" makes "b" the oldest
+    assert cache.get_many(["a"]) == [0.1]
+    cache.put_many(["c"], [0.3])
+
+    assert cache.get_many(["a", "b", "c"]) == [0.1, None, 0.3]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_size=10, ttl_seconds=60)
+    cache.put_many(["a"], [0.1])
+    clock["t"] += 59
+    assert cache.get_many(["a"]) == [0.1]
+    clock["t"] += 2
+
+    assert cache.get_many(["a"]) == [None]
+    stats = cache.stats()
+    assert (stats["size"], stats["expirations"], stats["hits"], stats["misses"]) == (0, 1, 1, 1)
+
+
+def test_binding_a_new_model_version_invalidates_entries():
+    cache = PredictionCache()
+    cache.bind_model_version("v1")
+    cache.put_many(["a"], [0.1])
+    cache.bind_model_version("v1")
+    assert cache.get_many(["a"]) == [0.1]
+
+    cache.bind_model_version("v2")
+    assert cache.get_many(["a"]) == [None]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_predictor_scores_only_distinct_misses(telco_features, monkeypatch):
+    from src.predict import ChurnPredictor
+
+    predictor = ChurnPredictor(cache=PredictionCache())
+    df = telco_features.head(50)
+    batch = df.iloc[[0, 1, 0, 2, 1]]
+    expected = ChurnPredictor().predict_proba(batch)
+
+    scored_rows = []
+    score = predictor._score
+    monkeypatch.setattr(predictor, "_score", lambda frame: scored_rows.append(len(frame)) or score(frame))
+
+    first = predictor.predict_proba(batch)
+    np.testing.assert_allclose(first, expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(predictor.predict_proba(batch), first)
+    #Three distinct profiles, each scored once; the single-record path finds them too
+    assert scored_rows == [3]
+    assert predictor.predict_record(df.iloc[0].to_dict())["churn_probability"] == first[0]
+    assert scored_rows == [3]
+    assert predictor.cache.stats()["model_version"] == predictor.model_version
+
+
+def test_cache_never_changes_a_prediction(telco_features):
+    from src.predict import ChurnPredictor
+
+    batch = telco_features.head(2).copy()
+    batch.iloc[1] = batch.iloc[0]
+    batch.iloc[1, batch.columns.get_loc("Contract")] = " " + batch.iloc[0]["Contract"]
+
+    cached = ChurnPredictor(cache=PredictionCache()).predict_proba(batch)
+    np.testing.assert_allclose(cached, ChurnPredictor().predict_proba(batch), rtol=0, atol=1e-12)
@@ -0,0 +1,95 @@
+#importing library
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+#importing requirements
+from src.monitoring.prediction_logger import PredictionLogger, read_prediction_log
+from src.monitoring.shadow_scorer import summarize_shadow_log
+
+
+def test_shadow_columns_survive_files_written_before_shadow_scoring(telco_features, tmp_path):
+    prediction_logger = PredictionLogger(output_dir=str(tmp_path))
+    frame = telco_features.head(20).reset_index(drop=True)
+    prob = np.linspace(0.1, 0.9, 20)
+    labels = np.where(prob >= 0.5, "Yes", "No")
+
+    #A file from before shadow scoring was enabled, then one with the shadow columns
+    prediction_logger.log(frame.iloc[:10], prob[:10], labels[:10], "v1", logged_at=1_700_000_000)
+    prediction_logger.flush(close_files=True)
+    shadowed = frame.iloc[10:].copy()
+    shadowed["shadow_probability"] = prob[10:] - 0.05
+    shadowed["shadow_prediction"] = np.where(shadowed["shadow_probability"] >= 0.5, "Yes", "No")
+    shadowed["shadow_model_version"] = "v2"
+    prediction_logger.log(shadowed, prob[10:], labels[10:], "v1", logged_at=1_700_000_001)
+    prediction_logger.flush(close_files=True)
+
+    logged = read_prediction_log(columns=["churn_probability", "shadow_model_version"], log_dir=str(tmp_path))
+    assert len(logged) == 20
+    assert logged["shadow_model_version"].isna().sum() == 10
+
+    summary = summarize_shadow_log(log_dir=str(tmp_path))
+    assert list(summary) == ["v2"]
+
+
+def test_rows_logged_from_many_threads_are_all_written(telco_features, tmp_path):
+    prediction_logger = PredictionLogger(output_dir=str(tmp_path), flush_interval_seconds=0.01)
+    records = telco_features.head(50).to_dict("records")
+    prediction_logger.start()
+
+    def serve():
+        for record in records:
+            prediction_logger.log_record(record, 0.25, "No", "v1")
+        prediction_logger.log(telco_features.head(10), np.full(10, 0.75), np.full(10, "Yes"), "v1")
+
+    threads = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    prediction_logger.stop()
+
+    logged = read_prediction_log(log_dir=str(tmp_path))
+    assert len(logged) == 4 * 60
+    assert (logged["churn_prediction"] == "Yes").sum() == 40
+    assert prediction_logger.stats()["written_rows"] == 240 and prediction_logger.stats()["open_files"] == 0
+
+
+def test_open_files_are_hidden_until_they_rotate(telco_features, tmp_path):
+    prediction_logger = PredictionLogger(output_dir=str(tmp_path))
+    prediction_logger.log(telco_features.head(5), np.full(5, 0.5), np.full(5, "Yes"), "v1")
+
+    prediction_logger.flush()
+    assert read_prediction_log(log_dir=str(tmp_path)).empty
+    prediction_logger.flush(close_files=True)
+    assert len(read_prediction_log(log_dir=str(tmp_path))) == 5
+
+
+def test_rows_are_partitioned_by_version_and_hour(telco_features, tmp_path):
+    prediction_logger = PredictionLogger(output_dir=str(tmp_path))
+    frame = telco_features.head(4)
+    ten, eleven = datetime(2024, 3, 1, 10, 30, tzinfo=timezone.utc), datetime(2024, 3, 1, 11, 5, tzinfo=timezone.utc)
+    prediction_logger.log(frame, np.full(4, 0.1), np.full(4, "No"), "v1", logged_at=ten.timestamp())
+    prediction_logger.log(frame, np.full(4, 0.2), np.full(4, "No"), "v1", logged_at=eleven.timestamp())
+    prediction_logger.log(frame, np.full(4, 0.3), np.full(4, "No"), "v2", logged_at=eleven.timestamp())
+    prediction_logger.flush(close_files=True)
+
+    assert sorted(os.listdir(tmp_path / "model_version=v1" / "date=2024-03-01")) == ["hour=10", "hour=11"]
+    hour_eleven = read_prediction_log(
+        start=datetime(2024, 3, 1, 11, tzinfo=timezone.utc), end=datetime(2024, 3, 1, 12, tzinfo=timezone.utc),
+        model_version="v1", columns=["churn_probability"], log_dir=str(tmp_path)
+    )
+    assert hour_eleven["churn_probability"].tolist() == [0.2] * 4
+
+
+def test_a_full_buffer_drops_rows_instead_of_blocking(telco_features, tmp_path):
+    prediction_logger = PredictionLogger(output_dir=str(tmp_path), max_buffered_rows=10)
+    frame = telco_features.head(4)
+    accepted = [prediction_logger.log(frame, np.full(4, 0.5), np.full(4, "Yes"), "v1") for _ in range(4)]
+
+    assert accepted == [True, True, False, False]
+    assert prediction_logger.stats()["dropped_rows"] == 8
+    prediction_logger.flush(close_files=True)
+    assert len(read_prediction_log(log_dir=str(tmp_path))) == 8
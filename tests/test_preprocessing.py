@@ -0,0 +1,33 @@
+#importing library
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+#importing requirements
+from src.preprocessing import DataPreprocessing, Float32StandardScaler
+
+NUMERIC = ["tenure", "MonthlyCharges", "TotalCharges"]
+
+
+def test_matrix_mode_defaults_to_dense():
+    assert DataPreprocessing().matrix_mode == "dense"
+    assert DataPreprocessing.from_config().matrix_mode == "dense"
+
+
+def test_float32_scaler_matches_standard_scaler(telco_features):
+    X = telco_features[NUMERIC]
+    before = X.copy()
+
+    scaled = Float32StandardScaler().fit(X).transform(X)
+
+    assert scaled.dtype == np.float32
+    np.testing.assert_allclose(scaled, StandardScaler().fit(X).transform(X), rtol=0, atol=1e-5)
+    #The input frame is never scaled in place
+    assert X.equals(before)
+
+
+def test_compact_matrix_is_float32_end_to_end(telco_features):
+    preprocessor = DataPreprocessing(matrix_mode="compact").get_preprocessor(telco_features)
+    X = preprocessor.fit_transform(telco_features)
+
+    assert X.dtype == np.float32
+    assert hasattr(X, "indptr")
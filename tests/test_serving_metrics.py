@@ -0,0 +1,77 @@
+#importing library
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+#importing requirements
+from src.monitoring.serving_metrics import Histogram, MetricsMiddleware, ServingMetrics, STAGES
+
+
+def test_histogram_edges_are_inclusive_and_rendered_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 1.0, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 2, 1]
+    lines = histogram.render("latency", stage="x")
+    assert lines[:3] == [
+        'latency_bucket{stage="x",le="0.1"} 2',
+        'latency_bucket{stage="x",le="1.0"} 4',
+        'latency_bucket{stage="x",le="+Inf"} 5',
+    ]
+    assert lines[-1] == 'latency_count{stage="x"} 5'
+
+
+def test_stage_observations_from_every_thread_are_summed():
+    metrics = ServingMetrics()
+    n_threads, per_thread = 8, 5000
+    start = threading.Barrier(n_threads + 1)
+
+    def observe(i):
+        start.wait()
+        for _ in range(per_thread):
+            metrics.observe_stage(STAGES[i % 2], 0.0002)
+
+    threads = [threading.Thread(target=observe, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    #Scrapes while the threads observe must neither fail nor block them
+    while any(thread.is_alive() for thread in threads):
+        metrics.render()
+    for thread in threads:
+        thread.join()
+
+    #Threads that have exited keep their observations
+    merged = metrics.stage_duration()
+    assert sum(merged[STAGES[0]].counts) == sum(merged[STAGES[1]].counts) == n_threads // 2 * per_thread
+    assert merged[STAGES[0]].sum == pytest.approx(n_threads // 2 * per_thread * 0.0002)
+    assert all(sum(merged[stage].counts) == 0 for stage in STAGES[2:])
+    assert f'churn_stage_duration_seconds_count{{stage="{STAGES[0]}"}} {n_threads // 2 * per_thread}' in metrics.render()
+
+
+def test_middleware_labels_requests_by_route():
+    app = FastAPI()
+    metrics = ServingMetrics()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"item_id": item_id}
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    with TestClient(app) as client:
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/items/not-a-number")
+        client.get("/no/such/path")
+
+    assert metrics.requests == {
+        ("/items/{item_id}", "GET", 200): 2,
+        ("/items/{item_id}", "GET", 422): 1,
+        ("other", "GET", 404): 1,
+    }
+    assert metrics.errors == {("/items/{item_id}", 422): 1, ("other", 404): 1}
+    assert metrics.in_flight == 0
+    assert sum(metrics.request_duration["/items/{item_id}"].counts) == 3
@@ -0,0 +1,70 @@
+#importing library
+import pytest
+
+#importing requirements
+from src.pipeline.stage_cache import StageCache
+from src.pipeline.training_pipeline import TrainingPipeline
+
+
+@pytest.fixture
+def stage_files(tmp_path):
+    files = {name: tmp_path / name for name in ("input.csv", "code.py", "output.pkl", "marker.json")}
+    files["input.csv"].write_text("a,b\n1,2\n")
+    files["code.py"].write_text("x = 1\n")
+    return files
+
+
+def _pipeline(tmp_path):
+    pipeline = TrainingPipeline()
+    pipeline.cache = StageCache(str(tmp_path / "stage_cache"))
+    return pipeline
+
+
+def _run(pipeline, files, calls, config=None):
+    def stage():
+        calls.append(1)
+        files["output.pkl"].write_bytes(b"model")
+        #Like a promotion: the stage rewrites production state it also depends on
+        files["marker.json"].write_text(f'{{"run": {len(calls)}}}')
+
+    pipeline._upstream_ran = False
+    hit, _ = pipeline._run_stage(
+        "evaluation", stage,
+        input_files = [str(files["input.csv"])],
+        config = config or {"threshold": 0.35},
+        code_files = [str(files["code.py"])],
+        outputs = [str(files["output.pkl"])],
+        state_files = [str(files["marker.json"])]
+    )
+    return hit
+
+
+def test_unchanged_stage_is_skipped_until_an_input_changes(tmp_path, stage_files):
+    pipeline, calls = _pipeline(tmp_path), []
+
+    assert _run(pipeline, stage_files, calls) is False
+    #The marker the stage wrote itself does not invalidate it
+    assert _run(pipeline, stage_files, calls) is True
+
+    stage_files["code.py"].write_text("x = 2\n")
+    assert _run(pipeline, stage_files, calls) is False
+    assert _run(pipeline, stage_files, calls, config={"threshold": 0.4}) is False
+    assert _run(pipeline, stage_files, calls, config={"threshold": 0.4}) is True
+    assert len(calls) == 3
+
+
+def test_new_production_state_reruns_the_stage(tmp_path, stage_files):
+    pipeline, calls = _pipeline(tmp_path), []
+    _run(pipeline, stage_files, calls)
+
+    stage_files["marker.json"].write_text('{"run": "promoted elsewhere"}')
+    assert _run(pipeline, stage_files, calls) is False
+
+
+def test_modified_output_is_a_miss(tmp_path, stage_files):
+    pipeline, calls = _pipeline(tmp_path), []
+    _run(pipeline, stage_files, calls)
+
+    stage_files["output.pkl"].write_bytes(b"tampered")
+    assert _run(pipeline, stage_files, calls) is False
+    assert len(calls) == 2
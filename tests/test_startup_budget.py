@@ -0,0 +1,26 @@
+#importing library
+import pytest
+
+#importing requirements
+from src.config.configuration import get_section
+from src.predict import get_promoted_bundle_path
+from src.utils.model_bundle import read_manifest
+from src.utils.startup_profile import best_of
+
+BUDGETS = get_section("startup")["import_budget_ms"]
+
+
+def test_shipped_production_model_is_a_compiled_bundle():
+    #The budget below is only meaningful for what is actually deployed
+    bundle_path = get_promoted_bundle_path()
+    assert bundle_path is not None
+    assert read_manifest(bundle_path).get("compiled_scorer")
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_budget(module):
+    result = best_of(module, repeats=3)
+
+    assert "sklearn" not in result["by_package_ms"]
+    assert "scipy" not in result["by_package_ms"]
+    assert result["total_ms"] <= BUDGETS[module], result["by_package_ms"]
@@ -0,0 +1,77 @@
+#importing library
+import numpy as np
+import pandas as pd
+import pytest
+
+#importing requirements
+from src.config.paths import RAW_DATA_PATH
+from src.synthetic_data import SyntheticDataGenerator
+from src.utils.exception import ChurnException
+
+
+@pytest.fixture(scope="module")
+def raw_df() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA_PATH)
+
+
+def generator(raw_df, **kwargs) -> SyntheticDataGenerator:
+    return SyntheticDataGenerator(chunk_rows=700, **kwargs).fit(raw_df)
+
+
+def test_rows_keep_the_raw_schema_and_categories(raw_df):
+    df = generator(raw_df).sample(5000)
+
+    assert list(df.columns) == list(raw_df.columns)
+    for col in ("Contract", "PaymentMethod", "InternetService", "Churn"):
+        assert set(df[col]) <= set(raw_df[col])
+    assert df["customerID"].is_unique
+    #New customers have no TotalCharges, everyone else has one
+    assert df.loc[df["tenure"] == 0, "TotalCharges"].isna().all()
+    assert df.loc[df["tenure"] > 0, "TotalCharges"].notna().all()
+
+
+def test_the_same_row_range_always_gives_the_same_rows(raw_df):
+    first, second = generator(raw_df), generator(raw_df)
+    pd.testing.assert_frame_equal(first.sample(300, start_row=1400), second.sample(300, start_row=1400))
+    assert not first.sample(300, start_row=0).equals(first.sample(300, start_row=1400))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_written_file_is_the_concatenated_chunks(raw_df, tmp_path, suffix):
+    gen = generator(raw_df)
+    path = gen.write(str(tmp_path / f"synthetic{suffix}"), 2000)
+
+    expected = pd.concat(gen.iter_chunks(2000), ignore_index=True)
+    if suffix == ".parquet":
+        written = pd.read_parquet(path)
+    else:
+        written = pd.read_csv(path)
+        #Blank TotalCharges are written as " ", like the raw file
+        written["TotalCharges"] = pd.to_numeric(written["TotalCharges"], errors="coerce")
+    assert len(written) == 2000
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False)
+
+
+def test_drift_only_applies_from_the_start_row(raw_df):
+    clean = generator(raw_df).sample(1000)
+    drifted = generator(raw_df, drift={"MonthlyCharges": {"scale": 1.2}}, drift_start_row=600).sample(1000)
+
+    pd.testing.assert_frame_equal(drifted.iloc[:600], clean.iloc[:600])
+    np.testing.assert_allclose(drifted["MonthlyCharges"].iloc[600:], np.round(clean["MonthlyCharges"].iloc[600:] * 1.2, 2))
+    #TotalCharges is derived after the drift, so it follows the drifted charge
+    tenured = drifted.index[(drifted.index >= 600) & (drifted["tenure"] > 0)]
+    assert (drifted.loc[tenured, "TotalCharges"] > clean.loc[tenured, "TotalCharges"]).mean() > 0.95
+
+
+def test_categorical_drift_moves_the_configured_share(raw_df):
+    drifted = generator(raw_df, drift={"Contract": {"to": "Month-to-month", "rate": 0.5}}).sample(20_000)
+    clean = generator(raw_df).sample(20_000)
+
+    clean_share = (clean["Contract"] == "Month-to-month").mean()
+    expected = clean_share + 0.5 * (1 - clean_share)
+    assert (drifted["Contract"] == "Month-to-month").mean() == pytest.approx(expected, abs=0.02)
+
+
+def test_drift_on_an_unknown_column_is_rejected(raw_df):
+    with pytest.raises(ChurnException):
+        generator(raw_df, drift={"NotAColumn": {"scale": 2}})